@@ -1,80 +1,127 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, current_app, request, jsonify, stream_with_context
 from flask_cors import CORS
-from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session, object_session
 from datetime import datetime, timedelta
 import jwt
 from functools import wraps
 import hashlib
+import json
+import logging
 import os
-import requests
+import threading
+import weakref
 from dotenv import load_dotenv
-import re
 
+# Load .env before the local modules below read their settings at import time
 load_dotenv()
 
-app = Flask(__name__)
-app.config['SECRET_KEY'] = 'your-secret-key-here-change-in-production'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///newsai.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+from fanout import LIVE_RESULT_ENVIRON, fetch_all
+from cache import TTLCache
+from providers import load_providers
+from ingest import IngestionWorker, import_ndjson, read_lines
+from nlp import expand_search_terms, score_articles
+from dedup import dedupe_articles
+from pagination import (InvalidCursor, page_size, parse_fields, project, keyset_query, paginate_keyset,
+                        offset_from_cursor, offset_cursor)
+from streaming import stream_query
+from serializers import (ARTICLE_FIELDS, ADMIN_ARTICLE_FIELDS, EXPORT_ARTICLE_FIELDS, serialize_article, compact, dumps, etag_for,
+                         json_response, omit_empty_requested)
+import response_cache
+from response_cache import CachedListing, article_version, listing_cache
+import auth_cache
+import cache_backend
+from write_behind import BufferFull, WriteBehindBuffer
+from feed import FeedEngine
+from stats_counters import stats_counters_available, read_stats
+from search_index import search_index_available, search_article_ids
+from migrations import upgrade
+from db_config import ReadSessions, configure_database, init_engines
+import telemetry
+from telemetry import log_event, span
+from models import db, User, Article, UserPreferences, ReadingHistory, UserInteractions
 
-CORS(app)
-db = SQLAlchemy(app)
+# ========================================
+# APPLICATION FACTORY
+# ========================================
+# Importing this module builds nothing; create_app() does:
+#     gunicorn -w 4 'app:create_app()'
+#     python app.py                              (development server)
+# Set SECRET_KEY so tokens issued by one worker are accepted by the others,
+# and CACHE_URL=redis://... so workers share their caches (see cache_backend).
+# `from app import app` still works: it builds a default app on first use.
+# Each app owns its providers and background workers (AppServices, kept in
+# app.extensions); only the cache backend is process-wide, so apps built in
+# one process should share a CACHE_URL.
+DEV_SECRET_KEY = 'your-secret-key-here-change-in-production'
 
-NEWS_API_KEY = os.getenv('NEWS_API_KEY')
-GUARDIAN_API_KEY = os.getenv('GUARDIAN_API_KEY')
+api = Blueprint('api', __name__, cli_group=None)
+# WAL + pragmas on every connection; `reads` routes listing queries to the app's read replica if configured
+reads = ReadSessions(db)
+# Every live AppServices, for the process-wide gauges
+_all_services = weakref.WeakSet()
 
-print(f"✅ NewsAPI Key loaded: {NEWS_API_KEY[:20]}..." if NEWS_API_KEY else "❌ NEWS_API_KEY not found in .env")
-print(f"✅ Guardian Key loaded: {GUARDIAN_API_KEY[:20]}..." if GUARDIAN_API_KEY else "❌ GUARDIAN_API_KEY not found in .env")
+class AppServices:
+    """Providers and background workers of one app, bound to it; see services()"""
+    
+    def __init__(self, app):
+        # NewsAPI, Guardian and any RSS_FEEDS, each with its own rate limit and circuit breaker
+        self.providers = load_providers()
+        self.feed_engine = FeedEngine(db, Article, UserPreferences, UserInteractions)
+        # Both run their work inside this app's context, so rows land in its database
+        self.ingestion_worker = IngestionWorker(app, fetch_live_category)
+        self.interaction_buffer = WriteBehindBuffer(app, write_interactions, name='interactions')
 
-# ========================================
-# NLP FEATURE 1: SYNONYM DICTIONARY
-# ========================================
-SYNONYMS = {
-    'tech': ['technology', 'technical', 'digital', 'IT', 'computing'],
-    'technology': ['tech', 'digital', 'IT', 'computing', 'innovation'],
-    'phone': ['mobile', 'smartphone', 'cellphone', 'device', 'iPhone', 'Android'],
-    'mobile': ['phone', 'smartphone', 'cellphone', 'device'],
-    'ai': ['artificial intelligence', 'machine learning', 'ML', 'deep learning', 'neural network'],
-    'artificial intelligence': ['AI', 'machine learning', 'ML', 'deep learning'],
-    'ml': ['machine learning', 'AI', 'artificial intelligence'],
-    'car': ['automobile', 'vehicle', 'auto', 'motor'],
-    'vehicle': ['car', 'automobile', 'auto', 'motor', 'transport'],
-    'computer': ['PC', 'laptop', 'desktop', 'machine', 'system'],
-    'laptop': ['notebook', 'computer', 'portable computer'],
-    'news': ['article', 'story', 'report', 'update', 'information'],
-    'business': ['economy', 'finance', 'trade', 'commerce', 'market'],
-    'health': ['medical', 'healthcare', 'wellness', 'medicine', 'fitness'],
-    'sport': ['sports', 'athletic', 'game', 'match', 'tournament'],
-    'sports': ['sport', 'athletic', 'game', 'match', 'tournament'],
-    'politics': ['political', 'government', 'policy', 'election', 'parliament'],
-    'environment': ['environmental', 'climate', 'nature', 'ecology', 'green'],
-    'science': ['scientific', 'research', 'study', 'experiment', 'discovery'],
-}
+def services(app=None):
+    """The AppServices of `app` (default: the current app)"""
+    return (app or current_app).extensions['newsai']
 
-# ========================================
-# NLP FEATURE 2: QUERY EXPANSION
-# ========================================
-def expand_search_query(query):
-    """
-    Expands search query with synonyms for better results
-    Example: 'tech news' -> 'tech technology digital IT news article story'
-    """
-    if not query:
-        return query
+def database_scope(engine=None):
+    """Cache key scope that keeps entries of apps on different databases apart"""
+    return str((engine or db.engine).url)
+
+def create_app(config=None):
+    """Build the API app; `config` overrides settings read from the environment"""
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', '')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['CACHE_URL'] = cache_backend.CACHE_URL
+    configure_database(app)
+    if config:
+        app.config.update(config)
+    if not app.config['SECRET_KEY']:
+        log_event('secret_key_missing', logging.WARNING, force=True,
+                  message='SECRET_KEY is not set; using the development key')
+        app.config['SECRET_KEY'] = DEV_SECRET_KEY
     
-    query = query.lower().strip()
-    words = re.findall(r'\w+', query)  # Extract words
+    CORS(app, expose_headers=['X-Providers', 'X-Providers-Timed-Out', 'X-Providers-Failed', 'X-Next-Cursor',
+                              'ETag', 'Last-Modified'])
+    db.init_app(app)
+    # Per-request spans, latency histograms and sampled request logs (see /metrics)
+    telemetry.init_app(app)
+    init_engines(app, db, reads)
+    backend = cache_backend.configure(app.config['CACHE_URL'])
     
-    expanded_words = set()
-    for word in words:
-        expanded_words.add(word)
-        # Add synonyms if available
-        if word in SYNONYMS:
-            expanded_words.update(SYNONYMS[word][:3])  # Add top 3 synonyms
+    app.extensions['newsai'] = app_services = AppServices(app)
+    _all_services.add(app_services)
+    app.register_blueprint(api)
     
-    expanded_query = ' '.join(expanded_words)
-    print(f"🔍 NLP Query Expansion: '{query}' -> '{expanded_query}'")
-    return expanded_query
+    log_event('app_created', force=True, cache_backend=backend.name,
+              providers={name: provider.configured for name, provider in app_services.providers.items()})
+    return app
+
+_app = None
+_app_lock = threading.Lock()
+
+def __getattr__(name):
+    # Module-level `app` for `from app import app` (flask run, scripts), built lazily
+    if name == 'app':
+        global _app
+        with _app_lock:
+            if _app is None:
+                _app = create_app()
+        return _app
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 # ========================================
 # NLP FEATURE 3: SMART SEARCH SCORING
@@ -84,65 +131,38 @@ def calculate_relevance_score(article, search_terms):
     Calculate relevance score based on keyword matches
     Higher score = more relevant article
     """
-    score = 0
-    search_terms_lower = [term.lower() for term in search_terms]
-    
-    title = (article.get('title') or '').lower()
-    description = (article.get('description') or '').lower()
-    content = (article.get('content') or '').lower()
-    
-    for term in search_terms_lower:
-        # Title matches are worth more
-        if term in title:
-            score += 5
-        if term in description:
-            score += 2
-        if term in content:
-            score += 1
-    
-    return score
-
-# Database Models
-class User(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    email = db.Column(db.String(120), unique=True, nullable=False)
-    password = db.Column(db.String(200), nullable=False)
-    name = db.Column(db.String(100))
-    role = db.Column(db.String(20), default='user')
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-class Article(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(500), nullable=False)
-    description = db.Column(db.Text)
-    content = db.Column(db.Text)
-    url = db.Column(db.String(500))
-    image_url = db.Column(db.String(500))
-    source = db.Column(db.String(100))
-    author = db.Column(db.String(200))
-    category = db.Column(db.String(50))
-    tags = db.Column(db.String(500))
-    published_at = db.Column(db.DateTime, default=datetime.utcnow)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-class UserPreferences(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
-    interests = db.Column(db.Text)
-    preferred_sources = db.Column(db.Text)
-
-class ReadingHistory(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
-    article_id = db.Column(db.Integer, db.ForeignKey('article.id'))
-    read_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-class UserInteractions(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
-    article_id = db.Column(db.Integer)
-    interaction_type = db.Column(db.String(20))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    return score_articles([article], search_terms)[0]
+
+# Role changes (or deletes) must not be served from the principal cache. Changed
+# ids are collected at flush and dropped on commit: dropping them at flush would
+# let a concurrent request re-cache the still-committed row until the TTL.
+_CHANGED_USERS = 'changed_user_ids'
+
+@db.event.listens_for(User, 'after_update')
+@db.event.listens_for(User, 'after_delete')
+def track_changed_user(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS, set()).add(target.id)
+
+@db.event.listens_for(Session, 'after_commit')
+def invalidate_cached_users(session):
+    user_ids = session.info.pop(_CHANGED_USERS, ())
+    if user_ids:
+        scope = database_scope(session.get_bind())
+        for user_id in user_ids:
+            auth_cache.invalidate_user(user_id, scope)
+
+@db.event.listens_for(Session, 'after_rollback')
+def forget_changed_users(session):
+    session.info.pop(_CHANGED_USERS, None)
+
+def authenticate(authorization):
+    """Principal for an 'Authorization: Bearer <jwt>' header value; raises if the token is invalid"""
+    token = authorization.split(' ')[1]
+    data = auth_cache.decode_token(token, current_app.config['SECRET_KEY'])
+    return auth_cache.load_principal(data['user_id'], lambda user_id: db.session.get(User, user_id),
+                                     database_scope())
 
 def token_required(f):
     @wraps(f)
@@ -151,135 +171,84 @@ def token_required(f):
         if not token:
             return jsonify({'message': 'Token is missing'}), 401
         try:
-            token = token.split(' ')[1]
-            data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
-            current_user = User.query.get(data['user_id'])
+            with span('auth'):
+                current_user = authenticate(token)
         except:
             return jsonify({'message': 'Token is invalid'}), 401
+        if current_user is None:
+            return jsonify({'message': 'Token is invalid'}), 401
         return f(current_user, *args, **kwargs)
     return decorated
 
-def fetch_from_newsapi(query='news', category=None, page_size=50):
-    """Fetch articles from NewsAPI with NLP-enhanced query"""
-    if not NEWS_API_KEY:
-        print("❌ NewsAPI Key not configured")
-        return []
-    
-    try:
-        # NLP Enhancement: Expand query with synonyms
-        expanded_query = expand_search_query(query)
-        
-        url = 'https://newsapi.org/v2/everything'
-        params = {
-            'apiKey': NEWS_API_KEY,
-            'q': expanded_query,  # Use expanded query
-            'pageSize': page_size,
-            'language': 'en',
-            'sortBy': 'publishedAt'
-        }
-        
-        print(f"📡 NewsAPI requesting with NLP: '{query}' (expanded: '{expanded_query}')")
-        response = requests.get(url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            articles = data.get('articles', [])
-            print(f"✅ NewsAPI returned {len(articles)} articles")
-            
-            default_images = {
-                'technology': 'https://images.unsplash.com/photo-1518770660439-4636190af475?w=400&h=200&fit=crop',
-                'health': 'https://images.unsplash.com/photo-1505751172876-fa1923c5c528?w=400&h=200&fit=crop',
-                'business': 'https://images.unsplash.com/photo-1486406146926-c627a92ad1ab?w=400&h=200&fit=crop',
-                'science': 'https://images.unsplash.com/photo-1532094349884-543bc11b234d?w=400&h=200&fit=crop',
-                'sports': 'https://images.unsplash.com/photo-1461896836934-ffe607ba8211?w=400&h=200&fit=crop',
-                'politics': 'https://images.unsplash.com/photo-1529107386315-e1a2ed48a620?w=400&h=200&fit=crop',
-                'entertainment': 'https://images.unsplash.com/photo-1514306191717-452ec28c7814?w=400&h=200&fit=crop',
-                'default': 'https://images.unsplash.com/photo-1504711434969-e33886168f5c?w=400&h=200&fit=crop'
-            }
-            
-            formatted_articles = []
-            search_terms = expanded_query.split()
-            
-            for article in articles:
-                if article.get('title') and article['title'] != '[Removed]':
-                    cat_lower = (category or 'general').lower()
-                    default_img = default_images.get(cat_lower, default_images['default'])
-                    
-                    article_data = {
-                        'title': article.get('title', 'No Title'),
-                        'description': article.get('description', ''),
-                        'content': article.get('content', ''),
-                        'url': article.get('url', ''),
-                        'image_url': article.get('urlToImage') or default_img,
-                        'source': article.get('source', {}).get('name', 'NewsAPI'),
-                        'author': article.get('author', 'Unknown'),
-                        'category': category or 'General',
-                        'tags': query,
-                        'published_at': article.get('publishedAt', datetime.utcnow().isoformat())
-                    }
-                    
-                    # NLP Enhancement: Calculate relevance score
-                    article_data['relevance_score'] = calculate_relevance_score(article_data, search_terms)
-                    formatted_articles.append(article_data)
-            
-            # NLP Enhancement: Sort by relevance score
-            formatted_articles.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-            print(f"🎯 NLP Ranking: Top article score = {formatted_articles[0].get('relevance_score', 0) if formatted_articles else 0}")
-            
-            return formatted_articles
-        else:
-            print(f"❌ NewsAPI Error: Status {response.status_code}")
-            return []
-    except Exception as e:
-        print(f"❌ NewsAPI Exception: {str(e)}")
-        return []
+# ========================================
+# PROVIDER RESPONSE CACHE
+# ========================================
+provider_cache = TTLCache(
+    ttl=int(os.getenv('PROVIDER_CACHE_TTL', '60')),
+    stale_ttl=int(os.getenv('PROVIDER_CACHE_STALE_TTL', '300')),
+    max_entries=int(os.getenv('PROVIDER_CACHE_MAX_ENTRIES', '512')),
+    max_bytes=int(os.getenv('PROVIDER_CACHE_MAX_BYTES', str(32 * 1024 * 1024))),
+    namespace='provider',
+    codec=(dumps, json.loads)
+)
+
+def provider_cache_key(provider, query, category=None, page_size=None):
+    """Cache key built from the normalized expanded query, so 'AI' and 'ai ' share an entry"""
+    normalized = ' '.join(expand_search_terms(query))
+    return (provider, normalized, (category or '').lower(), page_size)
+
+def cached_fetch(provider, query='news', category=None, page_size=None):
+    """Provider search through the shared cache; failures are raised, not cached"""
+    key = provider_cache_key(provider.name, query, category, page_size)
+    return provider_cache.get_or_load(key, lambda: provider.fetch(query, category, page_size), should_cache=bool)
+
+def live_query(category, search):
+    """The provider search a live /api/articles request runs"""
+    return search if search else (category if category else 'news')
+
+def live_fetchers(query, category=None):
+    """{provider name: zero-argument fetch} for the current app's configured providers, for fetch_all()"""
+    return {
+        name: (lambda provider=provider: cached_fetch(provider, query, category))
+        for name, provider in services().providers.items() if provider.configured
+    }
 
-def fetch_from_guardian(query='news', page_size=20):
-    """Fetch articles from Guardian API with NLP enhancement"""
-    if not GUARDIAN_API_KEY:
-        return []
+# ========================================
+# BACKGROUND INGESTION
+# ========================================
+def fetch_live_category(category):
+    """Pull one category from every provider for the ingestion worker (runs in its app's context)"""
+    query = category.lower()
+    return fetch_all(live_fetchers(query, category)).articles
+
+@api.cli.command('ingest')
+def ingest_command():
+    """Run one ingestion pass over every configured category"""
+    services().ingestion_worker.run_once()
+
+# ========================================
+# WRITE-BEHIND INTERACTION LOGGING
+# ========================================
+def write_interactions(rows):
+    """Bulk insert one batch of queued interactions in a single transaction (in the buffer's app context)"""
+    try:
+        with span('db.write'):
+            db.session.execute(insert(UserInteractions), rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        db.session.remove()
+        raise
     
     try:
-        # NLP Enhancement: Expand query
-        expanded_query = expand_search_query(query)
-        
-        url = 'https://content.guardianapis.com/search'
-        params = {
-            'api-key': GUARDIAN_API_KEY,
-            'q': expanded_query,
-            'page-size': page_size,
-            'show-fields': 'thumbnail,trailText,bodyText'
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            articles = data.get('response', {}).get('results', [])
-            
-            formatted_articles = []
-            for article in articles:
-                fields = article.get('fields', {})
-                formatted_articles.append({
-                    'title': article.get('webTitle', 'No Title'),
-                    'description': fields.get('trailText', ''),
-                    'content': fields.get('bodyText', ''),
-                    'url': article.get('webUrl', ''),
-                    'image_url': fields.get('thumbnail') or 'https://via.placeholder.com/400x200?text=News+Article',
-                    'source': 'The Guardian',
-                    'author': 'Guardian Staff',
-                    'category': article.get('sectionName', 'General'),
-                    'tags': query,
-                    'published_at': article.get('webPublicationDate', datetime.utcnow().isoformat())
-                })
-            
-            return formatted_articles
-        return []
+        # Keep cached feed profiles current without rebuilding them
+        services().feed_engine.observe_interactions(rows)
     except Exception as e:
-        print(f"❌ Guardian API Exception: {str(e)}")
-        return []
+        log_event('feed_update_failed', logging.WARNING, error=str(e))
+    finally:
+        db.session.remove()
 
-@app.route('/api/register', methods=['POST'])
+@api.route('/api/register', methods=['POST'])
 def register():
     data = request.json
     hashed_password = hashlib.sha256(data['password'].encode()).hexdigest()
@@ -298,7 +267,7 @@ def register():
     except:
         return jsonify({'message': 'User already exists'}), 400
 
-@app.route('/api/login', methods=['POST'])
+@api.route('/api/login', methods=['POST'])
 def login():
     data = request.json
     user = User.query.filter_by(email=data['email']).first()
@@ -307,7 +276,7 @@ def login():
         token = jwt.encode({
             'user_id': user.id,
             'exp': datetime.utcnow() + timedelta(days=1)
-        }, app.config['SECRET_KEY'], algorithm='HS256')
+        }, current_app.config['SECRET_KEY'], algorithm='HS256')
         
         return jsonify({
             'token': token,
@@ -321,7 +290,57 @@ def login():
     
     return jsonify({'message': 'Invalid credentials'}), 401
 
-@app.route('/api/articles', methods=['GET'])
+def load_article_page(category, search, fields, limit, cursor):
+    """One page of stored articles for a category and/or search; returns (articles, next_cursor)"""
+    next_cursor = None
+    use_index = bool(search) and search_index_available(db.engine)
+    # The LIKE fallback re-ranks rows by relevance, so it needs the scored text fields
+    always = ('published_at',) if use_index or not search else ('published_at', 'title', 'description', 'content')
+    query_obj = project(reads.query(Article), Article, fields, always=always)
+    
+    if category:
+        query_obj = query_obj.filter(Article.category == category)
+    
+    if use_index:
+        # NLP Enhancement: Expanded terms go to the FTS5 index, ranked by weighted bm25
+        offset = offset_from_cursor(cursor)
+        with span('db.search'):
+            ids = search_article_ids(
+                reads.session, expand_search_terms(search),
+                category=category or None,
+                limit=limit + 1, offset=offset
+            )
+        if len(ids) > limit:
+            ids = ids[:limit]
+            next_cursor = offset_cursor(offset + limit)
+        with span('db.query'):
+            by_id = {a.id: a for a in query_obj.filter(Article.id.in_(ids))} if ids else {}
+        return [by_id[i] for i in ids if i in by_id], next_cursor
+    
+    if search:
+        # NLP Enhancement: Expand search query for database search too
+        search_terms = expand_search_terms(search)
+        
+        filters = []
+        for term in search_terms[:5]:  # Limit to 5 terms
+            filters.append(Article.title.contains(term))
+            filters.append(Article.description.contains(term))
+            filters.append(Article.tags.contains(term))
+        
+        query_obj = query_obj.filter(or_(*filters))
+        with span('db.query'):
+            articles, next_cursor = paginate_keyset(query_obj, Article.published_at, Article.id, cursor, limit)
+        
+        # NLP Enhancement: Rank the LIKE matches by relevance (stable, so recency breaks ties)
+        with span('score'):
+            scores = score_articles(articles, search_terms)
+            articles = [a for _, a in sorted(zip(scores, articles), key=lambda x: x[0], reverse=True)]
+        return articles, next_cursor
+    
+    with span('db.query'):
+        return paginate_keyset(query_obj, Article.published_at, Article.id, cursor, limit)
+
+@api.route('/api/articles', methods=['GET'])
 @token_required
 def get_articles(current_user):
     """Get articles with NLP-enhanced search"""
@@ -330,63 +349,71 @@ def get_articles(current_user):
         search = request.args.get('search', '')
         fetch_live = request.args.get('fetch_live', 'false').lower() == 'true'
         
-        print(f"\n📥 Request: category={category}, search={search}, live={fetch_live}")
+        log_event('articles_request', category=category, search=search, live=fetch_live)
         
         if fetch_live:
-            print("🔴 Fetching live news with NLP enhancement...")
-            
-            query = search if search else (category if category else 'news')
-            
-            articles = []
-            newsapi_articles = fetch_from_newsapi(query)
-            articles.extend(newsapi_articles)
-            
-            guardian_articles = fetch_from_guardian(query)
-            articles.extend(guardian_articles)
+            # Under asgi.py the fan-out already ran on the event loop; otherwise run it here
+            result = request.environ.get(LIVE_RESULT_ENVIRON)
+            if result is None:
+                # Fan out to all providers at once; one slow provider no longer adds to the others
+                result = fetch_all(live_fetchers(live_query(category, search)))
+            # Both providers are scored on the same scale, so the merged list can be ranked together
+            articles = sorted(result.articles, key=lambda x: x.get('relevance_score', 0), reverse=True)
+            # Syndicated copies collapse onto the best-ranked one
+            with span('dedupe'):
+                articles = dedupe_articles(articles)
             
-            print(f"✅ Total live articles with NLP ranking: {len(articles)}")
-            return jsonify(articles)
+            with span('serialize'):
+                response = json_response([compact(a) for a in articles] if omit_empty_requested() else articles)
+            response.headers['X-Providers'] = ','.join(result.contributed)
+            response.headers['X-Providers-Timed-Out'] = ','.join(result.timed_out)
+            response.headers['X-Providers-Failed'] = ','.join(result.failed)
+            return response
         
-        query_obj = Article.query
+        fields = parse_fields(request.args.get('fields'), ARTICLE_FIELDS)
+        omit_empty = omit_empty_requested()
+        limit = page_size(request.args.get('limit'))
+        cursor = request.args.get('cursor')
+        category = category if category != 'All' else ''
         
-        if category and category != 'All':
-            query_obj = query_obj.filter(Article.category == category)
+        if request.args.get('stream', 'false').lower() == 'true':
+            if search:
+                # Search results are ranked and paged, not a stream in published order
+                return jsonify({'message': 'stream=true cannot be combined with search'}), 400
+            # Unbounded unless ?limit= is given; rows are streamed, never materialized
+            query_obj = project(reads.query(Article), Article, fields, always=('published_at',))
+            if category:
+                query_obj = query_obj.filter(Article.category == category)
+            query_obj = keyset_query(query_obj, Article.published_at, Article.id, cursor)
+            if request.args.get('limit'):
+                query_obj = query_obj.limit(limit)
+            return stream_query(query_obj, lambda a: serialize_article(a, fields, omit_empty))
         
-        if search:
-            # NLP Enhancement: Expand search query for database search too
-            expanded = expand_search_query(search)
-            search_terms = expanded.split()
-            
-            filters = []
-            for term in search_terms[:5]:  # Limit to 5 terms
-                filters.append(Article.title.contains(term))
-                filters.append(Article.description.contains(term))
-                filters.append(Article.tags.contains(term))
-            
-            from sqlalchemy import or_
-            query_obj = query_obj.filter(or_(*filters))
+        # Identical polls share one serialized page until the next article write
+        version, changed_at = article_version()
+        normalized = ' '.join(expand_search_terms(search)) if search else ''
+        key = (database_scope(), version, category, normalized, fields, limit, cursor, omit_empty)
         
-        articles = query_obj.order_by(Article.published_at.desc()).limit(50).all()
+        def load():
+            articles, next_cursor = load_article_page(category, search, fields, limit, cursor)
+            with span('serialize'):
+                body = dumps([serialize_article(a, fields, omit_empty) for a in articles])
+            return CachedListing(body, etag_for(body), changed_at, next_cursor)
         
-        return jsonify([{
-            'id': a.id,
-            'title': a.title,
-            'description': a.description,
-            'content': a.content,
-            'url': a.url,
-            'image_url': a.image_url,
-            'source': a.source,
-            'author': a.author,
-            'category': a.category,
-            'tags': a.tags,
-            'published_at': a.published_at.isoformat() if a.published_at else None
-        } for a in articles])
+        # No version means the cache backend is down: serve from the database
+        page = listing_cache.get_or_load(key, load) if version is not None else load()
+        response = json_response(page.body, etag=page.etag, last_modified=page.last_modified, encoded=page.encoded)
+        if page.next_cursor:
+            response.headers['X-Next-Cursor'] = page.next_cursor
+        return response
     
+    except InvalidCursor as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
-        print(f"❌ Error in get_articles: {str(e)}")
+        log_event('articles_failed', logging.ERROR, error=str(e))
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/preferences', methods=['GET', 'POST'])
+@api.route('/api/preferences', methods=['GET', 'POST'])
 @token_required
 def preferences(current_user):
     if request.method == 'GET':
@@ -413,29 +440,44 @@ def preferences(current_user):
         db.session.add(prefs)
     
     db.session.commit()
+    services().feed_engine.update_preferences(current_user.id, data.get('interests', []), data.get('preferred_sources', []))
     return jsonify({'message': 'Preferences updated'})
 
-@app.route('/api/interactions', methods=['POST'])
+@api.route('/api/feed', methods=['GET'])
+@token_required
+def get_feed(current_user):
+    """Personalized feed ranked by preference/interaction affinity and recency"""
+    fields = parse_fields(request.args.get('fields'), ARTICLE_FIELDS)
+    omit_empty = omit_empty_requested()
+    with span('score'):
+        ranked = services().feed_engine.top_k(current_user.id, page_size(request.args.get('limit')))
+    
+    ids = [article_id for article_id, _ in ranked]
+    with span('db.query'):
+        by_id = {a.id: a for a in project(reads.query(Article), Article, fields).filter(Article.id.in_(ids))} if ids else {}
+    with span('serialize'):
+        return json_response([
+            serialize_article(by_id[article_id], fields, omit_empty, feed_score=round(score, 4))
+            for article_id, score in ranked if article_id in by_id
+        ])
+
+@api.route('/api/interactions', methods=['POST'])
 @token_required
 def add_interaction(current_user):
     """Fixed: Handle interactions for both database and live news articles"""
     try:
         data = request.json
-        print(f"📥 Received interaction data: {data}")
         
         article_id = data.get('article_id') or data.get('id') or 0
         interaction_type = data.get('type', 'like')
         
-        interaction = UserInteractions(
-            user_id=current_user.id,
-            article_id=article_id,
-            interaction_type=interaction_type
-        )
-        
-        db.session.add(interaction)
-        db.session.commit()
-        
-        print(f"✅ Interaction saved: user_id={current_user.id}, article_id={article_id}, type={interaction_type}")
+        # Accepted now, written by the background flusher in the next batch
+        services().interaction_buffer.submit({
+            'user_id': current_user.id,
+            'article_id': article_id,
+            'interaction_type': interaction_type,
+            'created_at': datetime.utcnow()
+        })
         
         return jsonify({
             'message': 'Interaction recorded successfully',
@@ -447,30 +489,47 @@ def add_interaction(current_user):
             }
         }), 200
         
+    except BufferFull as e:
+        # The flusher is behind (e.g. the database is locked); ask the client to retry
+        log_event('interaction_rejected', logging.WARNING, error=str(e))
+        return jsonify({'message': 'Too many pending interactions, retry shortly'}), 503, {'Retry-After': '1'}
     except Exception as e:
-        print(f"❌ Error recording interaction: {str(e)}")
+        log_event('interaction_failed', logging.ERROR, error=str(e))
         return jsonify({'message': 'Error recording interaction', 'error': str(e)}), 500
 
-@app.route('/api/admin/articles', methods=['GET', 'POST', 'PUT', 'DELETE'])
+@api.route('/api/admin/articles', methods=['GET', 'POST', 'PUT', 'DELETE'])
 @token_required
 def admin_articles(current_user):
     if current_user.role != 'admin':
         return jsonify({'message': 'Unauthorized'}), 403
     
     if request.method == 'GET':
-        articles = Article.query.order_by(Article.created_at.desc()).all()
-        return jsonify([{
-            'id': a.id,
-            'title': a.title,
-            'description': a.description,
-            'content': a.content,
-            'category': a.category,
-            'tags': a.tags,
-            'source': a.source,
-            'author': a.author,
-            'image_url': a.image_url,
-            'published_at': a.published_at.isoformat() if a.published_at else None
-        } for a in articles])
+        fields = parse_fields(request.args.get('fields'), ADMIN_ARTICLE_FIELDS)
+        omit_empty = omit_empty_requested()
+        query_obj = project(reads.query(Article), Article, fields, always=('created_at',))
+        
+        if request.args.get('stream', 'false').lower() == 'true':
+            # Export mode: the whole table (or ?limit= rows), streamed from a server-side cursor
+            try:
+                query_obj = keyset_query(query_obj, Article.created_at, Article.id, request.args.get('cursor'))
+            except InvalidCursor as e:
+                return jsonify({'message': str(e)}), 400
+            if request.args.get('limit'):
+                query_obj = query_obj.limit(page_size(request.args.get('limit')))
+            return stream_query(query_obj, lambda a: serialize_article(a, fields, omit_empty))
+        
+        try:
+            articles, next_cursor = paginate_keyset(
+                query_obj, Article.created_at, Article.id,
+                request.args.get('cursor'), page_size(request.args.get('limit'))
+            )
+        except InvalidCursor as e:
+            return jsonify({'message': str(e)}), 400
+        
+        response = json_response([serialize_article(a, fields, omit_empty) for a in articles])
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
     
     elif request.method == 'POST':
         data = request.json
@@ -513,7 +572,51 @@ def admin_articles(current_user):
             return jsonify({'message': 'Article deleted'})
         return jsonify({'message': 'Article not found'}), 404
 
-@app.route('/api/admin/users', methods=['GET'])
+@api.route('/api/admin/articles/bulk', methods=['GET', 'POST'])
+@token_required
+def bulk_articles(current_user):
+    """
+    NDJSON export (GET) and import (POST), one article per line. Export streams
+    by ascending id; resume an interrupted one with ?after_id=<last id seen>.
+    Import answers with one progress line per committed batch, then a summary.
+    """
+    if current_user.role != 'admin':
+        return jsonify({'message': 'Unauthorized'}), 403
+    
+    if request.method == 'GET':
+        fields = parse_fields(request.args.get('fields'), EXPORT_ARTICLE_FIELDS)
+        query_obj = project(reads.query(Article), Article, fields)
+        try:
+            after_id = int(request.args.get('after_id', 0))
+        except ValueError:
+            return jsonify({'message': 'after_id must be an integer'}), 400
+        if after_id:
+            query_obj = query_obj.filter(Article.id > after_id)
+        if request.args.get('category'):
+            query_obj = query_obj.filter(Article.category == request.args['category'])
+        query_obj = query_obj.order_by(Article.id)
+        if request.args.get('limit'):
+            query_obj = query_obj.limit(page_size(request.args.get('limit')))
+        return stream_query(query_obj, lambda a: serialize_article(a, fields), ndjson=True)
+    
+    try:
+        batch_size = min(max(int(request.args.get('batch_size', 0)), 0), 10000) or None
+    except ValueError:
+        return jsonify({'message': 'batch_size must be an integer'}), 400
+    
+    def progress_lines():
+        # The body is read while the response streams, one batch ahead of the progress lines
+        try:
+            for progress in import_ndjson(db.session, read_lines(request.stream), batch_size):
+                yield dumps(progress.as_dict()) + b'\n'
+        except Exception as e:
+            db.session.rollback()
+            log_event('import_failed', logging.ERROR, error=str(e))
+            yield dumps({'done': False, 'error': str(e)}) + b'\n'
+    
+    return Response(stream_with_context(progress_lines()), mimetype='application/x-ndjson')
+
+@api.route('/api/admin/users', methods=['GET'])
 @token_required
 def admin_users(current_user):
     if current_user.role != 'admin':
@@ -528,22 +631,62 @@ def admin_users(current_user):
         'created_at': u.created_at.isoformat()
     } for u in users])
 
-@app.route('/api/admin/stats', methods=['GET'])
+@api.route('/api/admin/stats', methods=['GET'])
 @token_required
 def admin_stats(current_user):
     if current_user.role != 'admin':
         return jsonify({'message': 'Unauthorized'}), 403
     
-    return jsonify({
-        'total_users': User.query.count(),
-        'total_articles': Article.query.count(),
-        'total_reads': ReadingHistory.query.count(),
-        'total_interactions': UserInteractions.query.count()
+    if stats_counters_available(db.engine):
+        # Trigger-maintained counters: a few indexed rows, independent of table sizes
+        stats = read_stats(reads.session)
+    else:
+        stats = {
+            'total_users': User.query.count(),
+            'total_articles': Article.query.count(),
+            'total_reads': ReadingHistory.query.count(),
+            'total_interactions': UserInteractions.query.count()
+        }
+    
+    app_services = services()
+    stats.update({
+        'provider_cache': provider_cache.stats(),
+        'providers': {name: provider.stats() for name, provider in app_services.providers.items()},
+        'auth_cache': auth_cache.stats(),
+        'listing_cache': response_cache.stats(),
+        'interaction_queue': app_services.interaction_buffer.stats(),
+        'feed': app_services.feed_engine.stats()
     })
+    return jsonify(stats)
+
+# ========================================
+# METRICS
+# ========================================
+telemetry.registry.gauge('newsai_interaction_queue_depth', 'Interactions waiting to be written',
+                         lambda: sum(s.interaction_buffer.depth() for s in list(_all_services)))
+telemetry.registry.gauge('newsai_provider_cache_entries', 'Entries in the provider response cache',
+                         lambda: provider_cache.stats()['entries'])
+telemetry.registry.gauge('newsai_provider_cache_hit_rate', 'Provider response cache hit rate',
+                         lambda: provider_cache.stats()['hit_rate'])
+telemetry.registry.gauge('newsai_listing_cache_hit_rate', 'Article listing response cache hit rate',
+                         lambda: listing_cache.stats()['hit_rate'])
+
+@api.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint (set METRICS_TOKEN to require a bearer token)"""
+    return telemetry.metrics_response()
 
 if __name__ == '__main__':
+    app = create_app()
+    app_services = services(app)
+    for provider in app_services.providers.values():
+        print(f"✅ {provider.name} provider configured" if provider.configured
+              else f"❌ {provider.name} provider not configured (missing API key)")
+    
     with app.app_context():
         db.create_all()
+        # create_all skips existing tables; migrations bring them up to date without dropping data
+        upgrade(db.engine)
         print("✅ Database tables ready")
         
         admin = User.query.filter_by(email='admin@news.com').first()
@@ -564,4 +707,9 @@ if __name__ == '__main__':
     print("   ✅ Smart query expansion")
     print("   ✅ Relevance scoring and ranking")
     print("📡 Make sure your .env file has valid API keys!")
+    
+    # Only start the worker in the serving process, not the debug reloader's parent
+    if os.getenv('INGEST_ENABLED', 'false').lower() == 'true' and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        app_services.ingestion_worker.start()
+        print(f"📰 Ingestion worker running every {app_services.ingestion_worker.interval}s")
     app.run(debug=True, port=5000)
\ No newline at end of file
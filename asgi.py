@@ -0,0 +1,299 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import os
+import sys
+import tempfile
+import threading
+
+try:
+    import httpx
+except ImportError:  # optional: without it live fetches run on the WSGI threads as before
+    httpx = None
+
+from flask import request
+
+import http_client
+from app import authenticate, create_app, live_query, provider_cache, provider_cache_key, services
+from fanout import LIVE_RESULT_ENVIRON, fetch_all_async
+from telemetry import log_event
+
+# ========================================
+# ASGI SERVING MODE
+# ========================================
+# Serve the API from an event loop instead of one thread per request:
+#     pip install uvicorn httpx
+#     uvicorn asgi:app --workers 4
+# Live /api/articles fetches wait on upstream providers on the loop, over a
+# shared httpx.AsyncClient, so thousands can be in flight per process. Only
+# the short Flask part of a request (auth, DB queries, serialization) runs on
+# a bounded thread pool, and every other route runs there unchanged. Buffered
+# responses are written from the loop; only streamed ones (stream=true,
+# bulk export) keep their pool thread until the client has read them. Without
+# httpx installed, live requests fall back to the threaded fan-out.
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', '32'))
+ASYNC_HTTP_MAX_CONNECTIONS = int(os.getenv('ASYNC_HTTP_MAX_CONNECTIONS', '200'))
+# Request bodies above this size are spooled to disk before the view reads them
+ASGI_BODY_SPOOL_BYTES = int(os.getenv('ASGI_BODY_SPOOL_BYTES', str(1024 * 1024)))
+
+# Built on lifespan startup (or the first request), not at import, so importing
+# this module does not create an app and its workers
+_flask_app = None
+_flask_app_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=ASGI_THREADS, thread_name_prefix='asgi')
+_client = None
+# provider cache key -> in-flight fetch task, shared by concurrent misses
+_flights = {}
+
+
+def flask_app():
+    """The Flask app served by this process"""
+    global _flask_app
+    if _flask_app is None:
+        with _flask_app_lock:
+            if _flask_app is None:
+                _flask_app = create_app()
+    return _flask_app
+
+
+def _http_client():
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers=http_client.DEFAULT_HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=ASYNC_HTTP_MAX_CONNECTIONS,
+                                max_keepalive_connections=ASYNC_HTTP_MAX_CONNECTIONS),
+            transport=httpx.AsyncHTTPTransport(retries=http_client.HTTP_RETRIES),
+        )
+    return _client
+
+
+# ---------- live fetches on the event loop ----------
+
+def _store(key, task):
+    _flights.pop(key, None)
+    if not task.cancelled() and task.exception() is None and task.result():
+        provider_cache.set(key, task.result())
+
+
+async def cached_fetch_async(provider, query='news', category=None, page_size=None):
+    """cached_fetch() for the event loop; failures are raised, not cached"""
+    key = provider_cache_key(provider.name, query, category, page_size)
+    cached = provider_cache.get(key)
+    if cached is not None:
+        return cached
+    task = _flights.get(key)
+    if task is None:
+        task = _flights[key] = asyncio.ensure_future(
+            provider.fetch_async(_http_client(), query, category, page_size))
+        task.add_done_callback(partial(_store, key))
+    # One waiter hitting its deadline must not cancel the call the others share
+    return await asyncio.shield(task)
+
+
+def live_fetchers_async(query, category=None):
+    return {
+        name: partial(cached_fetch_async, provider, query, category)
+        for name, provider in services(flask_app()).providers.items() if provider.configured
+    }
+
+
+def _is_live(scope):
+    return (scope['method'] == 'GET' and scope['path'] == '/api/articles'
+            and b'fetch_live=true' in scope['query_string'].lower())
+
+
+def _live_query(environ):
+    """
+    The provider query for an authenticated live request, else None (the
+    view then answers as usual, e.g. with a 401). Runs on the thread pool.
+    """
+    with flask_app().request_context(environ):
+        if request.args.get('fetch_live', 'false').lower() != 'true':
+            return None
+        authorization = request.headers.get('Authorization')
+        try:
+            if not authorization or authenticate(authorization) is None:
+                return None
+        except Exception:
+            return None
+        return live_query(request.args.get('category', ''), request.args.get('search', ''))
+
+
+# ---------- WSGI bridge ----------
+
+class ClientDisconnected(Exception):
+    """The client went away before its request body was complete"""
+
+
+async def _read_body(receive):
+    body = tempfile.SpooledTemporaryFile(max_size=ASGI_BODY_SPOOL_BYTES)
+    more = True
+    while more:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            # A truncated upload must not be dispatched as if it were complete
+            body.close()
+            raise ClientDisconnected()
+        body.write(message.get('body', b''))
+        more = message.get('more_body', False)
+    return body
+
+
+def _environ(scope, body):
+    """WSGI environ for a fully read `body`, left positioned at its end"""
+    server = scope.get('server') or ('localhost', None)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f'HTTP_{name}'
+        value = value.decode('latin-1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    # The server has already de-chunked and buffered the body, so its length is
+    # known even for Transfer-Encoding: chunked requests (which werkzeug would
+    # otherwise read as empty)
+    environ['CONTENT_LENGTH'] = str(body.tell())
+    environ['wsgi.input_terminated'] = True
+    body.seek(0)
+    return environ
+
+
+def _write_unsupported(data):
+    raise NotImplementedError('the WSGI write() callable is not supported')
+
+
+def _start_message(status, headers):
+    return {'type': 'http.response.start', 'status': status,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]}
+
+
+def _call_wsgi(environ):
+    """
+    Call the Flask app on a pool thread; returns (status, headers, body,
+    iterable). Every non-streamed Flask response here carries a Content-Length
+    and is already in memory, so its body is joined here and the thread is free before the client reads it.
+    Streamed responses come back as an open `iterable` instead.
+    """
+    started = []
+
+    def start_response(status, headers, exc_info=None):
+        started[:] = [int(status.split(' ', 1)[0]), headers]
+        return _write_unsupported
+
+    iterable = flask_app()(environ, start_response)
+    if started and any(name.lower() == 'content-length' for name, _ in started[1]):
+        try:
+            body = b''.join(iterable)
+        finally:
+            if hasattr(iterable, 'close'):
+                iterable.close()
+        return started[0], started[1], body, None
+    return None, None, None, (iterable, started)
+
+
+def _stream_wsgi(iterable, started, send, loop):
+    """
+    Push a streamed body through the event loop from the pool thread that
+    produced it: stream_with_context keeps the request context on that one
+    thread, so it stays held until the client has taken the last chunk.
+    """
+    def send_sync(message):
+        asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+    try:
+        # Hold one chunk back so the last one goes out with more_body=False
+        pending = None
+        for chunk in iterable:
+            if not chunk:
+                continue
+            if pending is None:
+                send_sync(_start_message(*started))
+            else:
+                send_sync({'type': 'http.response.body', 'body': pending, 'more_body': True})
+            pending = chunk
+        if pending is None:
+            send_sync(_start_message(*started))
+        send_sync({'type': 'http.response.body', 'body': pending or b'', 'more_body': False})
+    finally:
+        if hasattr(iterable, 'close'):
+            iterable.close()
+
+
+def _run_wsgi(environ, send, loop):
+    """Call the app and, for a streamed response, send its body from this same thread"""
+    status, headers, body, streamed = _call_wsgi(environ)
+    if streamed is not None:
+        _stream_wsgi(*streamed, send, loop)
+    return status, headers, body
+
+
+async def _http(scope, receive, send):
+    loop = asyncio.get_running_loop()
+    try:
+        environ = _environ(scope, await _read_body(receive))
+    except ClientDisconnected:
+        return
+
+    if httpx is not None and _is_live(scope):
+        query = await loop.run_in_executor(_executor, _live_query, environ)
+        if query is not None:
+            environ[LIVE_RESULT_ENVIRON] = await fetch_all_async(live_fetchers_async(query))
+
+    status, headers, body = await loop.run_in_executor(_executor, _run_wsgi, environ, send, loop)
+    if body is not None:
+        # Buffered responses are written from the loop, so a slow reader holds no pool thread
+        await send(_start_message(status, headers))
+        await send({'type': 'http.response.body', 'body': body, 'more_body': False})
+
+
+# ---------- lifespan ----------
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            if httpx is None:
+                log_event('asgi_without_httpx', force=True,
+                          note='httpx not installed; live fetches use the threaded fan-out')
+            app_services = services(flask_app())
+            if os.getenv('INGEST_ENABLED', 'false').lower() == 'true':
+                app_services.ingestion_worker.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if _client is not None:
+                await _client.aclose()
+            app_services = services(flask_app())
+            app_services.ingestion_worker.stop(timeout=5)
+            # Write the interactions still queued before the process exits
+            app_services.interaction_buffer.stop(timeout=5)
+            _executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'http':
+        await _http(scope, receive, send)
+    elif scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+    else:
+        raise NotImplementedError(f"unsupported ASGI scope type {scope['type']!r}")
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import time
+
+import jwt
+
+from cache import TTLCache
+
+# ========================================
+# AUTHENTICATED PRINCIPAL CACHE
+# ========================================
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', '60'))
+AUTH_CACHE_SIZE = int(os.getenv('AUTH_CACHE_SIZE', '10000'))
+
+
+
+class Principal:
+    """Detached snapshot of the User fields request handlers rely on"""
+    __slots__ = ('id', 'email', 'name', 'role')
+
+    def __init__(self, id, email, name, role):
+        self.id = id
+        self.email = email
+        self.name = name
+        self.role = role
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.email, user.name, user.role)
+
+    def encode(self):
+        return json.dumps([self.id, self.email, self.name, self.role]).encode()
+
+    @classmethod
+    def decode(cls, raw):
+        return cls(*json.loads(raw))
+
+
+# (database scope, user id) -> Principal; short TTL, dropped immediately when the user row changes.
+# Shared between workers when a cache backend is configured, so a role change
+# in one worker is seen by all of them.
+user_cache = TTLCache(ttl=AUTH_USER_CACHE_TTL, max_entries=AUTH_CACHE_SIZE, sizeof=None,
+                      namespace='principal', codec=(Principal.encode, Principal.decode))
+# sha256(secret, token) -> decoded payload, kept until the token itself expires. Always
+# per process: verifying a signature is cheaper than a network round trip.
+token_cache = TTLCache(ttl=AUTH_USER_CACHE_TTL, max_entries=AUTH_CACHE_SIZE, sizeof=None)
+
+
+def decode_token(token, secret):
+    """jwt.decode, memoized by token hash until the token's `exp`"""
+    # Keyed by the secret too, so a token verified by one app is not trusted by another
+    key = hashlib.sha256(secret.encode() + b'\0' + token.encode()).hexdigest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        # The cached entry never outlives `exp`, but check anyway in case of clock skew
+        if payload.get('exp', float('inf')) > time.time():
+            return payload
+        token_cache.delete(key)
+
+    payload = jwt.decode(token, secret, algorithms=['HS256'])
+    ttl = payload['exp'] - time.time() if 'exp' in payload else AUTH_USER_CACHE_TTL
+    if ttl > 0:
+        token_cache.set(key, payload, ttl=ttl)
+    return payload
+
+
+def load_principal(user_id, load_user, scope=''):
+    """
+    Principal for `user_id`, calling `load_user(user_id)` only on a cache miss.
+    `scope` names the user table (e.g. the database URL) the id belongs to.
+    """
+    def loader():
+        user = load_user(user_id)
+        return Principal.from_user(user) if user is not None else None
+    return user_cache.get_or_load((scope, user_id), loader, should_cache=lambda p: p is not None)
+
+
+def invalidate_user(user_id, scope=''):
+    user_cache.delete((scope, user_id))
+
+
+def stats():
+    return {'users': user_cache.stats(), 'tokens': token_cache.stats()}
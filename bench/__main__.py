@@ -0,0 +1,142 @@
+import argparse
+import os
+import sys
+
+# ========================================
+# BENCHMARK CLI
+# ========================================
+#     python -m bench corpus --rows 100k          seed bench/.data/bench-100000.db
+#     python -m bench micro [--save]              NLP/scoring micro-benchmarks
+#     python -m bench micro --app OLD/app.py      the same against another checkout
+#     python -m bench load --rows 10k [--save]    load scenarios against the seeded DB
+#     python -m bench stub --latency-ms 150       run the stub providers standalone
+#     python -m bench stub-cache --port 6399      run a Redis-protocol stand-in (CACHE_URL)
+#
+# Results are compared with bench/baselines/<name>.json; --save replaces it.
+# Micro baselines are named per --scale (micro, micro-x0.1, ...), and a
+# baseline recorded with other run parameters is reported instead of compared.
+# --fail-on-regression exits 1 when any metric regressed or the baseline
+# could not be compared (for CI).
+# micro-before.json holds the numbers of the tree before the optimizations:
+#     python -m bench micro --app <checkout of the baseline revision>/app.py --name micro-before
+
+# Benchmarks must not spend their time writing request logs
+os.environ.setdefault('LOG_SAMPLE_RATE', '0')
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+
+def _corpus(args):
+    from bench.corpus import database_url, seed
+    from bench.common import parse_count
+    rows = parse_count(args.rows)
+    seed(args.db or database_url(rows), rows, seed_value=args.seed, content_words=args.content_words)
+    return 0
+
+
+def _micro(args):
+    from bench import micro
+    from bench.common import REPO_DIR, report, run_metadata
+    print('Running micro-benchmarks...')
+    results = micro.run(args.only, scale=args.scale, app_path=args.app)
+    meta = run_metadata(os.path.dirname(os.path.abspath(args.app)) if args.app else REPO_DIR, scale=args.scale)
+    name = args.name or ('micro' if args.scale == 1 else f'micro-x{args.scale:g}')
+    return report('micro', name, results,
+                  ('ops_per_sec', 'p50_us', 'p99_us', 'peak_kib'), meta, args.save, args.threshold)
+
+
+def _load(args):
+    from bench import load
+    from bench.common import parse_count, report, run_metadata
+    from bench.corpus import database_url, seed
+    rows = parse_count(args.rows)
+    db_url = args.db or database_url(rows)
+    seed(db_url, rows)
+
+    print(f'Running load scenarios against {rows:,} articles...')
+    results = load.run(db_url, rows, args.only, concurrency=args.concurrency, duration=args.duration,
+                       warmup=args.warmup, stub_latency_ms=args.stub_latency_ms, port=args.port)
+    meta = run_metadata(rows=rows, concurrency=args.concurrency, duration=args.duration,
+                        stub_latency_ms=args.stub_latency_ms)
+    return report('load', args.name or f'load-{args.rows}', results,
+                  ('throughput_rps', 'p50_ms', 'p99_ms', 'max_ms', 'errors', 'rss_mib', 'peak_rss_mib'),
+                  meta, args.save, args.threshold)
+
+
+def _stub(args):
+    import time
+    from bench.stub_server import start_stub_server
+    server = start_stub_server(args.port, args.latency_ms, args.jitter_ms, args.error_rate)
+    print(f'Stub providers on {server.url} (latency {args.latency_ms}ms +/- {args.jitter_ms}ms)')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+def _stub_cache(args):
+    import time
+    from bench.stub_cache import start_stub_cache
+    server = start_stub_cache(args.port)
+    print(f'Stub cache on {server.url}')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench', description='NewsAI benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    corpus = commands.add_parser('corpus', help='seed a synthetic article corpus')
+    corpus.add_argument('--rows', default='10k', help='article count, e.g. 10k, 100k, 1m')
+    corpus.add_argument('--db', help='DATABASE_URL (default bench/.data/bench-<rows>.db)')
+    corpus.add_argument('--seed', type=int, default=42)
+    corpus.add_argument('--content-words', type=int, default=250)
+    corpus.set_defaults(handler=_corpus)
+
+    for name, handler in (('micro', _micro), ('load', _load)):
+        sub = commands.add_parser(name, help=f'run the {name} suite')
+        sub.add_argument('--only', nargs='*', help='only benchmarks whose name contains one of these')
+        sub.add_argument('--name', help='baseline name to compare with / save as')
+        sub.add_argument('--save', action='store_true', help='store these results as the baseline')
+        sub.add_argument('--threshold', type=float, help='regression threshold in percent')
+        sub.add_argument('--fail-on-regression', action='store_true')
+        sub.set_defaults(handler=handler)
+        if name == 'micro':
+            sub.add_argument('--scale', type=float, default=1.0, help='multiply iteration counts')
+            sub.add_argument('--app', help="measure another checkout's app.py instead of this tree")
+        else:
+            sub.add_argument('--rows', default='10k')
+            sub.add_argument('--db', help='DATABASE_URL (default bench/.data/bench-<rows>.db)')
+            sub.add_argument('--concurrency', type=int, default=8)
+            sub.add_argument('--duration', type=float, default=10.0, help='seconds per scenario')
+            sub.add_argument('--warmup', type=float, default=2.0)
+            sub.add_argument('--stub-latency-ms', type=float, default=100)
+            sub.add_argument('--port', type=int, default=5055)
+
+    stub = commands.add_parser('stub', help='run the stub NewsAPI/Guardian server')
+    stub.add_argument('--port', type=int, default=5056)
+    stub.add_argument('--latency-ms', type=float, default=100)
+    stub.add_argument('--jitter-ms', type=float, default=0)
+    stub.add_argument('--error-rate', type=float, default=0.0)
+    stub.set_defaults(handler=_stub)
+
+    stub_cache = commands.add_parser('stub-cache', help='run a Redis-protocol stand-in for CACHE_URL')
+    stub_cache.add_argument('--port', type=int, default=6399)
+    stub_cache.set_defaults(handler=_stub_cache)
+
+    args = parser.parse_args(argv)
+    outcome = args.handler(args)
+    if outcome is None or isinstance(outcome, list):
+        # None: the baseline was recorded with other run parameters
+        return 1 if (outcome is None or outcome) and args.fail_on_regression else 0
+    return outcome
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import subprocess
+
+# ========================================
+# BENCHMARK RESULTS AND BASELINES
+# ========================================
+# Every suite produces {name: {metric: value}}. Results can be saved as a
+# baseline under bench/baselines/ and later runs are compared against it:
+# latency/memory metrics regress when they grow, throughput metrics when
+# they shrink, by more than BENCH_REGRESSION_PCT percent.
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+BASELINE_DIR = os.path.join(BENCH_DIR, 'baselines')
+DATA_DIR = os.path.join(BENCH_DIR, '.data')
+BENCH_REGRESSION_PCT = float(os.getenv('BENCH_REGRESSION_PCT', '20'))
+
+# Metrics where a larger number is better; everything else is "lower is better"
+HIGHER_IS_BETTER = {'throughput_rps', 'ops_per_sec'}
+# Counts that describe the run rather than its performance
+NOT_COMPARED = {'requests', 'errors', 'iterations'}
+# Run parameters that change the numbers; a baseline recorded with other
+# values is not compared against (store one per shape with --name)
+RUN_SHAPE = ('scale', 'rows', 'concurrency', 'duration', 'stub_latency_ms')
+
+
+def parse_count(value):
+    """'10k' -> 10000, '1m' -> 1000000, '2500' -> 2500"""
+    value = str(value).strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(value[-1:], 1)
+    if multiplier != 1:
+        value = value[:-1]
+    return int(float(value) * multiplier)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def latency_summary(latencies):
+    """p50/p99/max in milliseconds from a list of durations in seconds"""
+    ordered = sorted(latencies)
+    return {
+        'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+def process_memory_mib(pid=None):
+    """(current RSS, peak RSS) in MiB from /proc; (None, None) where that is unavailable"""
+    path = f'/proc/{pid or "self"}/status'
+    try:
+        with open(path) as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+    except OSError:
+        return None, None
+
+    def mib(name):
+        value = fields.get(name)
+        return round(int(value.split()[0]) / 1024, 1) if value else None
+
+    return mib('VmRSS'), mib('VmHWM')
+
+
+def run_metadata(tree=REPO_DIR, **extra):
+    """Host and revision of the measured `tree` plus the run parameters in `extra`"""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=tree,
+                                  capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        revision = ''
+    return dict({
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': revision,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }, **extra)
+
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f'{name}.json')
+
+
+def load_baseline(name):
+    try:
+        with open(baseline_path(name)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(name, report):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(name), 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results, baseline_results, threshold_pct=None):
+    """[(name, metric, baseline, current, change_pct)] for every metric that regressed"""
+    threshold = BENCH_REGRESSION_PCT if threshold_pct is None else threshold_pct
+    regressions = []
+    for name, metrics in results.items():
+        previous = baseline_results.get(name, {})
+        for metric, value in metrics.items():
+            before = previous.get(metric)
+            if metric in NOT_COMPARED or not isinstance(value, (int, float)) or not before:
+                continue
+            change = (value - before) / before * 100
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            if worse > threshold:
+                regressions.append((name, metric, before, value, round(change, 1)))
+    return regressions
+
+
+def format_table(results, columns):
+    rows = [['name'] + list(columns)]
+    for name, metrics in results.items():
+        rows.append([name] + ['' if metrics.get(c) is None else str(metrics.get(c)) for c in columns])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ['  '.join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows]
+    lines.insert(1, '  '.join('-' * width for width in widths))
+    return '\n'.join(lines)
+
+
+def shape_mismatch(meta, baseline_meta):
+    """[(parameter, baseline value, current value)] for RUN_SHAPE entries that differ"""
+    return [(key, baseline_meta.get(key), meta.get(key)) for key in RUN_SHAPE
+            if (key in meta or key in baseline_meta) and baseline_meta.get(key) != meta.get(key)]
+
+
+def report(suite, name, results, columns, meta, save=False, threshold_pct=None):
+    """
+    Print the results table, compare against the stored baseline and optionally
+    replace it. Returns the regressions, or None when the baseline was recorded
+    with a different run shape and could not be compared.
+    """
+    print(format_table(results, columns))
+
+    baseline = load_baseline(name)
+    regressions = []
+    mismatch = shape_mismatch(meta, baseline.get('meta', {})) if baseline is not None else []
+    if baseline is None:
+        print(f"\nNo baseline stored for '{name}' (run with --save to create {baseline_path(name)})")
+    elif mismatch:
+        regressions = None
+        print(f"\nNot compared with baseline '{name}': it was recorded with "
+              + ', '.join(f'{key}={before} (this run: {after})' for key, before, after in mismatch))
+    else:
+        regressions = compare(results, baseline.get('results', {}), threshold_pct)
+        base_meta = baseline.get('meta', {})
+        print(f"\nCompared with baseline '{name}' from {base_meta.get('timestamp', '?')} "
+              f"(rev {base_meta.get('revision') or '?'}):")
+        if regressions:
+            for bench, metric, before, after, change in regressions:
+                print(f"  REGRESSION {bench}.{metric}: {before} -> {after} ({change:+.1f}%)")
+        else:
+            print(f"  no regressions beyond {threshold_pct or BENCH_REGRESSION_PCT:g}%")
+
+    if save:
+        save_baseline(name, {'suite': suite, 'meta': meta, 'results': results})
+        print(f"Saved baseline {baseline_path(name)}")
+    return regressions
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+import hashlib
+import os
+import random
+import time
+
+from sqlalchemy import create_engine, event, func, insert, select
+
+from bench.common import DATA_DIR
+from migrations import upgrade
+from models import db, Article, User
+from nlp import SYNONYMS
+
+# ========================================
+# SYNTHETIC ARTICLE CORPUS
+# ========================================
+# Deterministic (seeded) articles built from the synonym vocabulary, so the
+# NLP expansion, FTS and LIKE paths all find matches. Rows are inserted
+# before the FTS/stats triggers exist where possible; upgrade() then builds
+# the index and backfills the counters in one pass, which is far faster
+# than firing triggers for 1M single-row inserts.
+BENCH_ADMIN_EMAIL = 'admin@news.com'
+BENCH_ADMIN_PASSWORD = 'admin123'
+BENCH_USER_EMAIL = 'bench@news.com'
+BENCH_USER_PASSWORD = 'bench123'
+
+CATEGORIES = ['Technology', 'Business', 'Science', 'Health', 'Sports', 'Politics', 'Entertainment', 'World']
+SOURCES = ['TechNews', 'EcoDaily', 'FinanceToday', 'Reuters', 'BBC News', 'The Verge', 'Wired', 'AP']
+FILLER = ('the a report new says after market first year week people company government study data '
+          'local global team plan growth early latest major update expected analysis').split()
+VOCABULARY = sorted({word for key, values in SYNONYMS.items() for phrase in [key] + values
+                     for word in phrase.lower().split()})
+BATCH_ROWS = 5000
+
+
+def database_url(rows):
+    return 'sqlite:///' + os.path.join(DATA_DIR, f'bench-{rows}.db')
+
+
+def _words(rng, count, topical):
+    return ' '.join(rng.choice(VOCABULARY) if rng.random() < topical else rng.choice(FILLER)
+                    for _ in range(count))
+
+
+def generate_articles(count, start=0, seed=42, content_words=250, now=None):
+    """Yield `count` article row dicts; the same (start, seed) always yields the same rows"""
+    now = now or datetime(2025, 1, 1)
+    for i in range(start, start + count):
+        rng = random.Random(seed * 1000003 + i)
+        tags = sorted({rng.choice(VOCABULARY) for _ in range(rng.randint(2, 4))})
+        yield {
+            'title': _words(rng, rng.randint(6, 12), 0.35).capitalize(),
+            'description': _words(rng, rng.randint(20, 35), 0.2),
+            'content': _words(rng, content_words, 0.1),
+            'url': f'https://bench.example/articles/{i}',
+            'image_url': f'https://bench.example/images/{i % 500}.jpg',
+            'source': rng.choice(SOURCES),
+            'author': f'Author {i % 997}',
+            'category': rng.choice(CATEGORIES),
+            'tags': ', '.join(tags),
+            'published_at': now - timedelta(seconds=rng.randint(0, 90 * 86400)),
+            'created_at': now - timedelta(seconds=i % 86400),
+        }
+
+
+def _fast_load_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode = WAL')
+    cursor.execute('PRAGMA synchronous = OFF')
+    cursor.execute('PRAGMA cache_size = -200000')
+    cursor.close()
+
+
+def _hash(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def seed(url, rows, seed_value=42, content_words=250, log=print):
+    """
+    Create the schema at `url` and top the article table up to `rows` rows,
+    plus the admin and benchmark users. Returns the number of rows inserted.
+    """
+    engine = create_engine(url)
+    if engine.dialect.name == 'sqlite':
+        if engine.url.database:
+            os.makedirs(os.path.dirname(os.path.abspath(engine.url.database)), exist_ok=True)
+        event.listen(engine, 'connect', _fast_load_pragmas)
+    db.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        for email, password, name, role in [(BENCH_ADMIN_EMAIL, BENCH_ADMIN_PASSWORD, 'Admin User', 'admin'),
+                                            (BENCH_USER_EMAIL, BENCH_USER_PASSWORD, 'Bench User', 'user')]:
+            if conn.execute(select(User.id).where(User.email == email)).first() is None:
+                conn.execute(insert(User), [{'email': email, 'password': _hash(password), 'name': name,
+                                             'role': role, 'created_at': datetime.utcnow()}])
+        existing = conn.execute(select(func.count(Article.id))).scalar()
+
+    missing = max(rows - existing, 0)
+    started = time.perf_counter()
+    inserted = 0
+    generator = generate_articles(missing, start=existing, seed=seed_value, content_words=content_words)
+    while inserted < missing:
+        batch = [row for _, row in zip(range(BATCH_ROWS), generator)]
+        with engine.begin() as conn:
+            conn.execute(insert(Article), batch)
+        inserted += len(batch)
+        if inserted % (BATCH_ROWS * 20) == 0 or inserted == missing:
+            log(f"  {existing + inserted:,} / {rows:,} articles ({time.perf_counter() - started:.1f}s)")
+
+    # Builds the FTS index / stats counters (backfilled when their triggers are new)
+    upgrade(engine)
+    engine.dispose()
+    log(f"Seeded {inserted:,} articles into {url} in {time.perf_counter() - started:.1f}s")
+    return inserted
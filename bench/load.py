@@ -0,0 +1,179 @@
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+from bench.common import REPO_DIR, latency_summary, process_memory_mib
+from bench.corpus import (BENCH_ADMIN_EMAIL, BENCH_ADMIN_PASSWORD, BENCH_USER_EMAIL, BENCH_USER_PASSWORD,
+                          CATEGORIES)
+from bench.micro import QUERIES
+from bench.stub_server import start_stub_server
+
+# ========================================
+# LOAD SCENARIOS
+# ========================================
+# Each scenario drives one endpoint from `concurrency` client threads for
+# `duration` seconds (after a short warmup) against the app running in a
+# child process, and reports throughput, latency percentiles, errors and
+# the server's resident memory.
+SERVER_START_TIMEOUT = 60
+
+# Live queries are spread over more keys than the provider cache keeps fresh
+# for the whole run, so a share of requests really goes upstream
+LIVE_QUERIES = QUERIES + [f'{q} {suffix}' for q in QUERIES for suffix in ('today', 'latest', 'analysis')]
+
+
+def _articles_db(rng, ctx):
+    category = rng.choice(CATEGORIES + [None, None])
+    return 'GET', '/api/articles', {'limit': 20, **({'category': category} if category else {})}, None
+
+
+def _articles_search(rng, ctx):
+    return 'GET', '/api/articles', {'search': rng.choice(QUERIES), 'limit': 20}, None
+
+
+def _articles_live(rng, ctx):
+    return 'GET', '/api/articles', {'fetch_live': 'true', 'search': rng.choice(LIVE_QUERIES)}, None
+
+
+def _interactions(rng, ctx):
+    body = {'article_id': rng.randint(1, ctx['max_article_id']),
+            'type': rng.choice(['like', 'bookmark', 'share', 'read'])}
+    return 'POST', '/api/interactions', None, body
+
+
+def _admin_stats(rng, ctx):
+    return 'GET', '/api/admin/stats', None, None
+
+
+# name -> (request factory, needs admin token)
+SCENARIOS = {
+    'articles.db': (_articles_db, False),
+    'articles.search': (_articles_search, False),
+    'articles.live': (_articles_live, False),
+    'interactions': (_interactions, False),
+    'admin.stats': (_admin_stats, True),
+}
+
+
+class AppServer:
+    """The app under test in a child process (see bench.serve)"""
+
+    def __init__(self, db_url, stub_url, port):
+        self.url = f'http://127.0.0.1:{port}'
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'bench.serve', '--db', db_url, '--stub', stub_url, '--port', str(port)],
+            cwd=REPO_DIR, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        )
+        self._output = []
+        threading.Thread(target=self._drain, daemon=True).start()
+        self._wait_ready()
+
+    def _drain(self):
+        for line in self.process.stdout:
+            self._output.append(line)
+
+    def _wait_ready(self):
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError('bench server exited:\n' + ''.join(self._output[-30:]))
+            try:
+                requests.get(self.url + '/metrics', timeout=1)
+                return
+            except requests.RequestException:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError('bench server did not start in time:\n' + ''.join(self._output[-30:]))
+
+    def memory_mib(self):
+        return process_memory_mib(self.process.pid)
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def login(base_url, email, password):
+    response = requests.post(base_url + '/api/login', json={'email': email, 'password': password}, timeout=10)
+    response.raise_for_status()
+    return response.json()['token']
+
+
+def run_scenario(base_url, factory, token, ctx, concurrency, duration, warmup, seed=1):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    started = time.monotonic()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        session = requests.Session()
+        session.headers['Authorization'] = f'Bearer {token}'
+        own = []
+        own_errors = 0
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                break
+            method, path, params, body = factory(rng, ctx)
+            t0 = time.perf_counter()
+            try:
+                response = session.request(method, base_url + path, params=params, json=body, timeout=30)
+                ok = response.status_code < 400
+                response.content
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - t0
+            if now >= measure_from:
+                own.append(elapsed)
+                own_errors += not ok
+        with lock:
+            latencies.extend(own)
+            errors[0] += own_errors
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    result = {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'throughput_rps': round(len(latencies) / duration, 1),
+    }
+    result.update(latency_summary(latencies))
+    return result
+
+
+def run(db_url, rows, selected=None, concurrency=8, duration=10.0, warmup=2.0,
+        stub_latency_ms=100, stub_jitter_ms=20, port=5055, log=print):
+    stub = start_stub_server(latency_ms=stub_latency_ms, jitter_ms=stub_jitter_ms)
+    server = AppServer(db_url, stub.url, port)
+    try:
+        tokens = {
+            False: login(server.url, BENCH_USER_EMAIL, BENCH_USER_PASSWORD),
+            True: login(server.url, BENCH_ADMIN_EMAIL, BENCH_ADMIN_PASSWORD),
+        }
+        ctx = {'max_article_id': max(rows, 1)}
+        results = {}
+        for name, (factory, admin) in SCENARIOS.items():
+            if selected and not any(pattern in name for pattern in selected):
+                continue
+            log(f"  {name}: {concurrency} clients x {duration:g}s")
+            result = run_scenario(server.url, factory, tokens[admin], ctx, concurrency, duration, warmup)
+            result['rss_mib'], result['peak_rss_mib'] = server.memory_mib()
+            results[name] = result
+        return results
+    finally:
+        server.stop()
+        stub.shutdown()
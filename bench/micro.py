@@ -0,0 +1,153 @@
+from functools import partial
+import gc
+import importlib.util
+from itertools import cycle
+import os
+import random
+import time
+import tracemalloc
+
+from bench.common import percentile
+from bench.corpus import generate_articles
+
+# ========================================
+# MICRO-BENCHMARKS
+# ========================================
+# Each benchmark is a zero-argument callable timed over many iterations.
+# Per-call p50/p99 come from individually timed calls; ops/sec from the
+# total wall time. Memory is the tracemalloc peak of a separate pass, so
+# tracing never skews the timings.
+#
+# --app points the same workloads at another checkout's app.py (e.g. the tree
+# before the NLP rewrites), for before/after numbers; benchmarks of code that
+# tree does not have are left out.
+QUERIES = ['ai', 'tech', 'climate change', 'artificial intelligence startups', 'phone battery',
+           'stock market crash', 'health care reform', 'space exploration nasa', 'electric cars',
+           'football transfer news', 'election results', 'covid vaccine', 'crypto bitcoin price']
+
+
+def _time(fn, iterations):
+    timings = []
+    clock = time.perf_counter
+    gc.disable()
+    try:
+        started = clock()
+        for _ in range(iterations):
+            t0 = clock()
+            fn()
+            timings.append(clock() - t0)
+        elapsed = clock() - started
+    finally:
+        gc.enable()
+    return timings, elapsed
+
+
+def _peak_kib(fn, iterations):
+    tracemalloc.start()
+    try:
+        for _ in range(iterations):
+            fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(fn, iterations, warmup=None, memory_iterations=None):
+    for _ in range(warmup if warmup is not None else max(iterations // 10, 1)):
+        fn()
+    timings, elapsed = _time(fn, iterations)
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'ops_per_sec': round(iterations / elapsed, 1) if elapsed else 0.0,
+        'p50_us': round(percentile(timings, 50) * 1e6, 2),
+        'p99_us': round(percentile(timings, 99) * 1e6, 2),
+        'peak_kib': _peak_kib(fn, memory_iterations or min(iterations, 200)),
+    }
+
+
+def _load_app(path):
+    """An older single-file app.py, imported under its own name so it cannot shadow this tree's modules"""
+    spec = importlib.util.spec_from_file_location('bench_app_under_test', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # Old revisions print from the hot path; keep the cost, not the output
+    module.print = partial(print, file=open(os.devnull, 'w'))
+    return module
+
+
+def _legacy_benchmarks(app_path):
+    """(calculate_relevance_score, expand_search_query, expand_search_terms, score_articles) of an older app.py"""
+    legacy = _load_app(app_path)
+    expand = legacy.expand_search_query
+
+    def expand_search_terms(query):
+        # What the old request path did with the expanded query string
+        return expand(query).split()
+
+    def score_articles(articles, search_terms):
+        return [legacy.calculate_relevance_score(article, search_terms) for article in articles]
+
+    return legacy.calculate_relevance_score, expand, expand_search_terms, score_articles
+
+
+def benchmarks(scale=1.0, app_path=None):
+    """{name: (callable, iterations)}; imports the app lazily so the environment is set first"""
+    if app_path:
+        calculate_relevance_score, expand_search_query, expand_search_terms, score_articles = \
+            _legacy_benchmarks(app_path)
+        _expand_normalized = dedupe_articles = None
+    else:
+        from app import calculate_relevance_score
+        from nlp import _expand_normalized, expand_search_query, expand_search_terms, score_articles
+        from dedup import dedupe_articles
+
+    rng = random.Random(7)
+    articles = list(generate_articles(100, seed=7, content_words=120))
+    live_articles = [dict(a, published_at=a['published_at'].isoformat()) for a in articles]
+    query_cycle = cycle([rng.choice(QUERIES) for _ in range(1000)])
+    terms = {q: expand_search_terms(q) for q in QUERIES}
+
+    def expand_cold():
+        _expand_normalized.cache_clear()
+        expand_search_query(next(query_cycle))
+
+    def expand_warm():
+        expand_search_query(next(query_cycle))
+
+    article_cycle = cycle(articles)
+
+    def relevance_single():
+        calculate_relevance_score(next(article_cycle), terms['artificial intelligence startups'])
+
+    def relevance_batch_100():
+        score_articles(articles, terms['climate change'])
+
+    def dedupe_batch_100():
+        dedupe_articles(live_articles)
+
+    def n(count):
+        return max(int(count * scale), 10)
+
+    suite = {
+        'expand_search_query.cold': (expand_cold, n(20000)),
+        'expand_search_query.warm': (expand_warm, n(200000)),
+        'calculate_relevance_score': (relevance_single, n(50000)),
+        'score_articles.batch100': (relevance_batch_100, n(5000)),
+        'dedupe_articles.batch100': (dedupe_batch_100, n(1000)),
+    }
+    if app_path:
+        # No memoized expansion (cold == warm) and no dedup in trees that old
+        suite['expand_search_query.cold'] = (expand_warm, n(20000))
+        del suite['dedupe_articles.batch100']
+    return suite
+
+
+def run(selected=None, scale=1.0, app_path=None, log=print):
+    results = {}
+    for name, (fn, iterations) in benchmarks(scale, app_path).items():
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        log(f"  {name} x{iterations:,}")
+        results[name] = run_benchmark(fn, iterations)
+    return results
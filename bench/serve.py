@@ -0,0 +1,54 @@
+import argparse
+import os
+import sys
+
+# ========================================
+# APP SERVER FOR LOAD RUNS
+# ========================================
+# Run by bench.load in a child process so the server's CPU and memory are
+# measured separately from the load generator:
+#     python -m bench.serve --db sqlite:///... --stub http://127.0.0.1:PORT --port 5055
+# Uses werkzeug's threaded server, the same one `python app.py` runs.
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the app against a benchmark database')
+    parser.add_argument('--db', required=True, help='DATABASE_URL to serve')
+    parser.add_argument('--stub', required=True, help='base URL of the stub provider server')
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args(argv)
+
+    # Must be in place before the app (and the modules it imports) read their settings
+    os.environ.update({
+        'DATABASE_URL': args.db,
+        'NEWSAPI_BASE_URL': args.stub,
+        'GUARDIAN_BASE_URL': args.stub,
+        'NEWS_API_KEY': os.environ.get('NEWS_API_KEY') or 'bench-key',
+        'GUARDIAN_API_KEY': os.environ.get('GUARDIAN_API_KEY') or 'bench-key',
+        'INGEST_ENABLED': 'false',
+    })
+    os.environ.setdefault('LOG_SAMPLE_RATE', '0')
+    # The stub has no quota; real API limits would turn the live scenario into a rate-limit test
+    os.environ.setdefault('NEWSAPI_RATE_LIMIT', 'none')
+    os.environ.setdefault('GUARDIAN_RATE_LIMIT', 'none')
+
+    from werkzeug.serving import make_server
+    from app import create_app, db
+    from migrations import upgrade
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        upgrade(db.engine)
+
+    server = make_server('127.0.0.1', args.port, app, threaded=True)
+    print(f'bench server ready on {args.port}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import socketserver
+import threading
+import time
+
+# ========================================
+# STUB REDIS-PROTOCOL CACHE SERVER
+# ========================================
+# Enough of the Redis protocol (RESP2) for cache_backend.RedisBackend: PING,
+# AUTH, SELECT, GET, MGET, SET [EX|PX], DEL, INCR, FLUSHDB, DBSIZE. Lets the
+# shared-cache path run without a Redis install:
+#     python -m bench stub-cache --port 6399
+#     CACHE_URL=redis://127.0.0.1:6399/0 gunicorn -w 4 'app:create_app()'
+
+
+class _Store:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> (value, expires_at or None)
+        self.data = {}
+
+    def get(self, key, now):
+        item = self.data.get(key)
+        if item is not None and item[1] is not None and now >= item[1]:
+            del self.data[key]
+            return None
+        return None if item is None else item[0]
+
+
+def _bulk(value):
+    return b'$-1\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value)
+
+
+def _error(message):
+    return b'-ERR ' + message.encode() + b'\r\n'
+
+
+class StubCacheHandler(socketserver.StreamRequestHandler):
+    def _command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            # Inline command (e.g. typed into telnet)
+            return line.split()
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            try:
+                args = self._command()
+            except (ConnectionError, ValueError):
+                return
+            if not args:
+                return
+            self.server.commands += 1
+            self.wfile.write(self._execute(store, args[0].upper(), args[1:]))
+
+    def _execute(self, store, name, args):
+        now = time.monotonic()
+        with store.lock:
+            if name == b'PING':
+                return b'+PONG\r\n'
+            if name in (b'AUTH', b'SELECT'):
+                return b'+OK\r\n'
+            if name == b'GET':
+                return _bulk(store.get(args[0], now))
+            if name == b'MGET':
+                return b'*%d\r\n' % len(args) + b''.join(_bulk(store.get(key, now)) for key in args)
+            if name == b'SET':
+                expires_at = None
+                if len(args) >= 4 and args[2].upper() in (b'EX', b'PX'):
+                    scale = 1.0 if args[2].upper() == b'EX' else 0.001
+                    expires_at = now + int(args[3]) * scale
+                store.data[args[0]] = (args[1], expires_at)
+                return b'+OK\r\n'
+            if name == b'DEL':
+                return b':%d\r\n' % sum(store.data.pop(key, None) is not None for key in args)
+            if name == b'INCR':
+                try:
+                    value = int(store.get(args[0], now) or 0) + 1
+                except ValueError:
+                    return _error('value is not an integer or out of range')
+                store.data[args[0]] = (str(value).encode(), None)
+                return b':%d\r\n' % value
+            if name == b'FLUSHDB':
+                store.data.clear()
+                return b'+OK\r\n'
+            if name == b'DBSIZE':
+                return b':%d\r\n' % len(store.data)
+        return _error(f"unknown command '{name.decode(errors='replace')}'")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def start_stub_cache(port=0):
+    """Serve in a daemon thread; returns the server (its CACHE_URL is `server.url`)"""
+    server = _Server(('127.0.0.1', port), StubCacheHandler)
+    server.store = _Store()
+    server.commands = 0
+    server.url = f'redis://127.0.0.1:{server.server_address[1]}/0'
+    threading.Thread(target=server.serve_forever, name='stub-cache', daemon=True).start()
+    return server
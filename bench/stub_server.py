@@ -0,0 +1,128 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+import gzip
+import zlib
+
+# ========================================
+# STUB NEWSAPI / GUARDIAN SERVER
+# ========================================
+# Answers /v2/everything (NewsAPI), /search (Guardian) and /feed.xml (RSS) with deterministic
+# articles for the requested query after `latency_ms` (+/- `jitter_ms`).
+# `error_rate` of requests get an `error_status` (500 by default) so retry
+# and failure paths can be exercised. Bodies are gzipped for clients that
+# accept it when `gzip` is set. `requests` and `connections` count what was
+# received. Point the app at it with NEWSAPI_BASE_URL / GUARDIAN_BASE_URL.
+
+
+def _articles(query, count, provider):
+    rng = random.Random(f'{provider}:{query}')
+    for i in range(count):
+        words = ' '.join(rng.choice(['update', 'report', 'analysis', 'news', 'latest', 'study']) for _ in range(4))
+        key = zlib.crc32(f'{query}:{i}'.encode())
+        yield key, f'{query.title()} {words} #{i}', f'{query} {words} coverage from the {provider} stub'
+
+
+def newsapi_payload(query, count):
+    return {
+        'status': 'ok',
+        'totalResults': count,
+        'articles': [{
+            'source': {'id': None, 'name': 'Stub Wire'},
+            'author': 'Stub Author',
+            'title': title,
+            'description': description,
+            'url': f'https://stub.example/newsapi/{key}',
+            'urlToImage': None,
+            'publishedAt': '2025-01-01T00:00:00Z',
+            'content': description * 4,
+        } for key, title, description in _articles(query, count, 'newsapi')],
+    }
+
+
+def guardian_payload(query, count):
+    return {'response': {
+        'status': 'ok',
+        'results': [{
+            'webTitle': title,
+            'webUrl': f'https://stub.example/guardian/{key}',
+            'sectionName': 'World news',
+            'webPublicationDate': '2025-01-01T00:00:00Z',
+            'fields': {'trailText': description, 'bodyText': description * 4, 'thumbnail': None},
+        } for key, title, description in _articles(query, count, 'guardian')],
+    }}
+
+
+def rss_payload(count):
+    items = ''.join(
+        f'<item><title>{escape(title)}</title><link>https://stub.example/rss/{key}</link>'
+        f'<description>{escape(description)}</description>'
+        f'<pubDate>Wed, 01 Jan 2025 00:00:00 GMT</pubDate></item>'
+        for key, title, description in _articles('technology ai', count, 'rss')
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Stub feed</title>{items}</channel></rss>'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.counter_lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        server = self.server
+        with server.counter_lock:
+            server.requests += 1
+        delay = max(server.latency_ms + random.uniform(-server.jitter_ms, server.jitter_ms), 0) / 1000.0
+        if delay:
+            time.sleep(delay)
+
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        query = params.get('q', 'news')
+        if random.random() < server.error_rate:
+            return self._send(server.error_status, {'status': 'error', 'message': 'stub failure'})
+        if parsed.path == '/v2/everything':
+            return self._send(200, newsapi_payload(query, int(params.get('pageSize', 50))))
+        if parsed.path == '/search':
+            return self._send(200, guardian_payload(query, int(params.get('page-size', 20))))
+        if parsed.path == '/feed.xml':
+            return self._send(200, rss_payload(30), 'application/rss+xml')
+        return self._send(404, {'message': 'not found'})
+
+    def _send(self, status, payload, content_type='application/json'):
+        body = payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if self.server.gzip and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port=0, latency_ms=100, jitter_ms=0, error_rate=0.0, error_status=500, gzip=False):
+    """Serve in a daemon thread; returns the server (its base URL is `server.url`)"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    server.daemon_threads = True
+    server.latency_ms = latency_ms
+    server.jitter_ms = jitter_ms
+    server.error_rate = error_rate
+    server.error_status = error_status
+    server.gzip = gzip
+    server.requests = 0
+    server.connections = 0
+    server.counter_lock = threading.Lock()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    threading.Thread(target=server.serve_forever, name='stub-server', daemon=True).start()
+    return server
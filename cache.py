@@ -0,0 +1,287 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import logging
+import struct
+import threading
+import time
+
+import cache_backend
+from cache_backend import CacheBackendError
+from telemetry import log_event
+
+# ========================================
+# TTL + LRU CACHE (IN-PROCESS OR SHARED)
+# ========================================
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cache-refresh')
+# Shared entries are stored as (expires_at, stale_until) wall-clock times followed by the encoded value
+_ENVELOPE = struct.Struct('>dd')
+
+
+def estimate_size(value):
+    """Rough byte size of a JSON-able value, used for the cache byte budget"""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 1
+
+
+class _Entry:
+    __slots__ = ('value', 'size', 'expires_at', 'stale_until')
+
+    def __init__(self, value, size, expires_at, stale_until):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
+class _Flight:
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and a total byte budget.
+
+    Entries are fresh for `ttl` seconds and may then be served stale for another
+    `stale_ttl` seconds while a single background refresh runs. Concurrent misses
+    for the same key share one loader call (single-flight).
+
+    A cache given a `namespace` and a `codec` (encode(value) -> bytes,
+    decode(bytes) -> value) stores its entries in the shared backend when one
+    is configured (see cache_backend), so every worker sees the same entries
+    and deletes. Backend errors count as misses. Single-flight stays per process.
+    """
+
+    def __init__(self, ttl=60, stale_ttl=0, max_entries=1024, max_bytes=None, sizeof=estimate_size,
+                 namespace=None, codec=None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.namespace = namespace
+        self.codec = codec
+
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._flights = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.backend_errors = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    # ---------- shared backend ----------
+
+    def _remote(self):
+        if self.codec is None or self.namespace is None:
+            return None
+        return cache_backend.shared()
+
+    def _remote_key(self, key):
+        return f'{self.namespace}:' + hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+
+    def _backend_error(self, error):
+        with self._lock:
+            self.backend_errors += 1
+        log_event('cache_backend_error', logging.WARNING, namespace=self.namespace, error=str(error))
+
+    def _remote_lookup(self, backend, key):
+        """(entry, is_fresh) from the shared backend, like _lookup()"""
+        try:
+            raw = backend.get(self._remote_key(key))
+        except CacheBackendError as e:
+            self._backend_error(e)
+            return None, False
+        if raw is None:
+            return None, False
+        expires_at, stale_until = _ENVELOPE.unpack_from(raw)
+        now = time.time()
+        if now >= stale_until:
+            return None, False
+        try:
+            value = self.codec[1](raw[_ENVELOPE.size:])
+        except Exception as e:
+            self._backend_error(e)
+            return None, False
+        return _Entry(value, len(raw), expires_at, stale_until), now < expires_at
+
+    def _remote_set(self, backend, key, value, ttl):
+        ttl = self.ttl if ttl is None else ttl
+        payload = self.codec[0](value)
+        if self.max_bytes and len(payload) > self.max_bytes:
+            return
+        now = time.time()
+        header = _ENVELOPE.pack(now + ttl, now + ttl + self.stale_ttl)
+        try:
+            backend.set(self._remote_key(key), header + payload, ttl=ttl + self.stale_ttl)
+        except CacheBackendError as e:
+            self._backend_error(e)
+
+    def _find(self, key):
+        backend = self._remote()
+        if backend is not None:
+            return self._remote_lookup(backend, key)
+        with self._lock:
+            return self._lookup(key, time.monotonic())
+
+    # ---------- in-process storage ----------
+
+    def _lookup(self, key, now):
+        """Return (entry, is_fresh) or (None, False); caller holds the lock"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None, False
+        if now < entry.expires_at:
+            self._data.move_to_end(key)
+            return entry, True
+        if now < entry.stale_until:
+            self._data.move_to_end(key)
+            return entry, False
+        self._remove(key)
+        return None, False
+
+    def _remove(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def get(self, key, default=None):
+        """Return a fresh value or `default`; never returns stale entries"""
+        entry, fresh = self._find(key)
+        with self._lock:
+            if entry is not None and fresh:
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        backend = self._remote()
+        if backend is not None:
+            self._remote_set(backend, key, value, ttl)
+            return
+        size = self.sizeof(value) if self.sizeof else 1
+        if self.max_bytes and size > self.max_bytes:
+            return
+        now = time.monotonic()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        entry = _Entry(value, size, expires_at, expires_at + self.stale_ttl)
+        with self._lock:
+            self._remove(key)
+            self._data[key] = entry
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_entries or
+                                  (self.max_bytes and self._bytes > self.max_bytes)):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key):
+        backend = self._remote()
+        if backend is not None:
+            try:
+                backend.delete(self._remote_key(key))
+            except CacheBackendError as e:
+                self._backend_error(e)
+            return
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        """Drop the in-process entries (shared entries expire on their own)"""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _load(self, key, loader, should_cache):
+        """Run `loader` once per key across threads and store its result"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            if should_cache is None or should_cache(flight.value):
+                self.set(key, flight.value)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def _refresh(self, key, loader, should_cache):
+        with self._lock:
+            if key in self._flights:
+                return
+            self.refreshes += 1
+        _refresh_executor.submit(self._load_quietly, key, loader, should_cache)
+
+    def _load_quietly(self, key, loader, should_cache):
+        try:
+            self._load(key, loader, should_cache)
+        except Exception as e:
+            log_event('cache_refresh_failed', logging.WARNING, key=repr(key), error=str(e))
+
+    def get_or_load(self, key, loader, should_cache=None):
+        """
+        Return the cached value for `key`, calling `loader()` on a miss.
+        Stale entries are returned immediately and refreshed in the background.
+        Results rejected by `should_cache` are handed back but not stored.
+        """
+        entry, fresh = self._find(key)
+        with self._lock:
+            if entry is not None:
+                if fresh:
+                    self.hits += 1
+                else:
+                    self.stale_hits += 1
+            else:
+                self.misses += 1
+
+        if entry is not None:
+            if not fresh:
+                self._refresh(key, loader, should_cache)
+            return entry.value
+        return self._load(key, loader, should_cache)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'refreshes': self.refreshes,
+                'backend': 'shared' if self._remote() is not None else 'local',
+                'backend_errors': self.backend_errors,
+                'hit_rate': round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            }
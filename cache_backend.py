@@ -0,0 +1,248 @@
+import os
+import queue
+import socket
+import threading
+import time
+from urllib.parse import unquote, urlsplit
+
+# ========================================
+# CACHE BACKENDS
+# ========================================
+# Where the shared caches (provider responses, authenticated principals,
+# article listings) and the article version counter live:
+#   CACHE_URL unset or 'local'     this process only; every worker keeps its own
+#   CACHE_URL=redis://[:password@]host:6379/0
+#                                  any server speaking the Redis protocol, shared
+#                                  by every worker and every host pointing at it
+# With the local backend the caches keep their in-process LRU (cache.TTLCache);
+# LocalBackend itself only holds counters such as the article version.
+# Keys are prefixed with CACHE_PREFIX so deployments can share one server.
+CACHE_URL = os.getenv('CACHE_URL', '')
+CACHE_PREFIX = os.getenv('CACHE_PREFIX', 'newsai:')
+CACHE_TIMEOUT = float(os.getenv('CACHE_TIMEOUT', '0.5'))
+CACHE_POOL_SIZE = int(os.getenv('CACHE_POOL_SIZE', '16'))
+
+
+class CacheBackendError(Exception):
+    """The cache server could not be reached or answered with an error"""
+
+
+class LocalBackend:
+    """Thread-safe in-process key/value store with optional expiry"""
+    name = 'local'
+    shared = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> (value, expires_at or None)
+        self._data = {}
+
+    def _get(self, key, now):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and now >= expires_at:
+            del self._data[key]
+            return None
+        return value
+
+    def get(self, key):
+        with self._lock:
+            return self._get(key, time.monotonic())
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            return [self._get(key, now) for key in keys]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (_bytes(value), time.monotonic() + ttl if ttl else None)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._get(key, time.monotonic()) or 0) + 1
+            self._data[key] = (str(value).encode(), None)
+            return value
+
+    def ping(self):
+        return True
+
+
+class _ServerError:
+    __slots__ = ('message',)
+
+    def __init__(self, message):
+        self.message = message
+
+
+def _bytes(value):
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+def _encode_command(args):
+    parts = [b'*%d\r\n' % len(args)]
+    for arg in args:
+        arg = _bytes(arg)
+        parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+    return b''.join(parts)
+
+
+class _Connection:
+    """One socket speaking RESP2, the Redis wire protocol"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.reader = sock.makefile('rb')
+
+    def call(self, *args):
+        self.sock.sendall(_encode_command(args))
+        return self._read()
+
+    def _read(self):
+        line = self.reader.readline()
+        if not line.endswith(b'\r\n'):
+            raise ConnectionError('connection closed by cache server')
+        kind, rest = line[:1], line[1:-2]
+        if kind == b'+':
+            return rest.decode()
+        if kind == b'-':
+            return _ServerError(rest.decode())
+        if kind == b':':
+            return int(rest)
+        if kind == b'$':
+            size = int(rest)
+            if size < 0:
+                return None
+            data = self.reader.read(size + 2)
+            if len(data) != size + 2:
+                raise ConnectionError('connection closed by cache server')
+            return data[:-2]
+        if kind == b'*':
+            size = int(rest)
+            return None if size < 0 else [self._read() for _ in range(size)]
+        raise ConnectionError(f'unexpected reply from cache server: {line[:40]!r}')
+
+    def close(self):
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RedisBackend:
+    """
+    Minimal client for a Redis-protocol server: GET/MGET/SET/DEL/INCR over a
+    small pool of keep-alive sockets. Network and server errors are raised
+    as CacheBackendError so callers can fall back to the database.
+    """
+    name = 'redis'
+    shared = True
+
+    def __init__(self, url, prefix=None, timeout=None, pool_size=None):
+        parts = urlsplit(url)
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port or 6379
+        self.username = unquote(parts.username) if parts.username else None
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.strip('/') or 0)
+        self.prefix = CACHE_PREFIX if prefix is None else prefix
+        self.timeout = timeout or CACHE_TIMEOUT
+        self._idle = queue.LifoQueue(maxsize=pool_size or CACHE_POOL_SIZE)
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection = _Connection(sock)
+        try:
+            if self.password:
+                credentials = (self.username, self.password) if self.username else (self.password,)
+                self._check(connection.call('AUTH', *credentials))
+            if self.db:
+                self._check(connection.call('SELECT', self.db))
+        except Exception:
+            connection.close()
+            raise
+        return connection
+
+    def _check(self, reply):
+        if isinstance(reply, _ServerError):
+            raise CacheBackendError(f'{self.name}: {reply.message}')
+        return reply
+
+    def execute(self, *args):
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = None
+        try:
+            if connection is None:
+                connection = self._connect()
+            reply = connection.call(*args)
+        except (OSError, ValueError) as e:
+            if connection is not None:
+                connection.close()
+            raise CacheBackendError(f'{self.name} {args[0]}: {e}') from e
+        # A server error reply leaves the connection usable
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+        return self._check(reply)
+
+    def get(self, key):
+        return self.execute('GET', self.prefix + key)
+
+    def get_many(self, keys):
+        return self.execute('MGET', *[self.prefix + key for key in keys])
+
+    def set(self, key, value, ttl=None):
+        if ttl:
+            self.execute('SET', self.prefix + key, value, 'PX', max(int(ttl * 1000), 1))
+        else:
+            self.execute('SET', self.prefix + key, value)
+
+    def delete(self, key):
+        self.execute('DEL', self.prefix + key)
+
+    def incr(self, key):
+        return self.execute('INCR', self.prefix + key)
+
+    def ping(self):
+        return self.execute('PING') == 'PONG'
+
+
+def backend_from_url(url):
+    if not url or url == 'local':
+        return LocalBackend()
+    scheme = urlsplit(url).scheme
+    if scheme == 'redis':
+        return RedisBackend(url)
+    raise ValueError(f'Unsupported CACHE_URL {url!r} (expected local or redis://host:port/db)')
+
+
+_backend = LocalBackend()
+
+
+def configure(url=None):
+    """Select the process-wide backend (CACHE_URL by default); called by create_app()"""
+    global _backend
+    _backend = backend_from_url(CACHE_URL if url is None else url)
+    return _backend
+
+
+def current():
+    return _backend
+
+
+def shared():
+    """The configured backend if it is shared between processes, else None"""
+    return _backend if _backend.shared else None
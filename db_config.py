@@ -0,0 +1,136 @@
+import os
+
+from flask import current_app
+from flask.globals import app_ctx
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+# ========================================
+# DATABASE ENGINE CONFIGURATION
+# ========================================
+# Everything here is read from the environment (and therefore .env) when the
+# app is configured:
+#   DATABASE_URL            primary read/write database (default sqlite:///newsai.db)
+#   DATABASE_READ_URL       optional read-only replica / second connection path
+#   SQLITE_JOURNAL_MODE     WAL lets readers proceed while a writer commits
+#   SQLITE_SYNCHRONOUS      NORMAL is durable across app crashes in WAL mode
+#   SQLITE_CACHE_SIZE       page cache per connection (negative = KiB)
+#   SQLITE_MMAP_SIZE        bytes of the database file to memory-map
+#   SQLITE_BUSY_TIMEOUT     ms to wait on a locked database before failing
+#   DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE
+
+
+def _env(name, default):
+    return os.getenv(name, default)
+
+
+def sqlite_pragmas(read_only=False):
+    pragmas = [
+        ('busy_timeout', int(_env('SQLITE_BUSY_TIMEOUT', '5000'))),
+        ('synchronous', _env('SQLITE_SYNCHRONOUS', 'NORMAL')),
+        ('cache_size', int(_env('SQLITE_CACHE_SIZE', '-64000'))),
+        ('mmap_size', int(_env('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))),
+        ('temp_store', 'MEMORY'),
+    ]
+    if read_only:
+        pragmas.append(('query_only', 'ON'))
+    else:
+        # journal_mode is persistent and needs write access, so only the primary sets it
+        pragmas.insert(0, ('journal_mode', _env('SQLITE_JOURNAL_MODE', 'WAL')))
+    return pragmas
+
+
+def _is_memory_sqlite(url):
+    return url.startswith('sqlite') and (url.rstrip('/') in ('sqlite:', 'sqlite:/', 'sqlite://') or ':memory:' in url)
+
+
+def engine_options(url):
+    """SQLAlchemy create_engine kwargs tuned for a multi-threaded server"""
+    options = {'pool_pre_ping': True}
+    if url.startswith('sqlite'):
+        options['connect_args'] = {
+            'check_same_thread': False,
+            'timeout': int(_env('SQLITE_BUSY_TIMEOUT', '5000')) / 1000.0,
+        }
+    if not _is_memory_sqlite(url):
+        options.update({
+            'pool_size': int(_env('DB_POOL_SIZE', '10')),
+            'max_overflow': int(_env('DB_MAX_OVERFLOW', '20')),
+            'pool_timeout': int(_env('DB_POOL_TIMEOUT', '30')),
+            'pool_recycle': int(_env('DB_POOL_RECYCLE', '1800')),
+        })
+    return options
+
+
+def configure_database(app):
+    """Fill the Flask-SQLAlchemy config from the environment; call before SQLAlchemy(app)"""
+    url = _env('DATABASE_URL', 'sqlite:///newsai.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(url)
+
+    read_url = _env('DATABASE_READ_URL', '')
+    if read_url:
+        app.config['SQLALCHEMY_BINDS'] = {'read': {'url': read_url, **engine_options(read_url)}}
+
+
+def _install_pragmas(engine, read_only):
+    pragmas = sqlite_pragmas(read_only)
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+
+    event.listen(engine, 'connect', on_connect)
+
+
+def _app_ctx_id():
+    return id(app_ctx._get_current_object())
+
+
+class ReadSessions:
+    """
+    Sessions for read-only queries. Uses the current app's `read` bind when
+    DATABASE_READ_URL is set and its primary session otherwise, so callers
+    never need to care. One instance serves any number of apps.
+    """
+
+    def __init__(self, db, app=None):
+        self.db = db
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        with app.app_context():
+            engine = self.db.engines.get('read')
+        scoped = None
+        if engine is not None:
+            scoped = scoped_session(sessionmaker(bind=engine), scopefunc=_app_ctx_id)
+
+            @app.teardown_appcontext
+            def remove_read_session(exc):
+                scoped.remove()
+        app.extensions['read_sessions'] = scoped
+
+    @property
+    def session(self):
+        scoped = current_app.extensions.get('read_sessions')
+        return scoped if scoped is not None else self.db.session
+
+    def query(self, *entities):
+        return self.session.query(*entities)
+
+
+def init_engines(app, db, reads=None):
+    """Install SQLite pragmas on every engine and return the read-session helper (`reads`, if given)"""
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            if engine.dialect.name == 'sqlite':
+                _install_pragmas(engine, read_only=(bind == 'read'))
+    if reads is None:
+        return ReadSessions(db, app)
+    reads.init_app(app)
+    return reads
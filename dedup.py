@@ -0,0 +1,164 @@
+from collections import Counter, deque
+from functools import lru_cache
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# ========================================
+# CROSS-PROVIDER DEDUPLICATION
+# ========================================
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid', 'yclid',
+    'ref', 'ref_src', 'referrer', 'cmpid', 'cmp', 'ito', 'smid', 'smtyp', 's_cid',
+    'share', 'src', 'amp', 'outputtype', 'guccounter', 'guce_referrer', 'guce_referrer_sig',
+}
+HOST_PREFIXES = ('www.', 'amp.', 'm.', 'mobile.')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+SIMHASH_THRESHOLD = 3  # max differing bits; must stay below SIMHASH_BANDS for the band index to be exact
+
+
+def canonicalize_url(url):
+    """
+    Canonical form of an article URL for duplicate detection: lowercase host
+    without www/amp/mobile prefixes, no tracking parameters, no AMP path
+    variants, no fragment, no trailing slash, sorted query.
+    """
+    if not url:
+        return ''
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+
+    # Google AMP cache: https://www.google.com/amp/s/example.com/story.amp.html
+    if parts.path.startswith('/amp/s/'):
+        inner = parts.path[len('/amp/s/'):]
+        return canonicalize_url(f"https://{inner}?{parts.query}" if parts.query else f"https://{inner}")
+
+    host = (parts.hostname or '').lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if port and port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f'{host}:{port}'
+
+    path = parts.path or '/'
+    path = re.sub(r'(/amp/?|\.amp(?:\.html)?)$', '', path) or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    # http and https variants of the same story are the same article
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+# SimHash weights are summed for all 64 bits at once: each bit of a feature
+# hash is spread into its own LANE_BITS-wide lane of one big integer, so a
+# feature costs one addition instead of 64.
+LANE_BITS = 24
+_LANE_MASK = (1 << LANE_BITS) - 1
+_SPREAD_BYTE = [sum(((byte >> j) & 1) << (j * LANE_BITS) for j in range(8)) for byte in range(256)]
+
+
+@lru_cache(maxsize=65536)
+def _feature_lanes(feature):
+    h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+    lanes = 0
+    for k in range(SIMHASH_BITS // 8):
+        lanes |= _SPREAD_BYTE[(h >> (8 * k)) & 0xFF] << (8 * k * LANE_BITS)
+    return lanes
+
+
+def simhash(text):
+    """64-bit SimHash over word bigrams (unigrams for very short texts)"""
+    words = re.findall(r'\w+', (text or '').lower())
+    if len(words) > 1:
+        features = Counter(f'{a} {b}' for a, b in zip(words, words[1:]))
+    else:
+        features = Counter(words)
+    if not features:
+        return 0
+
+    set_counts = 0
+    total = 0
+    for feature, count in features.items():
+        set_counts += _feature_lanes(feature) * count
+        total += count
+
+    # A bit is set when more of the (weighted) features have it set than not
+    fingerprint = 0
+    for bit in range(SIMHASH_BITS):
+        if 2 * ((set_counts >> (bit * LANE_BITS)) & _LANE_MASK) > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class Deduplicator:
+    """
+    Remembers canonical URLs and SimHash fingerprints of articles seen so far.
+
+    Fingerprints are split into SIMHASH_BANDS bands. Two fingerprints within
+    SIMHASH_THRESHOLD bits of each other must agree exactly on at least one
+    band, so every check only compares against one bucket per band.
+    """
+
+    def __init__(self, threshold=SIMHASH_THRESHOLD, max_entries=None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.band_bits = SIMHASH_BITS // SIMHASH_BANDS
+        self.urls = set()
+        self.bands = [{} for _ in range(SIMHASH_BANDS)]
+        self._order = deque()
+
+    def _band_keys(self, fingerprint):
+        mask = (1 << self.band_bits) - 1
+        return [(fingerprint >> (i * self.band_bits)) & mask for i in range(SIMHASH_BANDS)]
+
+    def is_duplicate(self, article, add=True):
+        """True if `article` matches a previously seen URL or near-identical text"""
+        url = canonicalize_url(article.get('url'))
+        if url and url in self.urls:
+            return True
+
+        text = f"{article.get('title') or ''} {article.get('description') or ''}"
+        fingerprint = simhash(text)
+        keys = self._band_keys(fingerprint) if fingerprint else []
+        for band, key in zip(self.bands, keys):
+            for other in band.get(key, ()):
+                if (fingerprint ^ other).bit_count() <= self.threshold:
+                    return True
+
+        if add:
+            self._add(url, fingerprint, keys)
+        return False
+
+    def _add(self, url, fingerprint, keys):
+        if url:
+            self.urls.add(url)
+        for band, key in zip(self.bands, keys):
+            band.setdefault(key, []).append(fingerprint)
+        self._order.append((url, fingerprint, keys))
+
+        if self.max_entries and len(self._order) > self.max_entries:
+            old_url, old_fingerprint, old_keys = self._order.popleft()
+            self.urls.discard(old_url)
+            for band, key in zip(self.bands, old_keys):
+                bucket = band.get(key)
+                if bucket:
+                    bucket.remove(old_fingerprint)
+                    if not bucket:
+                        del band[key]
+
+
+def dedupe_articles(articles, deduplicator=None):
+    """Drop URL and near-text duplicates, keeping the first occurrence of each story"""
+    deduplicator = deduplicator or Deduplicator()
+    return [article for article in articles if not deduplicator.is_duplicate(article)]
@@ -0,0 +1,135 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait
+import logging
+import os
+import threading
+import time
+
+import http_client
+from telemetry import log_event, propagate, record_span
+
+# ========================================
+# CONCURRENT PROVIDER FAN-OUT
+# ========================================
+# One small pool per provider, so a stalled provider can only back up its
+# own pool: the healthy providers' calls never queue behind it. Every HTTP
+# call a provider makes is capped to the request's deadline, so a provider
+# that misses it gives up at about the same time instead of finishing late;
+# it is left out of the result. Calls still queued when their request's
+# deadline has passed are skipped instead of run.
+FANOUT_WORKERS_PER_PROVIDER = int(os.getenv('FANOUT_WORKERS_PER_PROVIDER', '8'))
+LIVE_FETCH_DEADLINE = float(os.getenv('LIVE_FETCH_DEADLINE', '8'))
+
+# provider name -> its executor
+_executors = {}
+_executors_lock = threading.Lock()
+# WSGI environ key under which the async server hands a finished fan-out to the view
+LIVE_RESULT_ENVIRON = 'newsai.live_result'
+
+
+class FanoutResult:
+    """Merged articles plus which providers answered before the deadline"""
+
+    def __init__(self, articles, contributed, timed_out, failed, timings):
+        self.articles = articles
+        self.contributed = contributed
+        self.timed_out = timed_out
+        self.failed = failed
+        self.timings = timings
+
+
+def _executor(name):
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = ThreadPoolExecutor(
+                    max_workers=FANOUT_WORKERS_PER_PROVIDER, thread_name_prefix=f'fanout-{name}')
+    return executor
+
+
+def fetch_all(providers, deadline=None):
+    """
+    Run every provider call in parallel and wait at most `deadline` seconds in total.
+
+    `providers` is an ordered mapping of provider name -> zero-argument callable
+    returning a list of articles. Results are merged in provider order; providers
+    that miss the deadline or raise are left out and reported separately. HTTP
+    calls made by a provider are capped to the deadline (http_client.deadline()).
+    """
+    if deadline is None:
+        deadline = LIVE_FETCH_DEADLINE
+
+    started = time.monotonic()
+    timings = {}
+
+    def timed(name, fn):
+        if time.monotonic() - started >= deadline:
+            # Queued behind a stalled call of the same provider; nobody is waiting any more
+            log_event('provider_skipped', provider=name)
+            return []
+        t0 = time.monotonic()
+        try:
+            with http_client.deadline(started + deadline):
+                return fn()
+        finally:
+            timings[name] = time.monotonic() - t0
+
+    # propagate() carries the request's trace into the pool, so provider spans land on it
+    futures = {name: _executor(name).submit(propagate(timed), name, fn) for name, fn in providers.items()}
+    wait(futures.values(), timeout=deadline)
+
+    return _merge(futures, started, timings)
+
+
+async def fetch_all_async(providers, deadline=None):
+    """
+    fetch_all() for coroutines: `providers` maps name -> zero-argument async
+    callable. Runs on the event loop, so no thread is held while waiting.
+    """
+    if deadline is None:
+        deadline = LIVE_FETCH_DEADLINE
+
+    started = time.monotonic()
+    timings = {}
+
+    async def timed(name, fn):
+        t0 = time.monotonic()
+        try:
+            with http_client.deadline(started + deadline):
+                return await fn()
+        finally:
+            timings[name] = time.monotonic() - t0
+
+    tasks = {name: asyncio.ensure_future(timed(name, fn)) for name, fn in providers.items()}
+    if tasks:
+        await asyncio.wait(tasks.values(), timeout=deadline)
+    result = _merge(tasks, started, timings)
+    # Their HTTP calls are about to hit the same deadline; nobody is waiting for them
+    for task in tasks.values():
+        task.cancel()
+    return result
+
+
+def _merge(futures, started, timings):
+    """FanoutResult from finished futures/tasks, in provider order"""
+    articles, contributed, timed_out, failed = [], [], [], []
+    for name, future in futures.items():
+        if not future.done():
+            timed_out.append(name)
+            continue
+        try:
+            result = future.result()
+        except Exception as e:
+            log_event('provider_failed', logging.WARNING, provider=name, error=str(e))
+            failed.append(name)
+            continue
+        articles.extend(result)
+        contributed.append(name)
+
+    elapsed = time.monotonic() - started
+    record_span('fanout', elapsed)
+    log_event('fanout', ms=round(elapsed * 1000, 2), ok=contributed, timed_out=timed_out, failed=failed,
+              providers={name: round(t * 1000, 2) for name, t in timings.items()})
+    return FanoutResult(articles, contributed, timed_out, failed, timings)
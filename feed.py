@@ -0,0 +1,327 @@
+from datetime import datetime
+import heapq
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy.orm import load_only
+
+import cache_backend
+from cache import TTLCache
+from cache_backend import CacheBackendError
+from telemetry import log_event
+
+# ========================================
+# PERSONALIZED FEED ENGINE
+# ========================================
+FEED_CANDIDATE_LIMIT = int(os.getenv('FEED_CANDIDATE_LIMIT', '5000'))
+FEED_INDEX_TTL = int(os.getenv('FEED_INDEX_TTL', '60'))
+FEED_PROFILE_CACHE_SIZE = int(os.getenv('FEED_PROFILE_CACHE_SIZE', '20000'))
+# Profiles are updated in place only in the process that saw the change. With a
+# shared cache backend every change also bumps a per-user version, and other
+# workers rebuild on their next feed request; with the local backend this TTL
+# bounds how long another worker serves an outdated profile.
+FEED_PROFILE_TTL = int(os.getenv('FEED_PROFILE_TTL', '300'))
+FEED_HISTORY_LIMIT = int(os.getenv('FEED_HISTORY_LIMIT', '500'))
+FEED_RECENCY_HALF_LIFE_HOURS = float(os.getenv('FEED_RECENCY_HALF_LIFE_HOURS', '24'))
+FEED_INTERACTION_HALF_LIFE_DAYS = float(os.getenv('FEED_INTERACTION_HALF_LIFE_DAYS', '14'))
+
+INTEREST_WEIGHT = 5.0
+SOURCE_WEIGHT = 3.0
+INTERACTION_WEIGHTS = {'like': 3.0, 'bookmark': 4.0, 'share': 3.0, 'read': 1.0}
+DEFAULT_INTERACTION_WEIGHT = 1.0
+# Added to every matched article's affinity so recency still orders weak matches
+RECENCY_FLOOR = 0.1
+
+
+def article_features(category=None, source=None, tags=None):
+    """Sparse feature keys describing an article: category, source and each tag"""
+    features = []
+    if category:
+        features.append('cat:' + category.strip().lower())
+    if source:
+        features.append('src:' + source.strip().lower())
+    for tag in (tags or '').split(','):
+        tag = tag.strip().lower()
+        if tag:
+            features.append('tag:' + tag)
+    return features
+
+
+def _split(value):
+    return [v.strip() for v in (value or '').split(',') if v.strip()]
+
+
+def _decay(age_seconds, half_life_seconds):
+    return 0.5 ** (max(age_seconds, 0) / half_life_seconds)
+
+
+class UserProfile:
+    """Interest vector for one user: a preference part and a decaying interaction part"""
+    __slots__ = ('preference', 'interactions', 'as_of', 'seen', 'lock', 'version')
+
+    def __init__(self, version=0):
+        self.version = version
+        self.preference = {}
+        self.interactions = {}
+        self.as_of = time.time()
+        self.seen = set()
+        self.lock = threading.Lock()
+
+    def set_preferences(self, interests, sources):
+        vector = {}
+        for interest in interests:
+            key = interest.strip().lower()
+            if key:
+                vector['cat:' + key] = vector.get('cat:' + key, 0) + INTEREST_WEIGHT
+                vector['tag:' + key] = vector.get('tag:' + key, 0) + INTEREST_WEIGHT
+        for source in sources:
+            key = source.strip().lower()
+            if key:
+                vector['src:' + key] = vector.get('src:' + key, 0) + SOURCE_WEIGHT
+        with self.lock:
+            self.preference = vector
+
+    def _decay_to(self, now):
+        factor = _decay(now - self.as_of, FEED_INTERACTION_HALF_LIFE_DAYS * 86400)
+        if factor < 1:
+            for key in self.interactions:
+                self.interactions[key] *= factor
+        self.as_of = now
+
+    def add_interaction(self, article_id, interaction_type, features, at=None):
+        now = time.time()
+        weight = INTERACTION_WEIGHTS.get(interaction_type, DEFAULT_INTERACTION_WEIGHT)
+        if at is not None:
+            weight *= _decay(now - at, FEED_INTERACTION_HALF_LIFE_DAYS * 86400)
+        with self.lock:
+            self._decay_to(now)
+            for feature in features:
+                self.interactions[feature] = self.interactions.get(feature, 0) + weight
+            if article_id:
+                self.seen.add(article_id)
+
+    def vector(self):
+        with self.lock:
+            self._decay_to(time.time())
+            combined = dict(self.preference)
+            for key, weight in self.interactions.items():
+                combined[key] = combined.get(key, 0) + weight
+            return combined, frozenset(self.seen)
+
+
+class CandidateIndex:
+    """Inverted index feature -> article ids over the most recent articles"""
+
+    def __init__(self, ids_by_feature, features_by_id, published_by_id, recent_ids, built_at):
+        self.ids_by_feature = ids_by_feature
+        self.features_by_id = features_by_id
+        self.published_by_id = published_by_id
+        self.recent_ids = recent_ids
+        self.built_at = built_at
+
+
+class FeedEngine:
+    """
+    Ranks articles per user by preference and interaction affinity with a
+    recency decay. Profiles are built from the DB once, then updated in place
+    as interactions and preference changes arrive; feed generation only walks
+    the index postings for the user's features and takes a top-k.
+    """
+
+    def __init__(self, db, Article, UserPreferences, UserInteractions):
+        self.db = db
+        self.Article = Article
+        self.UserPreferences = UserPreferences
+        self.UserInteractions = UserInteractions
+        self.profiles = TTLCache(ttl=FEED_PROFILE_TTL, max_entries=FEED_PROFILE_CACHE_SIZE, sizeof=None)
+        self._index = None
+        self._index_lock = threading.Lock()
+
+    # ---------- candidate index ----------
+
+    def _build_index(self):
+        Article = self.Article
+        rows = (self.db.session.query(Article)
+                .options(load_only(Article.id, Article.category, Article.source, Article.tags, Article.published_at))
+                .order_by(Article.published_at.desc(), Article.id.desc())
+                .limit(FEED_CANDIDATE_LIMIT)
+                .all())
+
+        ids_by_feature, features_by_id, published_by_id = {}, {}, {}
+        for row in rows:
+            features = article_features(row.category, row.source, row.tags)
+            features_by_id[row.id] = features
+            published_by_id[row.id] = _utc_timestamp(row.published_at) or 0
+            for feature in features:
+                ids_by_feature.setdefault(feature, []).append(row.id)
+        return CandidateIndex(ids_by_feature, features_by_id, published_by_id,
+                              [row.id for row in rows], time.monotonic())
+
+    def index(self):
+        current = self._index
+        if current is None or time.monotonic() - current.built_at > FEED_INDEX_TTL:
+            with self._index_lock:
+                current = self._index
+                if current is None or time.monotonic() - current.built_at > FEED_INDEX_TTL:
+                    current = self._index = self._build_index()
+        return current
+
+    def invalidate_index(self):
+        self._index = None
+
+    # ---------- profiles ----------
+
+    def _version_key(self, user_id):
+        # Scoped by database like the principal cache, so apps on different databases never collide
+        return f'feed_profile:{self.db.engine.url}:{user_id}'
+
+    def _profile_version(self, user_id):
+        """Shared version of the user's profile; 0 without a shared backend, None if it is unreachable"""
+        backend = cache_backend.shared()
+        if backend is None:
+            return 0
+        try:
+            return int(backend.get(self._version_key(user_id)) or 0)
+        except CacheBackendError as e:
+            log_event('cache_backend_error', logging.WARNING, key='feed_profile', error=str(e))
+            return None
+
+    def _profile_changed(self, user_id, profile):
+        """
+        Bump the user's shared version after a committed change. `profile` is
+        the local copy already updated in place (or None); it keeps serving
+        only if no other worker changed the user in between.
+        """
+        backend = cache_backend.shared()
+        if backend is None:
+            return
+        try:
+            version = backend.incr(self._version_key(user_id))
+        except CacheBackendError as e:
+            # Other workers keep their copies until FEED_PROFILE_TTL
+            log_event('cache_backend_error', logging.ERROR, key='feed_profile', error=str(e))
+            version = None
+        if profile is None:
+            return
+        if version is not None and profile.version == version - 1:
+            profile.version = version
+        else:
+            self.profiles.delete(user_id)
+
+    def _build_profile(self, user_id, version):
+        profile = UserProfile(version)
+        prefs = self.UserPreferences.query.filter_by(user_id=user_id).first()
+        if prefs:
+            profile.set_preferences(_split(prefs.interests), _split(prefs.preferred_sources))
+
+        Article, Interactions = self.Article, self.UserInteractions
+        history = (self.db.session.query(Interactions.article_id, Interactions.interaction_type,
+                                         Interactions.created_at, Article.category, Article.source, Article.tags)
+                   .join(Article, Article.id == Interactions.article_id)
+                   .filter(Interactions.user_id == user_id)
+                   .order_by(Interactions.created_at.desc())
+                   .limit(FEED_HISTORY_LIMIT)
+                   .all())
+        for article_id, interaction_type, created_at, category, source, tags in reversed(history):
+            at = _utc_timestamp(created_at)
+            profile.add_interaction(article_id, interaction_type, article_features(category, source, tags), at)
+        return profile
+
+    def profile(self, user_id):
+        # Read the version before building, so a change committed meanwhile triggers another rebuild
+        version = self._profile_version(user_id)
+        profile = self.profiles.get_or_load(user_id, lambda: self._build_profile(user_id, version or 0))
+        if version is not None and profile.version != version:
+            self.profiles.delete(user_id)
+            profile = self.profiles.get_or_load(user_id, lambda: self._build_profile(user_id, version))
+        return profile
+
+    def update_preferences(self, user_id, interests, sources):
+        """
+        Replace the preference part of a cached profile (uncached ones rebuild
+        lazily). Call after the change is committed.
+        """
+        profile = self.profiles.get(user_id)
+        if profile is not None:
+            profile.set_preferences(interests, sources)
+        self._profile_changed(user_id, profile)
+
+    def observe_interactions(self, rows):
+        """
+        Fold newly written interaction rows into cached profiles. Article
+        features come from the candidate index, falling back to one DB query
+        for articles outside it.
+        """
+        cached = [(row, self.profiles.get(row['user_id'])) for row in rows]
+        cached = [(row, profile) for row, profile in cached if profile is not None]
+        if cached:
+            self._fold_interactions(cached)
+        # Once per user, so other workers drop their copies
+        for user_id in {row['user_id'] for row in rows}:
+            self._profile_changed(user_id, self.profiles.get(user_id))
+
+    def _fold_interactions(self, cached):
+        index = self._index
+        known = index.features_by_id if index is not None else {}
+        missing = {row['article_id'] for row, _ in cached
+                   if isinstance(row['article_id'], int) and row['article_id'] not in known}
+        extra = {}
+        if missing:
+            Article = self.Article
+            for article_id, category, source, tags in (self.db.session.query(
+                    Article.id, Article.category, Article.source, Article.tags)
+                    .filter(Article.id.in_(missing))):
+                extra[article_id] = article_features(category, source, tags)
+
+        for row, profile in cached:
+            features = known.get(row['article_id']) or extra.get(row['article_id'])
+            if features:
+                profile.add_interaction(row['article_id'], row['interaction_type'], features,
+                                        _utc_timestamp(row.get('created_at')))
+
+    # ---------- ranking ----------
+
+    def top_k(self, user_id, k):
+        """[(article_id, score)] best first; falls back to recency for cold-start users"""
+        vector, seen = self.profile(user_id).vector()
+        index = self.index()
+
+        affinity = {}
+        for feature, weight in vector.items():
+            for article_id in index.ids_by_feature.get(feature, ()):
+                affinity[article_id] = affinity.get(article_id, 0) + weight
+
+        now = time.time()
+        half_life = FEED_RECENCY_HALF_LIFE_HOURS * 3600
+        scored = (
+            (article_id, (score + RECENCY_FLOOR) * _decay(now - index.published_by_id[article_id], half_life))
+            for article_id, score in affinity.items() if article_id not in seen
+        )
+        ranked = heapq.nlargest(k, scored, key=lambda item: item[1])
+
+        if len(ranked) < k:
+            chosen = {article_id for article_id, _ in ranked}
+            for article_id in index.recent_ids:
+                if article_id not in chosen and article_id not in seen:
+                    ranked.append((article_id, 0.0))
+                    if len(ranked) == k:
+                        break
+        return ranked
+
+    def stats(self):
+        index = self._index
+        return {
+            'profiles': len(self.profiles),
+            'candidates': len(index.recent_ids) if index is not None else 0,
+            'features': len(index.ids_by_feature) if index is not None else 0,
+        }
+
+
+def _utc_timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return (value - datetime(1970, 1, 1)).total_seconds() if value.tzinfo is None else value.timestamp()
+    return None
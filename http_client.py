@@ -0,0 +1,149 @@
+from contextlib import contextmanager
+import contextvars
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ========================================
+# SHARED PROVIDER HTTP CLIENT
+# ========================================
+# Keep-alive sessions, one per upstream host, so live fetches reuse TCP+TLS
+# connections instead of paying a fresh handshake on every request.
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '2'))
+HTTP_BACKOFF = float(os.getenv('HTTP_BACKOFF', '0.3'))
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '10'))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_HEADERS = {
+    'Accept': 'application/json',
+    'Accept-Encoding': 'gzip, deflate',
+    'User-Agent': 'NewsAI/1.0',
+}
+
+
+def _parse_pool_sizes(spec):
+    """'newsapi.org=20,content.guardianapis.com=5' -> {'newsapi.org': 20, ...}"""
+    sizes = {}
+    for item in (spec or '').split(','):
+        host, _, size = item.strip().partition('=')
+        if host and size.strip().isdigit():
+            sizes[host.lower()] = int(size)
+    return sizes
+
+
+# Per-host overrides of HTTP_POOL_SIZE
+HTTP_POOL_SIZES = _parse_pool_sizes(os.getenv('HTTP_POOL_SIZES'))
+
+# Monotonic time by which the caller needs an answer (see deadline()), and the
+# per-attempt timeout of the call in progress
+_deadline = contextvars.ContextVar('http_deadline', default=None)
+_attempt_timeout = contextvars.ContextVar('http_attempt_timeout', default=0.0)
+
+
+@contextmanager
+def deadline(at):
+    """
+    Bound every call made inside the block, retries and backoff included, to
+    finish by monotonic time `at`: timeouts are clamped to the time left and
+    a retry is only made if a whole attempt still fits.
+    """
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_left():
+    """Seconds until the current deadline, or None outside deadline()"""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def call_timeout(timeout=None):
+    """`timeout` (default HTTP_TIMEOUT) clamped to the current deadline"""
+    timeout = timeout or HTTP_TIMEOUT
+    left = time_left()
+    return timeout if left is None else max(min(timeout, left), 0.01)
+
+
+class _DeadlineRetry(Retry):
+    """Retry that stops once another attempt could not finish before the caller's deadline"""
+
+    def is_exhausted(self):
+        left = time_left()
+        if left is not None and left < self.get_backoff_time() + _attempt_timeout.get():
+            return True
+        return super().is_exhausted()
+
+    def sleep(self, response=None):
+        left = time_left()
+        if left is not None and response is not None and self.respect_retry_after_header:
+            # Never wait out a Retry-After past the point where the retry could still finish
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None:
+                time.sleep(max(min(retry_after, left - _attempt_timeout.get()), 0))
+                return
+        super().sleep(response)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _build_session(host):
+    pool_size = HTTP_POOL_SIZES.get(host, HTTP_POOL_SIZE)
+    retry = _DeadlineRetry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry, pool_block=False)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def get_session(url):
+    """Return the pooled session for the host of `url`, creating it on first use"""
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc.lower())
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _build_session(parts.hostname or '')
+                _sessions[key] = session
+    return session
+
+
+def get(url, params=None, timeout=None, **kwargs):
+    """
+    Drop-in replacement for requests.get that goes through the pooled session.
+    Inside deadline() the timeout and retries are capped to the time left.
+    """
+    timeout = call_timeout(timeout)
+    token = _attempt_timeout.set(timeout)
+    try:
+        return get_session(url).get(url, params=params, timeout=timeout, **kwargs)
+    finally:
+        _attempt_timeout.reset(token)
+
+
+def close_sessions():
+    """Close every pooled session (used on shutdown and between test runs)"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
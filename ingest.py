@@ -0,0 +1,289 @@
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import insert
+
+from dedup import canonicalize_url, dedupe_articles
+from models import db, Article
+from telemetry import log_event, span
+
+# ========================================
+# BACKGROUND INGESTION PIPELINE
+# ========================================
+INGEST_CATEGORIES = [c.strip() for c in os.getenv(
+    'INGEST_CATEGORIES',
+    'Technology,Business,Health,Science,Sports,Politics,Environment,Entertainment'
+).split(',') if c.strip()]
+INGEST_INTERVAL = int(os.getenv('INGEST_INTERVAL', '900'))
+INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', '500'))
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '1000'))
+IMPORT_MAX_LINE_BYTES = int(os.getenv('IMPORT_MAX_LINE_BYTES', str(1024 * 1024)))
+# Invalid lines reported back in detail; the rest are only counted
+IMPORT_MAX_ERRORS = 100
+# Optional text columns an imported line may carry (title and url are required)
+IMPORT_TEXT_FIELDS = ('description', 'content', 'image_url', 'source', 'author', 'category', 'tags')
+
+
+def parse_published_at(value):
+    """Parse provider timestamps like '2024-05-01T12:00:00Z' into naive UTC datetimes"""
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except (TypeError, ValueError):
+            return datetime.utcnow()
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def normalize_article(article, category=None):
+    """Map a live article dict (as returned by the fetchers) onto Article columns"""
+    url = (article.get('url') or '').strip()
+    title = (article.get('title') or '').strip()
+    if not url or not title:
+        return None
+    return {
+        'title': title[:500],
+        'description': article.get('description') or '',
+        'content': article.get('content') or '',
+        'url': url[:500],
+        'canonical_url': canonicalize_url(url)[:500],
+        'image_url': (article.get('image_url') or '')[:500],
+        'source': (article.get('source') or '')[:100],
+        'author': (article.get('author') or '')[:200],
+        'category': (category or article.get('category') or 'General')[:50],
+        'tags': (article.get('tags') or '')[:500],
+        'published_at': parse_published_at(article.get('published_at')),
+        'created_at': datetime.utcnow(),
+    }
+
+
+def bulk_insert_articles(session, rows, batch_size=None):
+    """
+    Insert normalized rows in batches, one transaction per batch, skipping
+    canonical URLs already stored or repeated within `rows` (tracking
+    parameters, www/AMP variants of one story). Returns (inserted, skipped).
+    """
+    batch_size = batch_size or INGEST_BATCH_SIZE
+    inserted = skipped = 0
+    seen = set()
+
+    for start in range(0, len(rows), batch_size):
+        batch = []
+        for row in rows[start:start + batch_size]:
+            if row is None or row['canonical_url'] in seen:
+                skipped += 1
+                continue
+            seen.add(row['canonical_url'])
+            batch.append(row)
+        if not batch:
+            continue
+
+        urls = [row['canonical_url'] for row in batch]
+        existing = {url for (url,) in session.query(Article.canonical_url).filter(Article.canonical_url.in_(urls))}
+        batch = [row for row in batch if row['canonical_url'] not in existing]
+        skipped += len(urls) - len(batch)
+
+        if batch:
+            # Core insert on the table so the result carries the driver's rowcount
+            statement = insert(Article.__table__)
+            if session.get_bind().dialect.name == 'sqlite':
+                # A concurrent writer may have stored the same story since the check above
+                statement = statement.prefix_with('OR IGNORE')
+            try:
+                result = session.execute(statement, batch)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            written = result.rowcount if result.rowcount >= 0 else len(batch)
+            inserted += written
+            skipped += len(batch) - written
+
+    return inserted, skipped
+
+
+# ========================================
+# BULK NDJSON IMPORT
+# ========================================
+# One article object per line, in the shape the export endpoint writes.
+# Lines are parsed as they arrive and written IMPORT_BATCH_SIZE at a time
+# through bulk_insert_articles, so memory stays flat for any file size and
+# a failed batch leaves the earlier ones committed. `id` is ignored (rows
+# get new ids); URLs already stored are skipped.
+
+class ImportProgress:
+    __slots__ = ('lines', 'inserted', 'skipped', 'invalid', 'batches', 'errors', 'done')
+
+    def __init__(self):
+        self.lines = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.invalid = 0
+        self.batches = 0
+        self.errors = []
+        self.done = False
+
+    def reject(self, line, reason):
+        self.invalid += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({'line': line, 'error': reason})
+
+    def as_dict(self):
+        data = {'lines': self.lines, 'inserted': self.inserted, 'skipped': self.skipped,
+                'invalid': self.invalid, 'batches': self.batches, 'done': self.done}
+        if self.done:
+            data['errors'] = self.errors
+        return data
+
+
+def read_lines(stream, max_bytes=None):
+    """(line number, bytes) for each line of a binary stream; over-long lines come back as None"""
+    max_bytes = max_bytes or IMPORT_MAX_LINE_BYTES
+    number = 0
+    while True:
+        line = stream.readline(max_bytes + 1)
+        if not line:
+            return
+        number += 1
+        if len(line) > max_bytes and not line.endswith(b'\n'):
+            # Skip the rest of the line without buffering it
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(max_bytes)
+            line = None
+        yield number, line
+
+
+def _parse_timestamp(value, field):
+    if value in (None, ''):
+        return None
+    try:
+        return parse_published_at(datetime.fromisoformat(str(value).replace('Z', '+00:00')))
+    except ValueError:
+        raise ValueError(f'{field} is not an ISO 8601 timestamp')
+
+
+def import_row(record):
+    """Validate one imported article and map it onto Article columns; raises ValueError"""
+    if not isinstance(record, dict):
+        raise ValueError('expected a JSON object')
+    for field in ('title', 'url'):
+        if not isinstance(record.get(field), str) or not record[field].strip():
+            raise ValueError(f'{field} is required')
+    for field in IMPORT_TEXT_FIELDS:
+        if not isinstance(record.get(field), (str, type(None))):
+            raise ValueError(f'{field} must be a string')
+    published_at = _parse_timestamp(record.get('published_at'), 'published_at')
+    created_at = _parse_timestamp(record.get('created_at'), 'created_at')
+    row = normalize_article(record)
+    row['published_at'] = published_at or row['created_at']
+    if created_at is not None:
+        row['created_at'] = created_at
+    return row
+
+
+def import_ndjson(session, lines, batch_size=None):
+    """
+    Import (line number, bytes) pairs from read_lines(); yields the running
+    ImportProgress after every committed batch and once more when done.
+    """
+    batch_size = batch_size or IMPORT_BATCH_SIZE
+    progress = ImportProgress()
+    batch = []
+
+    def write():
+        with span('import.insert'):
+            inserted, skipped = bulk_insert_articles(session, batch, batch_size)
+        progress.inserted += inserted
+        progress.skipped += skipped
+        progress.batches += 1
+        batch.clear()
+
+    for number, line in lines:
+        progress.lines = number
+        if line is not None and not line.strip():
+            continue
+        try:
+            if line is None:
+                raise ValueError(f'line is longer than {IMPORT_MAX_LINE_BYTES} bytes')
+            batch.append(import_row(json.loads(line)))
+        except ValueError as e:
+            progress.reject(number, str(e))
+            continue
+        if len(batch) >= batch_size:
+            write()
+            yield progress
+
+    if batch:
+        write()
+    progress.done = True
+    log_event('import_run', force=True, **progress.as_dict())
+    yield progress
+
+
+class IngestionWorker:
+    """
+    Daemon thread that pulls every category from the live providers on a fixed
+    interval and persists the results, so reads can be served from the DB.
+    `fetch_category(category)` must return a list of live article dicts.
+    The app may be given later with init_app().
+    """
+
+    def __init__(self, app, fetch_category, categories=None, interval=None, batch_size=None):
+        self.app = app
+        self.fetch_category = fetch_category
+        self.categories = categories or INGEST_CATEGORIES
+        self.interval = interval or INGEST_INTERVAL
+        self.batch_size = batch_size or INGEST_BATCH_SIZE
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_run = None
+        self.last_result = {}
+
+    def init_app(self, app):
+        self.app = app
+
+    def run_once(self):
+        """Ingest every category once; returns {category: (inserted, skipped)}"""
+        results = {}
+        with self.app.app_context():
+            for category in self.categories:
+                try:
+                    articles = dedupe_articles(self.fetch_category(category))
+                    rows = [normalize_article(a, category) for a in articles]
+                    with span('ingest.insert'):
+                        results[category] = bulk_insert_articles(db.session, rows, self.batch_size)
+                except Exception as e:
+                    log_event('ingest_failed', logging.ERROR, category=category, error=str(e))
+                    results[category] = (0, 0)
+            db.session.remove()
+
+        inserted = sum(r[0] for r in results.values())
+        log_event('ingest_run', force=True, inserted=inserted, categories=len(results))
+        self.last_run = datetime.utcnow()
+        self.last_result = results
+        return results
+
+    def _loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.run_once()
+            self._stop.wait(max(0, self.interval - (time.monotonic() - started)))
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='ingestion', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -1,71 +1,46 @@
 from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
 import hashlib
+from dotenv import load_dotenv
+import sys
+from migrations import upgrade, drop_auxiliary_tables
+from db_config import configure_database, init_engines
+from models import db, User, Article
+from ingest import import_ndjson, read_lines
+
+load_dotenv()
 
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///newsai.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db = SQLAlchemy(app)
-
-# Database Models
-class User(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    email = db.Column(db.String(120), unique=True, nullable=False)
-    password = db.Column(db.String(200), nullable=False)
-    name = db.Column(db.String(100))
-    role = db.Column(db.String(20), default='user')
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-class Article(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(500), nullable=False)
-    description = db.Column(db.Text)
-    content = db.Column(db.Text)
-    url = db.Column(db.String(500))
-    image_url = db.Column(db.String(500))
-    source = db.Column(db.String(100))
-    author = db.Column(db.String(200))
-    category = db.Column(db.String(50))
-    tags = db.Column(db.String(500))
-    published_at = db.Column(db.DateTime, default=datetime.utcnow)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-class UserPreferences(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
-    interests = db.Column(db.Text)
-    preferred_sources = db.Column(db.Text)
+configure_database(app)
+db.init_app(app)
+init_engines(app, db)
 
-class ReadingHistory(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
-    article_id = db.Column(db.Integer, db.ForeignKey('article.id'))
-    read_at = db.Column(db.DateTime, default=datetime.utcnow)
+# Initialize database. Existing data is kept; pass --reset to start from scratch.
+# --import FILE.ndjson backfills articles from an export (GET /api/admin/articles/bulk).
+reset = '--reset' in sys.argv
+import_path = sys.argv[sys.argv.index('--import') + 1] if '--import' in sys.argv[:-1] else None
 
-class UserInteractions(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
-    article_id = db.Column(db.Integer)
-    interaction_type = db.Column(db.String(20))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-# Initialize database
 with app.app_context():
+    if reset:
+        print("🔄 --reset: dropping all tables...")
+        drop_auxiliary_tables(db.engine)
+        db.drop_all()
+    
     print("🔄 Creating database tables...")
-    db.drop_all()
     db.create_all()
-    print("✅ Created all tables")
+    upgrade(db.engine)
+    print("✅ Schema is up to date")
     
     # Create admin user
-    print("\n🔄 Creating admin user...")
-    admin = User(
-        email='admin@news.com',
-        password=hashlib.sha256('admin123'.encode()).hexdigest(),
-        name='Admin User',
-        role='admin'
-    )
-    db.session.add(admin)
+    if not User.query.filter_by(email='admin@news.com').first():
+        print("\n🔄 Creating admin user...")
+        admin = User(
+            email='admin@news.com',
+            password=hashlib.sha256('admin123'.encode()).hexdigest(),
+            name='Admin User',
+            role='admin'
+        )
+        db.session.add(admin)
     
     # Create sample articles
     print("🔄 Creating sample articles...")
@@ -102,12 +77,24 @@ with app.app_context():
         )
     ]
     
+    existing_titles = {title for (title,) in db.session.query(Article.title)}
     for article in articles:
-        db.session.add(article)
+        if article.title not in existing_titles:
+            db.session.add(article)
     
     db.session.commit()
     print("✅ Created admin user and sample articles")
     
+    if import_path:
+        print(f"\n🔄 Importing articles from {import_path}...")
+        with open(import_path, 'rb') as f:
+            for progress in import_ndjson(db.session, read_lines(f)):
+                print(f"   line {progress.lines}: {progress.inserted} inserted, "
+                      f"{progress.skipped} skipped, {progress.invalid} invalid")
+        for error in progress.errors:
+            print(f"   ⚠️ line {error['line']}: {error['error']}")
+        print("✅ Import complete")
+    
     print("\n" + "="*50)
     print("✅ DATABASE INITIALIZATION COMPLETE!")
     print("="*50)
@@ -0,0 +1,136 @@
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+from dedup import canonicalize_url
+from search_index import ensure_search_index
+from stats_counters import ensure_stats_counters
+
+# ========================================
+# SCHEMA MIGRATIONS
+# ========================================
+# Versioned, forward-only migrations recorded in `schema_migrations`. Each one
+# runs once, in its own transaction, and never drops data, so an existing
+# production database can be upgraded in place:
+#
+#     python migrations.py            apply pending migrations
+#     python migrations.py status     list applied / pending versions
+#
+# create_all() still creates brand-new tables with the same indexes (they are
+# declared on the models too); the IF NOT EXISTS guards make both paths agree.
+
+
+def _sql(*statements):
+    def run(conn):
+        for statement in statements:
+            conn.execute(text(statement))
+    return run
+
+
+def _canonical_urls(conn):
+    if 'canonical_url' not in {column['name'] for column in inspect(conn).get_columns('article')}:
+        conn.execute(text("ALTER TABLE article ADD COLUMN canonical_url VARCHAR(500)"))
+    # Oldest row first; later variants of the same story keep NULL like duplicate URLs in 0003
+    seen = {url for (url,) in conn.execute(text(
+        "SELECT canonical_url FROM article WHERE canonical_url IS NOT NULL"))}
+    updates = []
+    for article_id, url in conn.execute(text(
+            "SELECT id, url FROM article WHERE url IS NOT NULL AND canonical_url IS NULL ORDER BY id")):
+        canonical = canonicalize_url(url)[:500]
+        if canonical not in seen:
+            seen.add(canonical)
+            updates.append({'id': article_id, 'canonical_url': canonical})
+    if updates:
+        conn.execute(text("UPDATE article SET canonical_url = :canonical_url WHERE id = :id"), updates)
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_article_canonical_url ON article (canonical_url)"))
+
+
+MIGRATIONS = [
+    (1, 'article listing indexes', _sql(
+        "CREATE INDEX IF NOT EXISTS ix_article_published_at_id ON article (published_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_article_category_published_at_id ON article (category, published_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_article_created_at_id ON article (created_at, id)",
+    )),
+    (2, 'per-user indexes on activity tables', _sql(
+        "CREATE INDEX IF NOT EXISTS ix_user_interactions_user_id_created_at ON user_interactions (user_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_user_interactions_article_id ON user_interactions (article_id)",
+        "CREATE INDEX IF NOT EXISTS ix_reading_history_user_id_read_at ON reading_history (user_id, read_at)",
+        "CREATE INDEX IF NOT EXISTS ix_user_preferences_user_id ON user_preferences (user_id)",
+    )),
+    (3, 'unique article url', _sql(
+        "UPDATE article SET url = NULL WHERE url = ''",
+        # Keep the oldest row's URL; later copies keep their content but lose the duplicate link
+        """UPDATE article SET url = NULL
+           WHERE url IS NOT NULL
+             AND id NOT IN (SELECT MIN(id) FROM article WHERE url IS NOT NULL GROUP BY url)""",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_article_url ON article (url)",
+    )),
+    (4, 'canonical article url', _canonical_urls),
+]
+
+# Idempotent self-healing steps run on every upgrade (they only act when needed)
+REPEATABLE = [
+    ('full-text search index', ensure_search_index),
+    ('stats counters', ensure_stats_counters),
+]
+
+
+def _ensure_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " version INTEGER PRIMARY KEY,"
+            " name VARCHAR(200) NOT NULL,"
+            " applied_at DATETIME NOT NULL)"
+        ))
+
+
+def applied_versions(engine):
+    _ensure_table(engine)
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def upgrade(engine):
+    """Apply every pending migration in order, then the repeatable steps"""
+    done = applied_versions(engine)
+    for version, name, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(text(
+                "INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)"
+            ), {'v': version, 'n': name, 't': datetime.utcnow()})
+        print(f"✅ Migration {version:04d} applied: {name}")
+
+    for name, step in REPEATABLE:
+        step(engine)
+
+
+def drop_auxiliary_tables(engine):
+    """Drop the tables create_all() does not know about (used by init_db.py --reset)"""
+    with engine.begin() as conn:
+        for table in ('article_fts', 'stat_counter', 'stat_bucket', 'schema_migrations'):
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+
+def status(engine):
+    done = applied_versions(engine)
+    return [(version, name, version in done) for version, name, _ in MIGRATIONS]
+
+
+if __name__ == '__main__':
+    import sys
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        if len(sys.argv) > 1 and sys.argv[1] == 'status':
+            for version, name, applied in status(db.engine):
+                print(f"{'✅' if applied else '⏳'} {version:04d} {name}")
+        else:
+            upgrade(db.engine)
+            print("✅ Schema is up to date")
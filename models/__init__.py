@@ -0,0 +1,12 @@
+# ========================================
+# DATABASE MODELS
+# ========================================
+# The one schema shared by app.py, ingest.py and init_db.py.
+# Relationships are declared by name, so mappers are configured once, on
+# first use, and every relationship loads lazily (only when accessed).
+from .base import db
+from .user import User, UserPreferences
+from .article import Article
+from .activity import ReadingHistory, UserInteractions
+
+__all__ = ['db', 'User', 'UserPreferences', 'Article', 'ReadingHistory', 'UserInteractions']
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from .base import db
+
+
+class ReadingHistory(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'))
+    read_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    user = db.relationship('User', back_populates='reading_history', lazy='select')
+    article = db.relationship('Article', back_populates='reading_history', lazy='select')
+    
+    __table_args__ = (db.Index('ix_reading_history_user_id_read_at', 'user_id', 'read_at'),)
+    
+    def __repr__(self):
+        return f'<ReadingHistory User:{self.user_id} Article:{self.article_id}>'
+
+
+# Likes, bookmarks, shares and reads; written in batches by the write-behind buffer
+class UserInteractions(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    article_id = db.Column(db.Integer)
+    interaction_type = db.Column(db.String(20))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    user = db.relationship('User', back_populates='interactions', lazy='select')
+    
+    __table_args__ = (
+        db.Index('ix_user_interactions_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_user_interactions_article_id', 'article_id'),
+    )
+    
+    def __repr__(self):
+        return f'<UserInteractions {self.interaction_type} by User:{self.user_id}>'
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from .base import db
+
+
+class Article(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(500), nullable=False)
+    description = db.Column(db.Text)
+    # Full bodies are large and listings rarely need them: deferred unless a
+    # query asks for it (load_only(Article.content) / undefer(Article.content))
+    content = db.deferred(db.Column(db.Text))
+    url = db.Column(db.String(500))
+    # dedup.canonicalize_url(url), set on ingestion; what duplicate checks compare
+    canonical_url = db.Column(db.String(500))
+    image_url = db.Column(db.String(500))
+    source = db.Column(db.String(100))
+    author = db.Column(db.String(200))
+    category = db.Column(db.String(50))
+    tags = db.Column(db.String(500))
+    published_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    reading_history = db.relationship('ReadingHistory', back_populates='article', lazy='select', passive_deletes=True)
+    # user_interactions.article_id has no FK (live articles can be liked too), so this side is read-only
+    interactions = db.relationship('UserInteractions', lazy='select', viewonly=True,
+                                   primaryjoin='Article.id == foreign(UserInteractions.article_id)')
+    
+    # Back the keyset pagination orderings: (published_at, id), (created_at, id)
+    __table_args__ = (
+        db.Index('ix_article_published_at_id', 'published_at', 'id'),
+        db.Index('ix_article_category_published_at_id', 'category', 'published_at', 'id'),
+        db.Index('ix_article_created_at_id', 'created_at', 'id'),
+        db.Index('ux_article_url', 'url', unique=True),
+        db.Index('ux_article_canonical_url', 'canonical_url', unique=True),
+    )
+    
+    def __repr__(self):
+        return f'<Article {self.title[:50]}>'
@@ -0,0 +1,4 @@
+from flask_sqlalchemy import SQLAlchemy
+
+# Created unbound; the app (and init_db.py) attach it with db.init_app(app)
+db = SQLAlchemy()
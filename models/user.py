@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from .base import db
+
+
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password = db.Column(db.String(200), nullable=False)
+    name = db.Column(db.String(100))
+    role = db.Column(db.String(20), default='user')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Only loaded on access; deletes leave the rows alone instead of loading them to null the FK
+    preferences = db.relationship('UserPreferences', back_populates='user', lazy='select', passive_deletes=True)
+    reading_history = db.relationship('ReadingHistory', back_populates='user', lazy='select', passive_deletes=True)
+    interactions = db.relationship('UserInteractions', back_populates='user', lazy='select', passive_deletes=True)
+    
+    def __repr__(self):
+        return f'<User {self.email}>'
+
+
+class UserPreferences(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    interests = db.Column(db.Text)
+    preferred_sources = db.Column(db.Text)
+    
+    user = db.relationship('User', back_populates='preferences', lazy='select')
+    
+    __table_args__ = (db.Index('ix_user_preferences_user_id', 'user_id'),)
+    
+    def __repr__(self):
+        return f'<UserPreferences {self.user_id}>'
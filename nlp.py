@@ -0,0 +1,185 @@
+from bisect import bisect_left
+from functools import lru_cache
+import os
+import re
+
+from telemetry import log_event
+
+# ========================================
+# NLP FEATURE 1: SYNONYM DICTIONARY
+# ========================================
+SYNONYMS = {
+    'tech': ['technology', 'technical', 'digital', 'IT', 'computing'],
+    'technology': ['tech', 'digital', 'IT', 'computing', 'innovation'],
+    'phone': ['mobile', 'smartphone', 'cellphone', 'device', 'iPhone', 'Android'],
+    'mobile': ['phone', 'smartphone', 'cellphone', 'device'],
+    'ai': ['artificial intelligence', 'machine learning', 'ML', 'deep learning', 'neural network'],
+    'artificial intelligence': ['AI', 'machine learning', 'ML', 'deep learning'],
+    'ml': ['machine learning', 'AI', 'artificial intelligence'],
+    'car': ['automobile', 'vehicle', 'auto', 'motor'],
+    'vehicle': ['car', 'automobile', 'auto', 'motor', 'transport'],
+    'computer': ['PC', 'laptop', 'desktop', 'machine', 'system'],
+    'laptop': ['notebook', 'computer', 'portable computer'],
+    'news': ['article', 'story', 'report', 'update', 'information'],
+    'business': ['economy', 'finance', 'trade', 'commerce', 'market'],
+    'health': ['medical', 'healthcare', 'wellness', 'medicine', 'fitness'],
+    'sport': ['sports', 'athletic', 'game', 'match', 'tournament'],
+    'sports': ['sport', 'athletic', 'game', 'match', 'tournament'],
+    'politics': ['political', 'government', 'policy', 'election', 'parliament'],
+    'environment': ['environmental', 'climate', 'nature', 'ecology', 'green'],
+    'science': ['scientific', 'research', 'study', 'experiment', 'discovery'],
+}
+
+
+def _normalize(text):
+    """Lowercase and collapse to single-space separated word tokens"""
+    return ' '.join(re.findall(r'\w+', text.lower()))
+
+
+def build_synonym_index(synonyms):
+    """
+    Normalized, bidirectional synonym index. Each key keeps its own synonyms
+    first (in dictionary order), followed by the keys that list it as a synonym,
+    so 'digital' -> ('tech', 'technology') and 'ai' <-> 'artificial intelligence'.
+    """
+    index = {}
+
+    def add(phrase, synonym):
+        if phrase and synonym and phrase != synonym:
+            entries = index.setdefault(phrase, [])
+            if synonym not in entries:
+                entries.append(synonym)
+
+    normalized = [(_normalize(key), [_normalize(s) for s in values]) for key, values in synonyms.items()]
+    for key, values in normalized:
+        for value in values:
+            add(key, value)
+    for key, values in normalized:
+        for value in values:
+            add(value, key)
+    return {phrase: tuple(entries) for phrase, entries in index.items()}
+
+
+# Built once at import; multi-word keys are matched before single words
+SYNONYM_INDEX = build_synonym_index(SYNONYMS)
+MAX_PHRASE_WORDS = max(len(phrase.split()) for phrase in SYNONYM_INDEX)
+SYNONYMS_PER_TERM = 3
+
+# ========================================
+# NLP FEATURE 2: QUERY EXPANSION
+# ========================================
+QUERY_EXPANSION_CACHE_SIZE = int(os.getenv('QUERY_EXPANSION_CACHE_SIZE', '1024'))
+
+
+@lru_cache(maxsize=QUERY_EXPANSION_CACHE_SIZE)
+def _expand_normalized(normalized):
+    words = normalized.split()
+    terms = []
+
+    def add(term):
+        if term not in terms:
+            terms.append(term)
+
+    i = 0
+    while i < len(words):
+        # Longest phrase first, so 'artificial intelligence' wins over 'artificial'
+        for size in range(min(MAX_PHRASE_WORDS, len(words) - i), 0, -1):
+            phrase = ' '.join(words[i:i + size])
+            if size == 1 or phrase in SYNONYM_INDEX:
+                break
+        add(phrase)
+        for synonym in SYNONYM_INDEX.get(phrase, ())[:SYNONYMS_PER_TERM]:
+            add(synonym)
+        i += size
+
+    expanded = tuple(terms)
+    log_event('query_expanded', query=normalized, expanded=' '.join(expanded))
+    return expanded
+
+
+def expand_search_terms(query):
+    """
+    Expand a query into an ordered tuple of terms (phrases kept whole).
+    Example: 'AI news' -> ('ai', 'artificial intelligence', 'machine learning', 'ml', 'news', ...)
+    Results are memoized per normalized query, and the order is deterministic.
+    """
+    if not query:
+        return ()
+    return _expand_normalized(_normalize(query))
+
+
+def expand_search_query(query):
+    """
+    Expands search query with synonyms for better results
+    Example: 'tech news' -> 'tech technology technical digital news article story report'
+    """
+    if not query:
+        return query
+    return ' '.join(expand_search_terms(query))
+
+# ========================================
+# NLP FEATURE 3: BATCH RELEVANCE SCORING
+# ========================================
+# Per-field weights: a term found in the title is worth more than one in the body
+FIELD_WEIGHTS = (('title', 5), ('description', 2), ('content', 1))
+
+
+def normalize_terms(search_terms):
+    """Lowercased, de-duplicated terms in their original order"""
+    unique = []
+    for term in search_terms:
+        term = str(term).lower().replace('\x00', '').strip()
+        if term and term not in unique:
+            unique.append(term)
+    return tuple(unique)
+
+
+def _field(article, name):
+    if isinstance(article, dict):
+        return article.get(name)
+    return getattr(article, name, None)
+
+
+def score_articles(articles, search_terms, field_weights=FIELD_WEIGHTS):
+    """
+    Score a batch of articles (live dicts or Article rows) against the terms.
+    Each term adds its field weight once per field it appears in.
+    Returns a list of scores in the same order as `articles`.
+
+    Every field of every article is lowercased once and joined into a single
+    NUL-separated corpus. Each term is then located with str.find, jumping to
+    the next field after a hit, so the Python-level work is proportional to
+    the number of matching fields rather than articles x terms x fields.
+    """
+    terms = normalize_terms(search_terms)
+    scores = [0] * len(articles)
+    if not terms or not articles:
+        return scores
+
+    texts, ends, owners, weights = [], [], [], []
+    offset = -1
+    for index, article in enumerate(articles):
+        for name, weight in field_weights:
+            text = (_field(article, name) or '').lower()
+            texts.append(text)
+            offset += len(text) + 1
+            ends.append(offset)
+            owners.append(index)
+            weights.append(weight)
+    corpus = '\x00'.join(texts)
+
+    for term in terms:
+        pos = corpus.find(term)
+        while pos != -1:
+            segment = bisect_left(ends, pos)
+            scores[owners[segment]] += weights[segment]
+            pos = corpus.find(term, ends[segment] + 1)
+    return scores
+
+
+def rank_articles(articles, search_terms):
+    """Set 'relevance_score' on each article dict and sort best first"""
+    for article, score in zip(articles, score_articles(articles, search_terms)):
+        article['relevance_score'] = score
+    articles.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+    return articles
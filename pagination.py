@@ -0,0 +1,117 @@
+import base64
+from datetime import datetime
+import json
+import os
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only
+
+# ========================================
+# KEYSET (CURSOR) PAGINATION
+# ========================================
+DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', '50'))
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', '200'))
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(payload):
+    """Opaque, URL-safe token for a cursor payload"""
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    if not isinstance(payload, dict):
+        raise InvalidCursor('Invalid cursor')
+    return payload
+
+
+def page_size(value, default=None):
+    """Parse a `limit` query arg, clamped to 1..MAX_PAGE_SIZE"""
+    try:
+        size = int(value) if value not in (None, '') else (default or DEFAULT_PAGE_SIZE)
+    except (TypeError, ValueError):
+        size = default or DEFAULT_PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def parse_fields(value, allowed):
+    """'id,title' -> ('id', 'title'), keeping only allowed names; None/empty -> all allowed"""
+    if not value:
+        return tuple(allowed)
+    requested = [f.strip() for f in value.split(',')]
+    fields = tuple(f for f in allowed if f in requested)
+    return fields or tuple(allowed)
+
+
+def project(query, model, fields, always=()):
+    """Only load the mapped columns a response needs (plus `always`)"""
+    names = [f for f in dict.fromkeys(tuple(fields) + tuple(always)) if hasattr(model, f)]
+    return query.options(load_only(*[getattr(model, f) for f in names]))
+
+
+def _keyset_filter(sort_col, id_col, cursor):
+    try:
+        sort_value, last_id = cursor['k']
+        last_id = int(last_id)
+        sort_value = datetime.fromisoformat(sort_value) if sort_value is not None else None
+    except (KeyError, TypeError, ValueError):
+        raise InvalidCursor('Invalid cursor')
+
+    # Descending order puts NULL sort values last in SQLite
+    if sort_value is None:
+        return and_(sort_col.is_(None), id_col < last_id)
+    return or_(
+        sort_col < sort_value,
+        and_(sort_col == sort_value, id_col < last_id),
+        sort_col.is_(None),
+    )
+
+
+def keyset_query(query, sort_col, id_col, cursor_token):
+    """`query` ordered newest-first by (sort_col, id_col), starting after the cursor"""
+    cursor = decode_cursor(cursor_token)
+    if cursor is not None:
+        query = query.filter(_keyset_filter(sort_col, id_col, cursor))
+    return query.order_by(sort_col.desc(), id_col.desc())
+
+
+def paginate_keyset(query, sort_col, id_col, cursor_token, limit):
+    """
+    Newest-first page of `query` ordered by (sort_col, id_col), both descending.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    rows = keyset_query(query, sort_col, id_col, cursor_token).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    sort_value = getattr(last, sort_col.key)
+    next_cursor = encode_cursor({'k': [sort_value.isoformat() if sort_value else None, getattr(last, id_col.key)]})
+    return rows, next_cursor
+
+
+def offset_from_cursor(cursor_token):
+    """Offset for ranked (non-keyset) listings such as full-text search results"""
+    cursor = decode_cursor(cursor_token)
+    if cursor is None:
+        return 0
+    try:
+        return max(0, int(cursor['o']))
+    except (KeyError, TypeError, ValueError):
+        raise InvalidCursor('Invalid cursor')
+
+
+def offset_cursor(offset):
+    return encode_cursor({'o': offset})
@@ -0,0 +1,60 @@
+import os
+
+from .base import Provider, ProviderError, ProviderRequest, ProviderUnavailable
+from .guardian import GuardianProvider
+from .limits import CircuitBreaker, RateLimiter, parse_limits
+from .newsapi import NewsAPIProvider
+from .rss import RSSProvider
+
+# ========================================
+# NEWS PROVIDER REGISTRY
+# ========================================
+#   NEWS_PROVIDERS   enabled API providers, in merge order (default newsapi,guardian)
+#   RSS_FEEDS        extra RSS/Atom feeds as name=url pairs, e.g.
+#                    bbc=https://feeds.bbci.co.uk/news/rss.xml,verge=https://www.theverge.com/rss/index.xml
+# Each provider also reads <NAME>_BASE_URL, <NAME>_RATE_LIMIT and <NAME>_BURST
+# (RSS feeds use RSS_<NAME>_...). Plugins register their class with
+# register_provider() before load_providers() runs.
+PROVIDER_CLASSES = {}
+
+
+def register_provider(cls):
+    """Make a Provider subclass selectable by name in NEWS_PROVIDERS (usable as a decorator)"""
+    PROVIDER_CLASSES[cls.name] = cls
+    return cls
+
+
+register_provider(NewsAPIProvider)
+register_provider(GuardianProvider)
+
+
+def parse_feeds(spec):
+    feeds = []
+    for part in (spec or '').split(','):
+        name, sep, url = part.strip().partition('=')
+        if sep and name.strip() and url.strip():
+            feeds.append((name.strip().lower(), url.strip()))
+    return feeds
+
+
+def load_providers(names=None, feeds=None):
+    """Ordered {name: Provider} for the enabled API providers followed by the RSS feeds"""
+    if names is None:
+        names = [n.strip().lower() for n in os.getenv('NEWS_PROVIDERS', 'newsapi,guardian').split(',') if n.strip()]
+    if feeds is None:
+        feeds = parse_feeds(os.getenv('RSS_FEEDS', ''))
+
+    providers = {}
+    for name in names:
+        if name not in PROVIDER_CLASSES:
+            raise ValueError(f'Unknown news provider {name!r} (known: {", ".join(sorted(PROVIDER_CLASSES))})')
+        providers[name] = PROVIDER_CLASSES[name]()
+    for feed_name, url in feeds:
+        provider = RSSProvider(f'rss_{feed_name}', url, source=feed_name)
+        providers[provider.name] = provider
+    return providers
+
+
+__all__ = ['Provider', 'ProviderError', 'ProviderRequest', 'ProviderUnavailable', 'NewsAPIProvider',
+           'GuardianProvider', 'RSSProvider', 'RateLimiter', 'CircuitBreaker', 'parse_limits',
+           'PROVIDER_CLASSES', 'register_provider', 'parse_feeds', 'load_providers']
@@ -0,0 +1,187 @@
+from datetime import datetime
+import json
+import logging
+import os
+
+import http_client
+from nlp import expand_search_query, expand_search_terms, rank_articles
+from telemetry import log_event, registry, span
+
+from .limits import CircuitBreaker, RateLimiter, parse_limits
+
+# ========================================
+# NEWS PROVIDER INTERFACE
+# ========================================
+# A provider turns (query, category, page_size) into one HTTP request and
+# the response body into normalized article dicts. Transport is kept out
+# of the subclasses: build_request() and parse() are pure, and fetch()
+# wires them to the pooled http_client, a rate limiter and a circuit
+# breaker. Per-provider settings come from the environment, prefixed with
+# the provider's upper-cased name, e.g. NEWSAPI_RATE_LIMIT=100/day.
+PROVIDER_TIMEOUT = float(os.getenv('PROVIDER_TIMEOUT', '10'))
+PROVIDER_BREAKER_FAILURES = int(os.getenv('PROVIDER_BREAKER_FAILURES', '5'))
+PROVIDER_BREAKER_COOLDOWN = float(os.getenv('PROVIDER_BREAKER_COOLDOWN', '30'))
+
+provider_requests = registry.counter(
+    'newsai_provider_requests_total', 'Upstream provider calls by outcome', ('provider', 'outcome'))
+
+
+class ProviderError(Exception):
+    """The provider was called and failed (network error, bad status, unparseable body)"""
+
+
+class ProviderUnavailable(ProviderError):
+    """The provider was not called: circuit open, rate limited or not configured"""
+
+
+class ProviderRequest:
+    __slots__ = ('url', 'params', 'headers')
+
+    def __init__(self, url, params=None, headers=None):
+        self.url = url
+        self.params = params or {}
+        self.headers = headers or {}
+
+
+def _env(provider_name, setting, default):
+    return os.getenv(f'{provider_name.upper()}_{setting}', default)
+
+
+class Provider:
+    """
+    Base class for news sources. Subclasses set `name`, `default_base_url`
+    and `default_rate_limit`, and implement build_request() and parse().
+    """
+    name = None
+    api_key_env = None
+    default_base_url = None
+    default_rate_limit = ''
+    default_burst = None
+    default_page_size = 20
+    requires_key = True
+
+    def __init__(self, api_key=None, base_url=None, rate_limit=None, burst=None, timeout=None,
+                 breaker_failures=None, breaker_cooldown=None):
+        if api_key is None:
+            api_key = os.getenv(self.api_key_env) if self.api_key_env else _env(self.name, 'API_KEY', '')
+        self.api_key = api_key or ''
+        self.base_url = (base_url or _env(self.name, 'BASE_URL', self.default_base_url) or '').rstrip('/')
+        burst = burst if burst is not None else _env(self.name, 'BURST', self.default_burst)
+        self.limiter = RateLimiter(
+            parse_limits(rate_limit if rate_limit is not None else _env(self.name, 'RATE_LIMIT', self.default_rate_limit)),
+            burst=float(burst) if burst else None,
+        )
+        self.breaker = CircuitBreaker(
+            breaker_failures or PROVIDER_BREAKER_FAILURES,
+            breaker_cooldown if breaker_cooldown is not None else PROVIDER_BREAKER_COOLDOWN,
+        )
+        self.timeout = timeout or PROVIDER_TIMEOUT
+
+    # ---------- implemented by each provider ----------
+
+    def build_request(self, query, category=None, page_size=None):
+        """The ProviderRequest for this search (no I/O)"""
+        raise NotImplementedError
+
+    def parse(self, body, query, category=None):
+        """Normalized article dicts from a successful response body (bytes; no I/O)"""
+        raise NotImplementedError
+
+    # ---------- shared behaviour ----------
+
+    @property
+    def configured(self):
+        return bool(self.base_url) and (bool(self.api_key) or not self.requires_key)
+
+    def article(self, title, description='', content='', url='', image_url=None, source=None,
+                author=None, category=None, tags='', published_at=None):
+        """The one article shape every provider returns"""
+        return {
+            'title': title or 'No Title',
+            'description': description or '',
+            'content': content or '',
+            'url': url or '',
+            'image_url': image_url or 'https://via.placeholder.com/400x200?text=News+Article',
+            'source': source or self.name,
+            'author': author or 'Unknown',
+            'category': category or 'General',
+            'tags': tags,
+            'published_at': published_at or datetime.utcnow().isoformat(),
+        }
+
+    def decode_json(self, body):
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise ProviderError(f'{self.name}: invalid JSON response: {e}')
+
+    def check_available(self):
+        """Raise ProviderUnavailable instead of calling an unconfigured, broken or throttled provider"""
+        if not self.configured:
+            provider_requests.inc(1, self.name, 'not_configured')
+            raise ProviderUnavailable(f'{self.name}: not configured')
+        if not self.breaker.allow():
+            provider_requests.inc(1, self.name, 'circuit_open')
+            raise ProviderUnavailable(f'{self.name}: circuit open, retry in {self.breaker.retry_after():.0f}s')
+        if not self.limiter.try_acquire():
+            # The breaker may have granted this as its half-open trial; the call was never made
+            self.breaker.release()
+            provider_requests.inc(1, self.name, 'rate_limited')
+            raise ProviderUnavailable(f'{self.name}: rate limit reached')
+
+    def fetch(self, query='news', category=None, page_size=None):
+        """
+        Search the provider and return ranked articles. Raises ProviderUnavailable
+        without any I/O when the provider cannot be called, ProviderError on failure.
+        """
+        self.check_available()
+        request = self.build_request(query, category, page_size or self.default_page_size)
+        try:
+            with span(f'upstream.{self.name}'):
+                response = http_client.get(request.url, params=request.params, headers=request.headers,
+                                           timeout=self.timeout)
+            if response.status_code != 200:
+                raise ProviderError(f'{self.name}: HTTP {response.status_code}')
+            articles = self.parse(response.content, query, category)
+        except Exception as e:
+            raise self._failed(e)
+        return self._succeeded(articles, query)
+
+    async def fetch_async(self, client, query='news', category=None, page_size=None):
+        """fetch() over an async HTTP client (httpx.AsyncClient or anything with the same get())"""
+        self.check_available()
+        request = self.build_request(query, category, page_size or self.default_page_size)
+        try:
+            with span(f'upstream.{self.name}'):
+                response = await client.get(request.url, params=request.params, headers=request.headers,
+                                            timeout=http_client.call_timeout(self.timeout))
+            if response.status_code != 200:
+                raise ProviderError(f'{self.name}: HTTP {response.status_code}')
+            articles = self.parse(response.content, query, category)
+        except Exception as e:
+            raise self._failed(e)
+        return self._succeeded(articles, query)
+
+    def _failed(self, error):
+        """Record a failed call; returns the ProviderError to raise"""
+        self.breaker.record_failure()
+        provider_requests.inc(1, self.name, 'error')
+        log_event('provider_error', logging.WARNING, provider=self.name, error=str(error),
+                  breaker=self.breaker.state)
+        if isinstance(error, ProviderError):
+            return error
+        wrapped = ProviderError(f'{self.name}: {error}')
+        wrapped.__cause__ = error
+        return wrapped
+
+    def _succeeded(self, articles, query):
+        self.breaker.record_success()
+        provider_requests.inc(1, self.name, 'ok')
+        log_event('provider_fetched', provider=self.name, query=query,
+                  expanded=expand_search_query(query), articles=len(articles))
+        with span('score'):
+            rank_articles(articles, expand_search_terms(query))
+        return articles
+
+    def stats(self):
+        return {'configured': self.configured, 'breaker': self.breaker.stats(), 'rate_limit': self.limiter.stats()}
@@ -0,0 +1,39 @@
+from nlp import expand_search_query
+
+from .base import Provider, ProviderRequest
+
+
+class GuardianProvider(Provider):
+    """content.guardianapis.com /search; developer keys allow 1 call/s and 500 a day"""
+    name = 'guardian'
+    default_base_url = 'https://content.guardianapis.com'
+    default_rate_limit = '1/s,500/day'
+    default_burst = 5
+    default_page_size = 20
+
+    def build_request(self, query, category=None, page_size=None):
+        return ProviderRequest(f'{self.base_url}/search', {
+            'api-key': self.api_key,
+            'q': expand_search_query(query),
+            'page-size': page_size or self.default_page_size,
+            'show-fields': 'thumbnail,trailText,bodyText'
+        })
+
+    def parse(self, body, query, category=None):
+        results = self.decode_json(body).get('response', {}).get('results', [])
+        articles = []
+        for item in results:
+            fields = item.get('fields') or {}
+            articles.append(self.article(
+                title=item.get('webTitle'),
+                description=fields.get('trailText'),
+                content=fields.get('bodyText'),
+                url=item.get('webUrl'),
+                image_url=fields.get('thumbnail'),
+                source='The Guardian',
+                author='Guardian Staff',
+                category=item.get('sectionName'),
+                tags=query,
+                published_at=item.get('webPublicationDate'),
+            ))
+        return articles
@@ -0,0 +1,136 @@
+import threading
+import time
+
+# ========================================
+# RATE LIMITING AND CIRCUIT BREAKING
+# ========================================
+PERIODS = {'s': 1, 'sec': 1, 'second': 1, 'm': 60, 'min': 60, 'minute': 60,
+           'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+
+def parse_limits(spec):
+    """'1/s,500/day' -> [(1.0, 1), (500.0, 86400)]; '' or 'none' -> no limit"""
+    limits = []
+    for part in (spec or '').split(','):
+        part = part.strip().lower()
+        if not part or part == 'none':
+            continue
+        count, _, period = part.partition('/')
+        try:
+            limits.append((float(count), PERIODS[period.strip() or 's']))
+        except (KeyError, ValueError):
+            raise ValueError(f'Invalid rate limit: {part!r} (expected e.g. 100/day or 1/s)')
+    return limits
+
+
+class RateLimiter:
+    """
+    One token bucket per (count, period) limit; a call is allowed only if
+    every bucket has a token, so '1/s,500/day' enforces both quotas. Each
+    bucket starts full (a burst of `count`, capped at `burst` if given).
+    """
+
+    def __init__(self, limits, burst=None):
+        self._lock = threading.Lock()
+        now = time.monotonic()
+        # [capacity, tokens, refill per second]
+        self._buckets = []
+        for count, period in limits:
+            capacity = min(count, burst) if burst else count
+            self._buckets.append([capacity, capacity, count / period])
+        self._updated = now
+        self.limited = 0
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        for bucket in self._buckets:
+            bucket[1] = min(bucket[0], bucket[1] + elapsed * bucket[2])
+
+    def try_acquire(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            if all(bucket[1] >= 1 for bucket in self._buckets):
+                for bucket in self._buckets:
+                    bucket[1] -= 1
+                return True
+            self.limited += 1
+            return False
+
+    def stats(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return {'tokens': [round(bucket[1], 2) for bucket in self._buckets], 'limited': self.limited}
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and fast-fails calls
+    for `cooldown` seconds. Then a single trial call is let through
+    (half-open): success closes the circuit, failure reopens it.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, cooldown=30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self):
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release(self):
+        """Give back a half-open trial slot that ended up not being used"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def retry_after(self):
+        """Seconds until the next trial call is allowed (0 when not open)"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(self.cooldown - (time.monotonic() - self._opened_at), 0.0)
+
+    def stats(self):
+        return {'state': self.state, 'consecutive_failures': self._failures,
+                'opened': self.opened, 'rejected': self.rejected}
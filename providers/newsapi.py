@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from nlp import expand_search_query
+
+from .base import Provider, ProviderError, ProviderRequest
+
+DEFAULT_IMAGES = {
+    'technology': 'https://images.unsplash.com/photo-1518770660439-4636190af475?w=400&h=200&fit=crop',
+    'health': 'https://images.unsplash.com/photo-1505751172876-fa1923c5c528?w=400&h=200&fit=crop',
+    'business': 'https://images.unsplash.com/photo-1486406146926-c627a92ad1ab?w=400&h=200&fit=crop',
+    'science': 'https://images.unsplash.com/photo-1532094349884-543bc11b234d?w=400&h=200&fit=crop',
+    'sports': 'https://images.unsplash.com/photo-1461896836934-ffe607ba8211?w=400&h=200&fit=crop',
+    'politics': 'https://images.unsplash.com/photo-1529107386315-e1a2ed48a620?w=400&h=200&fit=crop',
+    'entertainment': 'https://images.unsplash.com/photo-1514306191717-452ec28c7814?w=400&h=200&fit=crop',
+    'default': 'https://images.unsplash.com/photo-1504711434969-e33886168f5c?w=400&h=200&fit=crop'
+}
+
+
+class NewsAPIProvider(Provider):
+    """newsapi.org /v2/everything; the developer plan allows 100 requests a day"""
+    name = 'newsapi'
+    api_key_env = 'NEWS_API_KEY'
+    default_base_url = 'https://newsapi.org'
+    default_rate_limit = '100/day'
+    default_burst = 10
+    default_page_size = 50
+
+    def build_request(self, query, category=None, page_size=None):
+        return ProviderRequest(f'{self.base_url}/v2/everything', {
+            'apiKey': self.api_key,
+            # NLP Enhancement: search with the synonym-expanded query
+            'q': expand_search_query(query),
+            'pageSize': page_size or self.default_page_size,
+            'language': 'en',
+            'sortBy': 'publishedAt'
+        })
+
+    def parse(self, body, query, category=None):
+        data = self.decode_json(body)
+        if data.get('status') == 'error':
+            raise ProviderError(f"newsapi: {data.get('code')}: {data.get('message')}")
+
+        default_image = DEFAULT_IMAGES.get((category or 'general').lower(), DEFAULT_IMAGES['default'])
+        return [
+            self.article(
+                title=item['title'],
+                description=item.get('description'),
+                content=item.get('content'),
+                url=item.get('url'),
+                image_url=item.get('urlToImage') or default_image,
+                source=(item.get('source') or {}).get('name') or 'NewsAPI',
+                author=item.get('author'),
+                category=category,
+                tags=query,
+                published_at=item.get('publishedAt') or datetime.utcnow().isoformat(),
+            )
+            for item in data.get('articles', [])
+            if item.get('title') and item['title'] != '[Removed]'
+        ]
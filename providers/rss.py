@@ -0,0 +1,108 @@
+from email.utils import parsedate_to_datetime
+import html
+import re
+import xml.etree.ElementTree as ET
+
+from nlp import expand_search_terms, score_articles
+
+from .base import Provider, ProviderError, ProviderRequest
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+MEDIA = '{http://search.yahoo.com/mrss/}'
+DC = '{http://purl.org/dc/elements/1.1/}'
+CONTENT = '{http://purl.org/rss/1.0/modules/content/}'
+_TAGS = re.compile(r'<[^>]+>')
+# Queries that mean "anything from this feed" rather than a search
+GENERIC_QUERIES = {'', 'news'}
+
+
+def _text(element, *paths):
+    for path in paths:
+        found = element.find(path)
+        if found is not None and (found.text or '').strip():
+            return found.text.strip()
+    return ''
+
+
+def _plain(markup):
+    return html.unescape(_TAGS.sub(' ', markup or '')).strip()
+
+
+def _iso(value):
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).isoformat()
+    except (TypeError, ValueError):
+        # Atom dates are already ISO 8601
+        return value
+
+
+class RSSProvider(Provider):
+    """
+    One RSS 2.0 or Atom feed. Feeds are not searchable upstream, so the whole
+    feed is fetched and entries are kept when they match the expanded query.
+    """
+    requires_key = False
+    default_rate_limit = '60/min'
+    default_page_size = 50
+
+    def __init__(self, name, feed_url, source=None, **kwargs):
+        self.name = name
+        self.feed_url = feed_url
+        self.source = source or name
+        super().__init__(base_url=feed_url, **kwargs)
+
+    def build_request(self, query, category=None, page_size=None):
+        return ProviderRequest(self.feed_url, headers={'Accept': 'application/rss+xml, application/atom+xml, */*'})
+
+    def parse(self, body, query, category=None):
+        try:
+            root = ET.fromstring(body)
+        except ET.ParseError as e:
+            raise ProviderError(f'{self.name}: invalid feed: {e}')
+
+        if root.tag == f'{ATOM}feed':
+            articles = [self._atom_entry(entry, query, category) for entry in root.iter(f'{ATOM}entry')]
+        else:
+            articles = [self._rss_item(item, query, category) for item in root.iter('item')]
+
+        if query.strip().lower() not in GENERIC_QUERIES:
+            scores = score_articles(articles, expand_search_terms(query))
+            articles = [article for article, score in zip(articles, scores) if score > 0]
+        return articles
+
+    def _rss_item(self, item, query, category):
+        thumbnail = item.find(f'{MEDIA}thumbnail')
+        enclosure = item.find('enclosure')
+        image = (thumbnail.get('url') if thumbnail is not None else None) or \
+                (enclosure.get('url') if enclosure is not None and (enclosure.get('type') or '').startswith('image') else None)
+        return self.article(
+            title=_plain(_text(item, 'title')),
+            description=_plain(_text(item, 'description')),
+            content=_plain(_text(item, f'{CONTENT}encoded', 'description')),
+            url=_text(item, 'link', 'guid'),
+            image_url=image,
+            source=self.source,
+            author=_text(item, 'author', f'{DC}creator'),
+            category=category or _text(item, 'category'),
+            tags=query,
+            published_at=_iso(_text(item, 'pubDate', f'{DC}date')),
+        )
+
+    def _atom_entry(self, entry, query, category):
+        link = entry.find(f"{ATOM}link[@rel='alternate']")
+        if link is None:
+            link = entry.find(f'{ATOM}link')
+        category_element = entry.find(f'{ATOM}category')
+        return self.article(
+            title=_plain(_text(entry, f'{ATOM}title')),
+            description=_plain(_text(entry, f'{ATOM}summary', f'{ATOM}content')),
+            content=_plain(_text(entry, f'{ATOM}content', f'{ATOM}summary')),
+            url=link.get('href') if link is not None else '',
+            source=self.source,
+            author=_text(entry, f'{ATOM}author/{ATOM}name'),
+            category=category or (category_element.get('term') if category_element is not None else None),
+            tags=query,
+            published_at=_text(entry, f'{ATOM}published', f'{ATOM}updated') or None,
+        )
@@ -0,0 +1,128 @@
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import cache_backend
+from cache import TTLCache
+from cache_backend import CacheBackendError
+from models import Article
+from telemetry import log_event
+
+# ========================================
+# ARTICLE LISTING RESPONSE CACHE
+# ========================================
+# Article listings change only when articles are written (admin edits,
+# ingestion), so serialized listing bodies are cached under the current
+# article version and a poll for the same tab is answered without SQLite.
+# Every committed insert/update/delete of Article bumps the version, which
+# makes all older entries unreachable (they age out of the LRU).
+#
+# The version and the entries live in the cache backend: with a shared one
+# (CACHE_URL=redis://...) every worker sees every bump. With the local one
+# they are per process, and writes made by another process are picked up
+# once entries expire, so RESPONSE_CACHE_TTL bounds staleness across workers.
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '300'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+_CHANGED = 'articles_changed'
+VERSION_KEY = 'article_version'
+CHANGED_AT_KEY = 'article_changed_at'
+# Last-Modified before any change has been recorded; HTTP dates have one-second resolution
+_STARTED_AT = int(time.time())
+
+
+class CachedListing:
+    """One serialized listing page; `encoded` holds its compressed variants"""
+    __slots__ = ('body', 'etag', 'last_modified', 'next_cursor', 'encoded')
+
+    def __init__(self, body, etag, last_modified, next_cursor=None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.next_cursor = next_cursor
+        self.encoded = {}
+
+    def encode(self):
+        # The JSON body never contains a raw newline, so one separates it from the metadata
+        meta = [self.etag, self.last_modified.timestamp(), self.next_cursor]
+        return json.dumps(meta).encode() + b'\n' + self.body
+
+    @classmethod
+    def decode(cls, raw):
+        meta, body = raw.split(b'\n', 1)
+        etag, last_modified, next_cursor = json.loads(meta)
+        return cls(body, etag, datetime.fromtimestamp(last_modified, timezone.utc), next_cursor)
+
+
+listing_cache = TTLCache(ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+                         max_bytes=RESPONSE_CACHE_MAX_BYTES, sizeof=lambda entry: len(entry.body),
+                         namespace='listing', codec=(CachedListing.encode, CachedListing.decode))
+
+
+def article_version():
+    """
+    (version, last change time) of the article table. The version is None
+    when the cache backend is unreachable; listings then skip the cache.
+    """
+    try:
+        version, changed_at = cache_backend.current().get_many([VERSION_KEY, CHANGED_AT_KEY])
+    except CacheBackendError as e:
+        log_event('cache_backend_error', logging.WARNING, key=VERSION_KEY, error=str(e))
+        return None, datetime.now(timezone.utc).replace(microsecond=0)
+    changed_at = int(changed_at) if changed_at else _STARTED_AT
+    return int(version or 0), datetime.fromtimestamp(changed_at, timezone.utc)
+
+
+def bump_article_version():
+    backend = cache_backend.current()
+    try:
+        backend.set(CHANGED_AT_KEY, int(time.time()))
+        backend.incr(VERSION_KEY)
+    except CacheBackendError as e:
+        # Entries under the old version then live until RESPONSE_CACHE_TTL
+        log_event('cache_backend_error', logging.ERROR, key=VERSION_KEY, error=str(e))
+
+
+# ---------- change tracking ----------
+# Flags are collected per session and applied on commit, so a request that
+# reads between a flush and its commit cannot cache old rows under the new
+# version; rolled back changes never bump it.
+
+@event.listens_for(Session, 'after_flush')
+def _track_flush(session, flush_context):
+    if any(isinstance(obj, Article) for objs in (session.new, session.dirty, session.deleted) for obj in objs):
+        session.info[_CHANGED] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_statement(orm_execute_state):
+    # Bulk insert/update/delete statements (e.g. ingestion) bypass the flush;
+    # Core statements against the table carry no mapper
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if (mapper is not None and mapper.class_ is Article) or \
+            getattr(orm_execute_state.statement, 'table', None) is Article.__table__:
+        orm_execute_state.session.info[_CHANGED] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_on_commit(session):
+    if session.info.pop(_CHANGED, False):
+        bump_article_version()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_on_rollback(session):
+    session.info.pop(_CHANGED, None)
+
+
+def stats():
+    version, changed_at = article_version()
+    return dict(listing_cache.stats(), article_version=version, articles_changed_at=changed_at.isoformat())
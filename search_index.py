@@ -0,0 +1,129 @@
+from sqlalchemy import text
+
+# ========================================
+# FULL-TEXT SEARCH INDEX (SQLite FTS5)
+# ========================================
+# External-content FTS5 table over article(title, description, content, tags).
+# Triggers keep it in sync with every insert/update/delete on `article`, which
+# covers admin edits and bulk ingestion alike.
+FTS_TABLE = 'article_fts'
+
+# bm25 weights, in column order: title, description, content, tags
+FTS_WEIGHTS = (10.0, 4.0, 1.0, 6.0)
+
+# Terms shorter than this match whole tokens only: 'ai' must not match 'air'.
+# Synonym expansion supplies the variants of short terms instead.
+FTS_MIN_PREFIX_CHARS = 4
+
+# The prefix index serves the shortest prefix queries, the most expensive to expand
+_CREATE_TABLE = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+    title, description, content, tags,
+    content='article', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='{FTS_MIN_PREFIX_CHARS}'
+)
+"""
+
+_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""
+        CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON article BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, description, content, tags)
+            VALUES (new.id, new.title, new.description, new.content, new.tags);
+        END
+    """,
+    f'{FTS_TABLE}_ad': f"""
+        CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON article BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, content, tags)
+            VALUES ('delete', old.id, old.title, old.description, old.content, old.tags);
+        END
+    """,
+    f'{FTS_TABLE}_au': f"""
+        CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON article BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, content, tags)
+            VALUES ('delete', old.id, old.title, old.description, old.content, old.tags);
+            INSERT INTO {FTS_TABLE}(rowid, title, description, content, tags)
+            VALUES (new.id, new.title, new.description, new.content, new.tags);
+        END
+    """,
+}
+
+_available = {}
+
+
+def ensure_search_index(engine):
+    """
+    Create the FTS table and sync triggers if missing. Rebuilds the index from
+    `article` whenever the triggers had to be (re)created, e.g. after init_db.
+    Returns False when the database is not SQLite or lacks FTS5.
+    """
+    key = str(engine.url)
+    if engine.dialect.name != 'sqlite':
+        _available[key] = False
+        return False
+
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(_CREATE_TABLE))
+            existing = {row[0] for row in conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'article'"
+            ))}
+            missing = [name for name in _TRIGGERS if name not in existing]
+            for name in missing:
+                conn.execute(text(_TRIGGERS[name]))
+            if missing:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+                print(f"✅ Full-text search index rebuilt ({FTS_TABLE})")
+    except Exception as e:
+        print(f"❌ FTS5 search index unavailable, falling back to LIKE search: {str(e)}")
+        _available[key] = False
+        return False
+
+    _available[key] = True
+    return True
+
+
+def search_index_available(engine):
+    """True if the FTS table exists; checked once per engine"""
+    key = str(engine.url)
+    if key not in _available:
+        if engine.dialect.name != 'sqlite':
+            _available[key] = False
+        else:
+            with engine.connect() as conn:
+                _available[key] = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+                ), {'name': FTS_TABLE}).first() is not None
+    return _available[key]
+
+
+def build_match_query(terms):
+    """['ai', 'machine learning'] -> '"ai" OR "machine learning"*'"""
+    quoted = []
+    for term in terms:
+        term = ' '.join(str(term).split())
+        if term:
+            # The prefix applies to the last token of a phrase
+            prefix = '*' if len(term.rsplit(' ', 1)[-1]) >= FTS_MIN_PREFIX_CHARS else ''
+            quoted.append('"' + term.replace('"', '""') + '"' + prefix)
+    return ' OR '.join(quoted)
+
+
+def search_article_ids(session, terms, category=None, limit=50, offset=0):
+    """Return article ids matching any of `terms`, best bm25 rank first"""
+    match = build_match_query(terms)
+    if not match:
+        return []
+
+    weights = ', '.join(str(w) for w in FTS_WEIGHTS)
+    sql = f"""
+        SELECT a.id FROM {FTS_TABLE}
+        JOIN article a ON a.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH :match
+    """
+    params = {'match': match, 'limit': limit, 'offset': offset}
+    if category:
+        sql += " AND a.category = :category"
+        params['category'] = category
+    sql += f" ORDER BY bm25({FTS_TABLE}, {weights}), a.published_at DESC LIMIT :limit OFFSET :offset"
+
+    return [row[0] for row in session.execute(text(sql), params)]
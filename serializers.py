@@ -0,0 +1,176 @@
+from datetime import date, datetime
+import gzip
+import hashlib
+import json
+import os
+
+from flask import Response, request
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder produces the same JSON, just slower
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional: without it responses fall back to gzip
+    brotli = None
+
+# ========================================
+# ARTICLE SERIALIZATION
+# ========================================
+# One place that turns articles (ORM rows or live dicts) into JSON bytes:
+#   - ArticleView reads each projected attribute once into a slotted object
+#   - dumps() uses orjson when installed (datetimes are encoded natively),
+#     else a compact stdlib encoder with the same output
+#   - json_response() adds a weak ETag (304 on If-None-Match/If-Modified-Since) and gzip/brotli
+#     compression when the client accepts it and the body is large enough
+# ?omit_empty=true drops null/empty fields from article payloads.
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '5'))
+
+# Fields each listing returns by default; `fields=` narrows these
+ARTICLE_FIELDS = ('id', 'title', 'description', 'content', 'url', 'image_url', 'source',
+                  'author', 'category', 'tags', 'published_at')
+ADMIN_ARTICLE_FIELDS = ('id', 'title', 'description', 'content', 'category', 'tags', 'source',
+                        'author', 'image_url', 'published_at')
+# Every stored column, so an export can be imported elsewhere unchanged
+EXPORT_ARTICLE_FIELDS = ARTICLE_FIELDS + ('created_at',)
+EMPTY = (None, '', [], {})
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+if orjson is not None:
+    def dumps(obj):
+        """Compact JSON as bytes"""
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+else:
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_default)
+
+    def dumps(obj):
+        """Compact JSON as bytes"""
+        return _encoder.encode(obj).encode('utf-8')
+
+
+class ArticleView:
+    """Read-only snapshot of the projected article fields (from an ORM row or a dict)"""
+    __slots__ = ARTICLE_FIELDS + ('created_at', 'relevance_score', 'feed_score')
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_row(cls, row, fields=ARTICLE_FIELDS):
+        view = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(view, name, getattr(row, name) if name in fields else None)
+        return view
+
+    def as_dict(self, fields=ARTICLE_FIELDS, omit_empty=False):
+        if omit_empty:
+            return {name: value for name in fields
+                    for value in (getattr(self, name),) if value not in EMPTY}
+        return {name: getattr(self, name) for name in fields}
+
+
+def serialize_article(article, fields=ARTICLE_FIELDS, omit_empty=False, **extra):
+    """One article as a JSON-ready dict (datetimes are left for the encoder)"""
+    data = ArticleView.from_row(article, fields).as_dict(fields, omit_empty)
+    if extra:
+        data.update(extra)
+    return data
+
+
+def compact(item):
+    """A dict without null/empty values (for live articles, which are dicts already)"""
+    return {key: value for key, value in item.items() if value not in EMPTY}
+
+
+def omit_empty_requested():
+    return request.args.get('omit_empty', 'false').lower() == 'true'
+
+
+def etag_for(body):
+    """Content hash used as a weak ETag (weak, because gzip/br/identity bodies share it)"""
+    return hashlib.blake2b(body, digest_size=12).hexdigest()
+
+
+def _quality(params):
+    """q value of one Accept-Encoding entry; malformed values count as refused"""
+    for param in params:
+        name, _, value = param.partition('=')
+        if name.strip().lower() == 'q':
+            try:
+                return float(value.strip())
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def _encoding(accept_encoding):
+    accepted = set()
+    for part in accept_encoding.split(','):
+        coding, *params = part.split(';')
+        # q=0, q=0.0, q=0.000 all mean "not acceptable"
+        if _quality(params) > 0:
+            accepted.add(coding.strip().lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _not_modified(etag, last_modified):
+    """Whether the request's validators match (If-None-Match wins over If-Modified-Since)"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    return last_modified is not None and since is not None and last_modified <= since
+
+
+def json_response(payload, status=200, headers=None, etag=None, last_modified=None, encoded=None):
+    """
+    JSON response for `payload` with an ETag (and Last-Modified, if given);
+    answers 304 when the client's validators already match, and compresses
+    large bodies. Callers that cache a body pass its `etag` and an `encoded`
+    dict, which keeps compressed variants so they are built only once.
+    """
+    body = payload if isinstance(payload, bytes) else dumps(payload)
+    etag = etag or etag_for(body)
+
+    if status == 200 and _not_modified(etag, last_modified):
+        response = Response(status=304, headers=headers)
+    else:
+        response = Response(body, status=status, mimetype='application/json', headers=headers)
+        response.headers['Vary'] = 'Accept-Encoding'
+        encoding = _encoding(request.headers.get('Accept-Encoding', '')) if len(body) >= COMPRESS_MIN_BYTES else None
+        if encoding:
+            if encoded is None:
+                data = compress(body, encoding)
+            else:
+                data = encoded.get(encoding)
+                if data is None:
+                    data = encoded[encoding] = compress(body, encoding)
+            response.set_data(data)
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Per-user data: browsers may keep it but must revalidate; shared caches must not
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
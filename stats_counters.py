@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+# ========================================
+# INCREMENTAL STATS COUNTERS
+# ========================================
+# SQLite triggers keep running totals in `stat_counter` and hourly buckets in
+# `stat_bucket`, so the admin dashboard reads a handful of rows instead of
+# running COUNT(*) over every table. Triggers fire for ORM writes, bulk
+# inserts and the write-behind flusher alike.
+STATS_RATE_HOURS = 24
+
+_TABLES = [
+    """CREATE TABLE IF NOT EXISTS stat_counter (
+        name VARCHAR(200) PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS stat_bucket (
+        series VARCHAR(50) NOT NULL,
+        bucket VARCHAR(20) NOT NULL,
+        value INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (series, bucket)
+    ) WITHOUT ROWID""",
+]
+
+
+def _bump(name_sql, delta):
+    return (f"INSERT INTO stat_counter (name, value) VALUES ({name_sql}, {delta}) "
+            f"ON CONFLICT(name) DO UPDATE SET value = value + {delta};")
+
+
+def _bump_bucket(series, ts_sql):
+    return (f"INSERT INTO stat_bucket (series, bucket, value) "
+            f"VALUES ('{series}', strftime('%Y-%m-%dT%H:00', coalesce({ts_sql}, 'now')), 1) "
+            f"ON CONFLICT(series, bucket) DO UPDATE SET value = value + 1;")
+
+
+_TRIGGERS = {
+    'stat_user_ai': f"AFTER INSERT ON user BEGIN {_bump(repr('users'), 1)} END",
+    'stat_user_ad': f"AFTER DELETE ON user BEGIN {_bump(repr('users'), -1)} END",
+    'stat_article_ai': f"""AFTER INSERT ON article BEGIN
+        {_bump(repr('articles'), 1)}
+        {_bump("'articles.category.' || coalesce(new.category, '')", 1)}
+    END""",
+    'stat_article_ad': f"""AFTER DELETE ON article BEGIN
+        {_bump(repr('articles'), -1)}
+        {_bump("'articles.category.' || coalesce(old.category, '')", -1)}
+    END""",
+    'stat_article_au': f"""AFTER UPDATE OF category ON article
+        WHEN coalesce(old.category, '') != coalesce(new.category, '') BEGIN
+        {_bump("'articles.category.' || coalesce(old.category, '')", -1)}
+        {_bump("'articles.category.' || coalesce(new.category, '')", 1)}
+    END""",
+    'stat_reads_ai': f"""AFTER INSERT ON reading_history BEGIN
+        {_bump(repr('reads'), 1)}
+        {_bump_bucket('reads', 'new.read_at')}
+    END""",
+    'stat_reads_ad': f"AFTER DELETE ON reading_history BEGIN {_bump(repr('reads'), -1)} END",
+    'stat_interactions_ai': f"""AFTER INSERT ON user_interactions BEGIN
+        {_bump(repr('interactions'), 1)}
+        {_bump("'interactions.type.' || coalesce(new.interaction_type, '')", 1)}
+        {_bump_bucket('interactions', 'new.created_at')}
+    END""",
+    'stat_interactions_ad': f"""AFTER DELETE ON user_interactions BEGIN
+        {_bump(repr('interactions'), -1)}
+        {_bump("'interactions.type.' || coalesce(old.interaction_type, '')", -1)}
+    END""",
+}
+
+# Recomputes every counter from the base tables; only run when triggers are (re)created
+_BACKFILL = [
+    "DELETE FROM stat_counter",
+    "DELETE FROM stat_bucket",
+    "INSERT INTO stat_counter (name, value) SELECT 'users', COUNT(*) FROM user",
+    "INSERT INTO stat_counter (name, value) SELECT 'articles', COUNT(*) FROM article",
+    "INSERT INTO stat_counter (name, value) SELECT 'reads', COUNT(*) FROM reading_history",
+    "INSERT INTO stat_counter (name, value) SELECT 'interactions', COUNT(*) FROM user_interactions",
+    """INSERT INTO stat_counter (name, value)
+       SELECT 'articles.category.' || coalesce(category, ''), COUNT(*) FROM article
+       GROUP BY coalesce(category, '')""",
+    """INSERT INTO stat_counter (name, value)
+       SELECT 'interactions.type.' || coalesce(interaction_type, ''), COUNT(*) FROM user_interactions
+       GROUP BY coalesce(interaction_type, '')""",
+    """INSERT INTO stat_bucket (series, bucket, value)
+       SELECT 'reads', strftime('%Y-%m-%dT%H:00', coalesce(read_at, 'now')) AS b, COUNT(*)
+       FROM reading_history GROUP BY b""",
+    """INSERT INTO stat_bucket (series, bucket, value)
+       SELECT 'interactions', strftime('%Y-%m-%dT%H:00', coalesce(created_at, 'now')) AS b, COUNT(*)
+       FROM user_interactions GROUP BY b""",
+]
+
+_available = {}
+
+
+def ensure_stats_counters(engine):
+    """
+    Create the counter tables and triggers if missing, backfilling the counters
+    whenever any trigger had to be (re)created. Returns False if not on SQLite.
+    """
+    key = str(engine.url)
+    if engine.dialect.name != 'sqlite':
+        _available[key] = False
+        return False
+
+    with engine.begin() as conn:
+        for ddl in _TABLES:
+            conn.execute(text(ddl))
+        existing = {row[0] for row in conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'stat_%'"
+        ))}
+        missing = [name for name in _TRIGGERS if name not in existing]
+        for name in missing:
+            conn.execute(text(f"CREATE TRIGGER {name} {_TRIGGERS[name]}"))
+        if missing:
+            for statement in _BACKFILL:
+                conn.execute(text(statement))
+            print("✅ Stats counters backfilled")
+
+    _available[key] = True
+    return True
+
+
+def stats_counters_available(engine):
+    key = str(engine.url)
+    if key not in _available:
+        if engine.dialect.name != 'sqlite':
+            _available[key] = False
+        else:
+            with engine.connect() as conn:
+                _available[key] = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'stat_interactions_ai'"
+                )).first() is not None
+    return _available[key]
+
+
+def read_stats(session, hours=STATS_RATE_HOURS):
+    """Totals, per-category / per-type breakdowns and hourly rates for the last `hours`"""
+    counters = dict(session.execute(text("SELECT name, value FROM stat_counter")).all())
+
+    def breakdown(prefix):
+        return {name[len(prefix):] or 'Unknown': value
+                for name, value in counters.items() if name.startswith(prefix) and value}
+
+    since = (datetime.utcnow() - timedelta(hours=hours - 1)).strftime('%Y-%m-%dT%H:00')
+    hourly = {'interactions': {}, 'reads': {}}
+    for series, bucket, value in session.execute(text(
+        "SELECT series, bucket, value FROM stat_bucket "
+        "WHERE series IN ('interactions', 'reads') AND bucket >= :since ORDER BY bucket"
+    ), {'since': since}):
+        hourly[series][bucket] = value
+
+    current_hour = datetime.utcnow().strftime('%Y-%m-%dT%H:00')
+    return {
+        'total_users': counters.get('users', 0),
+        'total_articles': counters.get('articles', 0),
+        'total_reads': counters.get('reads', 0),
+        'total_interactions': counters.get('interactions', 0),
+        'articles_by_category': breakdown('articles.category.'),
+        'interactions_by_type': breakdown('interactions.type.'),
+        'hourly': hourly,
+        'rates': {
+            'interactions_last_hour': hourly['interactions'].get(current_hour, 0),
+            'reads_last_hour': hourly['reads'].get(current_hour, 0),
+            f'interactions_per_hour_{hours}h': round(sum(hourly['interactions'].values()) / hours, 2),
+            f'reads_per_hour_{hours}h': round(sum(hourly['reads'].values()) / hours, 2),
+        },
+    }
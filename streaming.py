@@ -0,0 +1,62 @@
+import os
+
+from flask import Response, stream_with_context
+
+from serializers import dumps
+
+# ========================================
+# STREAMING JSON RESPONSES
+# ========================================
+STREAM_BATCH_ROWS = int(os.getenv('STREAM_BATCH_ROWS', '500'))
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def iter_json_array(rows, serialize):
+    """
+    Encode `rows` as one JSON array, element by element, yielding ~64KB chunks.
+    Only one chunk of encoded output is held in memory at a time.
+    """
+    buffer = [b'[']
+    size = 1
+    first = True
+    for row in rows:
+        item = dumps(serialize(row))
+        if not first:
+            item = b',' + item
+        first = False
+        buffer.append(item)
+        size += len(item)
+        if size >= STREAM_CHUNK_BYTES:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    buffer.append(b']')
+    yield b''.join(buffer)
+
+
+def iter_ndjson(rows, serialize):
+    """Encode `rows` as newline-delimited JSON, one object per line, in ~64KB chunks"""
+    buffer = []
+    size = 0
+    for row in rows:
+        item = dumps(serialize(row)) + b'\n'
+        buffer.append(item)
+        size += len(item)
+        if size >= STREAM_CHUNK_BYTES:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def stream_query(query, serialize, batch_rows=None, headers=None, ndjson=False):
+    """
+    Flask response that streams an ORM query as a JSON array (or NDJSON). Rows
+    are fetched `batch_rows` at a time from a server-side cursor (yield_per), so
+    memory stays flat no matter how many rows match.
+    """
+    rows = query.yield_per(batch_rows or STREAM_BATCH_ROWS)
+    if ndjson:
+        return Response(stream_with_context(iter_ndjson(rows, serialize)),
+                        mimetype='application/x-ndjson', headers=headers)
+    return Response(stream_with_context(iter_json_array(rows, serialize)),
+                    mimetype='application/json', headers=headers)
@@ -0,0 +1,357 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+import atexit
+import contextvars
+from datetime import datetime, timezone
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+
+from flask import Response, g, request
+
+# ========================================
+# REQUEST TIMING AND INSTRUMENTATION
+# ========================================
+# Spans time the phases of a request (auth, db, upstream.<provider>, score,
+# serialize, ...). Every span feeds a latency histogram; spans inside a
+# request are also collected on its trace, returned in a Server-Timing
+# header and attached to the request's log line. /metrics exposes the
+# histograms in Prometheus text format.
+#
+# Logging is structured (one JSON object per line) and sampled per request:
+# either every line of a request is kept or none are, while warnings, errors
+# and slow requests are always logged. Once the app is set up, lines go
+# through a queue, so the request thread never blocks on stdout.
+#   LOG_LEVEL            minimum level (default INFO)
+#   LOG_SAMPLE_RATE      fraction of requests whose info lines are kept (default 0.1)
+#   LOG_SLOW_REQUEST_MS  requests slower than this are always logged (default 1000)
+#   METRICS_TOKEN        if set, /metrics requires "Authorization: Bearer <token>"
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', '0.1'))
+LOG_SLOW_REQUEST_MS = float(os.getenv('LOG_SLOW_REQUEST_MS', '1000'))
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+# ---------- metrics ----------
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f'{self.name}{_labels(self.labels, label_values)} {_number(value)}')
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; buckets are stored per bucket and made cumulative on render"""
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # [per-bucket counts (+Inf last), sum, count]
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        for label_values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + ('+Inf',), counts):
+                cumulative += n
+                le = 'le="+Inf"' if bound == '+Inf' else f'le="{bound}"'
+                lines.append(f'{self.name}_bucket{_labels(self.labels, label_values, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labels, label_values)} {_number(total)}')
+            lines.append(f'{self.name}_count{_labels(self.labels, label_values)} {count}')
+        return lines
+
+
+class Gauge:
+    """Read at scrape time from `read()`, which returns a number"""
+
+    def __init__(self, name, help, read):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def render(self):
+        try:
+            value = self.read()
+        except Exception:
+            return []
+        return [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} gauge', f'{self.name} {_number(value)}']
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help, labels=()):
+        return self._register(Counter(name, help, labels))
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def gauge(self, name, help, read):
+        return self._register(Gauge(name, help, read))
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+request_seconds = registry.histogram(
+    'newsai_request_duration_seconds', 'HTTP request latency', ('method', 'endpoint', 'status'))
+span_seconds = registry.histogram(
+    'newsai_span_duration_seconds', 'Time spent in one phase of a request', ('span',))
+log_lines_dropped = registry.counter(
+    'newsai_log_lines_dropped_total', 'Log lines dropped because the log queue was full')
+
+
+# ---------- traces and spans ----------
+
+class Trace:
+    """Spans recorded while serving one request"""
+    __slots__ = ('id', 'sampled', 'spans')
+
+    def __init__(self, sampled):
+        self.id = uuid.uuid4().hex[:16]
+        self.sampled = sampled
+        self.spans = []
+
+
+_current = contextvars.ContextVar('newsai_trace', default=None)
+
+
+def current_trace():
+    return _current.get()
+
+
+def record_span(name, seconds):
+    span_seconds.observe(seconds, name)
+    trace = _current.get()
+    if trace is not None:
+        trace.spans.append((name, seconds))
+
+
+@contextmanager
+def span(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - started)
+
+
+def propagate(fn):
+    """Wrap `fn` so it runs with the caller's trace when handed to another thread"""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
+
+
+# ---------- structured logging ----------
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'event': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_lines_dropped.inc()
+
+
+_stdout = logging.StreamHandler(sys.stdout)
+_stdout.setFormatter(JsonFormatter())
+_listener_lock = threading.Lock()
+# pid of the process whose listener thread is running, if any
+_listener_pid = None
+
+
+def _configure_logger():
+    logger = logging.getLogger('newsai')
+    if logger.handlers:
+        return logger
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    # Lines are written synchronously until start_log_listener() runs (scripts, CLI)
+    logger.addHandler(_stdout)
+    return logger
+
+
+logger = _configure_logger()
+
+
+def start_log_listener():
+    """
+    Move log output onto a background thread for this process. Called from
+    init_app() and at the start of each request, so a worker forked from a
+    preloaded master starts its own listener instead of queueing into the
+    master's.
+    """
+    global _listener_pid
+    if _listener_pid == os.getpid():
+        return
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+        records = queue.Queue(maxsize=10000)
+        listener = logging.handlers.QueueListener(records, _stdout)
+        listener.start()
+        logger.handlers = [_DroppingQueueHandler(records)]
+        atexit.register(listener.stop)
+        _listener_pid = os.getpid()
+
+
+def _after_fork():
+    # The listener thread does not survive fork(); write synchronously until restarted
+    logger.handlers = [_stdout]
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def log_event(event, level=logging.INFO, force=False, **fields):
+    """
+    Log one structured event. Below WARNING it is only written if the current
+    request was sampled (or, outside a request, with probability LOG_SAMPLE_RATE).
+    """
+    if not logger.isEnabledFor(level):
+        return
+    trace = _current.get()
+    if level < logging.WARNING and not force:
+        sampled = trace.sampled if trace is not None else random.random() < LOG_SAMPLE_RATE
+        if not sampled:
+            return
+    if trace is not None:
+        fields['trace_id'] = trace.id
+    logger.log(level, event, extra={'fields': fields})
+
+
+# ---------- Flask integration ----------
+
+def _server_timing(spans):
+    totals = {}
+    for name, seconds in spans:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ', '.join(f'{name.replace(".", "-")};dur={seconds * 1000:.1f}' for name, seconds in totals.items())
+
+
+def init_app(app):
+    """Start a trace per request and record its latency, Server-Timing header and log line"""
+    start_log_listener()
+
+    @app.before_request
+    def start_trace():
+        start_log_listener()
+        g.trace_started = time.perf_counter()
+        g.trace_token = _current.set(Trace(random.random() < LOG_SAMPLE_RATE))
+
+    @app.after_request
+    def finish_trace(response):
+        trace = _current.get()
+        started = g.pop('trace_started', None)
+        if trace is None or started is None:
+            return response
+
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or 'unmatched'
+        request_seconds.observe(elapsed, request.method, endpoint, str(response.status_code))
+        if trace.spans:
+            response.headers['Server-Timing'] = _server_timing(trace.spans)
+
+        slow = elapsed * 1000 >= LOG_SLOW_REQUEST_MS
+        log_event('request', logging.WARNING if response.status_code >= 500 else logging.INFO, force=slow,
+                  method=request.method, path=request.path, endpoint=endpoint,
+                  status=response.status_code, ms=round(elapsed * 1000, 2),
+                  spans={name: round(seconds * 1000, 2) for name, seconds in trace.spans})
+        return response
+
+    @app.teardown_request
+    def end_trace(exc):
+        token = g.pop('trace_token', None)
+        if token is not None:
+            try:
+                _current.reset(token)
+            except ValueError:
+                _current.set(None)
+
+
+def metrics_response():
+    """The Prometheus scrape body as a Flask response (401 if METRICS_TOKEN does not match)"""
+    if METRICS_TOKEN and request.headers.get('Authorization') != f'Bearer {METRICS_TOKEN}':
+        return Response('unauthorized\n', status=401, mimetype='text/plain')
+    return Response(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,68 @@
+import hashlib
+import os
+import sys
+
+import pytest
+
+# The app's modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set before load_dotenv() runs, which never overrides: no request logs, and
+# no real provider keys from .env, so nothing reaches the network
+os.environ.setdefault('LOG_SAMPLE_RATE', '0')
+os.environ.setdefault('SECRET_KEY', 'test-secret')
+os.environ['NEWS_API_KEY'] = ''
+os.environ['GUARDIAN_API_KEY'] = ''
+
+ADMIN_EMAIL = 'admin@test'
+ADMIN_PASSWORD = 'secret'
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """
+    Factory for apps on a fresh SQLite database under tmp_path, with the schema
+    migrated and one user (ADMIN_EMAIL, admin role by default). Apps given the
+    same `database` share it, like workers of one deployment.
+    """
+    from app import create_app, services
+    from migrations import upgrade
+    from models import db, User
+
+    apps = []
+
+    def make(database='news.db', role='admin', config=None):
+        monkeypatch.setenv('DATABASE_URL', f'sqlite:///{tmp_path / database}')
+        app = create_app(config)
+        with app.app_context():
+            db.create_all()
+            upgrade(db.engine)
+            if User.query.filter_by(email=ADMIN_EMAIL).first() is None:
+                db.session.add(User(email=ADMIN_EMAIL, password=hashlib.sha256(ADMIN_PASSWORD.encode()).hexdigest(),
+                                    name='Admin', role=role))
+                db.session.commit()
+        apps.append(app)
+        return app
+
+    yield make
+    for app in apps:
+        services(app).interaction_buffer.stop(timeout=1)
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+@pytest.fixture
+def client(make_app):
+    return make_app().test_client()
+
+
+def login(client, email=ADMIN_EMAIL, password=ADMIN_PASSWORD):
+    """Authorization headers for a user of the client's app"""
+    response = client.post('/api/login', json={'email': email, 'password': password})
+    return {'Authorization': 'Bearer ' + response.json['token']}
+
+
+@pytest.fixture
+def auth(client):
+    return login(client)
@@ -0,0 +1,62 @@
+from app import services
+from conftest import login
+from models import db, Article, UserInteractions
+
+
+def _count(app, model):
+    with app.app_context():
+        return db.session.query(model).count()
+
+
+def test_apps_keep_their_own_workers(make_app):
+    first, second = make_app('first.db'), make_app('second.db')
+    assert services(first) is not services(second)
+    assert services(first).interaction_buffer.app is first
+    assert services(second).ingestion_worker.app is second
+
+
+def test_interactions_are_written_to_the_app_that_took_the_request(make_app):
+    first, second = make_app('first.db'), make_app('second.db')
+    client = first.test_client()
+    response = client.post('/api/interactions', json={'article_id': 1, 'type': 'like'}, headers=login(client))
+    assert response.status_code == 200
+
+    services(first).interaction_buffer.drain()
+    services(second).interaction_buffer.drain()
+    assert _count(first, UserInteractions) == 1
+    assert _count(second, UserInteractions) == 0
+
+
+def test_listings_are_not_shared_between_databases(make_app):
+    first, second = make_app('first.db'), make_app('second.db')
+    first_client, second_client = first.test_client(), second.test_client()
+    first_auth, second_auth = login(first_client), login(second_client)
+
+    # Cache an empty listing in the second app, then write to the first
+    assert second_client.get('/api/articles', headers=second_auth).json == []
+    response = first_client.post('/api/admin/articles', json={'title': 'Only in first'}, headers=first_auth)
+    assert response.status_code == 201
+
+    assert [a['title'] for a in first_client.get('/api/articles', headers=first_auth).json] == ['Only in first']
+    assert second_client.get('/api/articles', headers=second_auth).json == []
+    assert _count(second, Article) == 0
+
+
+def test_cached_principals_are_scoped_to_their_database(make_app):
+    # Same user id in both databases: an admin in the first, a plain user in the second
+    first, second = make_app('first.db'), make_app('second.db', role='user')
+    first_client, second_client = first.test_client(), second.test_client()
+    headers = login(first_client)
+
+    assert first_client.get('/api/admin/users', headers=headers).status_code == 200
+    assert second_client.get('/api/admin/users', headers=headers).status_code == 403
+
+
+def test_tokens_are_only_trusted_by_apps_with_the_same_secret(make_app):
+    first = make_app('first.db', config={'SECRET_KEY': 'first-secret'})
+    second = make_app('second.db', config={'SECRET_KEY': 'second-secret'})
+    first_client = first.test_client()
+    headers = login(first_client)
+
+    assert first_client.get('/api/admin/users', headers=headers).status_code == 200
+    assert second.test_client().get('/api/admin/users', headers=headers).status_code == 401
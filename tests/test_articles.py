@@ -0,0 +1,88 @@
+from datetime import datetime
+import json
+
+import pytest
+
+from pagination import encode_cursor
+
+
+
+@pytest.fixture
+def articles(client, auth):
+    for i in range(5):
+        response = client.post('/api/admin/articles', headers=auth,
+                               json={'title': f'Article {i}', 'category': 'Science' if i % 2 else 'Business'})
+        assert response.status_code == 201
+    return client
+
+
+def test_stream_lists_every_article(articles, auth):
+    response = articles.get('/api/articles?stream=true', headers=auth)
+    assert response.status_code == 200
+    assert len(json.loads(response.get_data())) == 5
+
+
+def test_stream_with_search_is_rejected(articles, auth):
+    response = articles.get('/api/articles?stream=true&search=article', headers=auth)
+    assert response.status_code == 400
+    assert 'search' in response.json['message']
+
+
+def _pages(client, auth, path):
+    """Every page of a cursor-paginated listing, following X-Next-Cursor"""
+    pages, cursor = [], None
+    while True:
+        response = client.get(path + (f'&cursor={cursor}' if cursor else ''), headers=auth)
+        assert response.status_code == 200
+        pages.append(response.json)
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            return pages
+
+
+@pytest.fixture
+def same_time_articles(client):
+    from models import db, Article
+
+    # Equal sort keys, so pages are told apart by the id tie-breaker only
+    published = datetime(2024, 5, 1, 12, 0)
+    with client.application.app_context():
+        db.session.add_all(Article(title=f'Tied {i}', url=f'https://example.com/{i}', category='Science',
+                                   published_at=published, created_at=published) for i in range(7))
+        db.session.commit()
+    return client
+
+
+@pytest.mark.parametrize('path', ['/api/articles?limit=3', '/api/admin/articles?limit=3'])
+def test_cursor_pages_cover_every_article_once(same_time_articles, auth, path):
+    pages = _pages(same_time_articles, auth, path)
+    ids = [article['id'] for page in pages for article in page]
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert ids == sorted(ids, reverse=True)
+    assert len(set(ids)) == 7
+
+
+def test_search_pages_follow_rank_order(same_time_articles, auth):
+    pages = _pages(same_time_articles, auth, '/api/articles?search=tied&limit=4')
+    assert [len(page) for page in pages] == [4, 3]
+    assert len({article['id'] for page in pages for article in page}) == 7
+
+
+@pytest.mark.parametrize('cursor', [
+    'not a cursor',
+    encode_cursor(['k']),
+    encode_cursor({'k': ['yesterday', 1]}),
+    encode_cursor({'k': ['2024-05-01T12:00:00', 'one']}),
+])
+@pytest.mark.parametrize('path', ['/api/articles', '/api/admin/articles', '/api/articles?stream=true'])
+def test_bad_cursor_is_a_400(client, auth, path, cursor):
+    separator = '&' if '?' in path else '?'
+    response = client.get(f'{path}{separator}cursor={cursor}', headers=auth)
+    assert response.status_code == 400
+    assert response.json['message'] == 'Invalid cursor'
+
+
+def test_bad_search_cursor_is_a_400(client, auth):
+    response = client.get(f"/api/articles?search=tied&cursor={encode_cursor({'o': 'ten'})}", headers=auth)
+    assert response.status_code == 400
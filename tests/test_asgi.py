@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import pytest
+
+from conftest import login
+from models import db, UserInteractions
+
+
+@pytest.fixture
+def served(make_app, monkeypatch):
+    import asgi
+
+    app = make_app()
+    monkeypatch.setattr(asgi, '_flask_app', app)
+    return asgi, app
+
+
+async def _call(asgi_app, scope, messages):
+    """Run one ASGI call; `messages` is a queue of what the server receives"""
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi_app(scope, messages.get, send)
+    return sent
+
+
+def _queue(*messages):
+    queue = asyncio.Queue()
+    for message in messages:
+        queue.put_nowait(message)
+    return queue
+
+
+def test_importing_builds_no_app():
+    import asgi
+    assert asgi._flask_app is None
+
+
+def test_shutdown_writes_queued_interactions(served):
+    asgi, app = served
+    headers = login(app.test_client())
+    scope = {'type': 'http', 'method': 'POST', 'path': '/api/interactions', 'query_string': b'',
+             'headers': [(b'authorization', headers['Authorization'].encode()),
+                         (b'content-type', b'application/json')]}
+    body = json.dumps({'article_id': 1, 'type': 'like'}).encode()
+
+    async def run():
+        lifespan = _queue({'type': 'lifespan.startup'})
+        server = asyncio.ensure_future(_call(asgi.app, {'type': 'lifespan'}, lifespan))
+        sent = await _call(asgi.app, scope, _queue({'type': 'http.request', 'body': body, 'more_body': False}))
+        assert sent[0]['status'] == 200
+        lifespan.put_nowait({'type': 'lifespan.shutdown'})
+        return await server
+
+    sent = asyncio.run(run())
+    assert [message['type'] for message in sent] == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+    with app.app_context():
+        assert db.session.query(UserInteractions).count() == 1
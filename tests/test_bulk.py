@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from conftest import login
+
+
+def _ndjson(*records):
+    return b''.join((r if isinstance(r, bytes) else json.dumps(r).encode()) + b'\n' for r in records)
+
+
+def _import(client, auth, body, **params):
+    response = client.post('/api/admin/articles/bulk', data=body, headers=auth, query_string=params,
+                           content_type='application/x-ndjson')
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.get_data().splitlines()]
+
+
+def _export(client, auth, **params):
+    response = client.get('/api/admin/articles/bulk', headers=auth, query_string=params)
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.get_data().splitlines()]
+
+
+def _article(i, **fields):
+    return dict({'title': f'Article {i}', 'url': f'https://example.com/{i}', 'category': 'Science',
+                 'published_at': f'2024-05-0{i % 9 + 1}T12:00:00'}, **fields)
+
+
+def test_invalid_lines_are_reported_and_the_rest_imported(client, auth):
+    summary = _import(client, auth, _ndjson(
+        _article(1),
+        {'url': 'https://example.com/untitled'},
+        _article(2, source=42),
+        b'{not json',
+        _article(3, published_at='last tuesday'),
+        ['not', 'an', 'object'],
+        _article(4),
+    ))[-1]
+
+    assert summary['done'] is True
+    assert (summary['lines'], summary['inserted'], summary['invalid']) == (7, 2, 5)
+    assert [error['line'] for error in summary['errors']] == [2, 3, 4, 5, 6]
+    assert summary['errors'][0]['error'] == 'title is required'
+    assert summary['errors'][1]['error'] == 'source must be a string'
+
+
+def test_duplicates_are_skipped_within_and_across_imports(client, auth):
+    first = _import(client, auth, _ndjson(_article(1), _article(2), _article(1, title='Same URL again')))[-1]
+    assert (first['inserted'], first['skipped']) == (2, 1)
+
+    second = _import(client, auth, _ndjson(_article(2), _article(3),
+                                           _article(9, url='http://www.example.com/1?utm_source=feed')))[-1]
+    assert (second['inserted'], second['skipped']) == (1, 2)
+    assert len(_export(client, auth)) == 3
+
+
+def test_progress_is_reported_per_batch(client, auth):
+    lines = _import(client, auth, _ndjson(*(_article(i) for i in range(5))), batch_size=2)
+    # One line per full batch; the last, partial one is in the summary
+    assert [line['inserted'] for line in lines] == [2, 4, 5]
+    assert [line['done'] for line in lines] == [False, False, True]
+
+
+def test_export_then_import_into_another_database(make_app):
+    source = make_app('source.db').test_client()
+    source_auth = login(source)
+    _import(source, source_auth, _ndjson(*(_article(i, tags='lab,study', author='Ada') for i in range(6))))
+    exported = _export(source, source_auth)
+
+    target = make_app('target.db').test_client()
+    target_auth = login(target)
+    summary = _import(target, target_auth, _ndjson(*exported))[-1]
+    assert (summary['inserted'], summary['invalid']) == (6, 0)
+
+    def without_ids(records):
+        return sorted((dict(r, id=None) for r in records), key=lambda r: r['url'])
+    assert without_ids(_export(target, target_auth)) == without_ids(exported)
+
+
+def test_export_resumes_after_an_id(client, auth):
+    _import(client, auth, _ndjson(*(_article(i) for i in range(5))))
+    everything = _export(client, auth)
+    rest = _export(client, auth, after_id=everything[1]['id'])
+    assert rest == everything[2:]
+
+
+def test_bulk_requires_an_admin(make_app):
+    client = make_app(role='user').test_client()
+    auth = login(client)
+    assert client.get('/api/admin/articles/bulk', headers=auth).status_code == 403
+    assert client.post('/api/admin/articles/bulk', data=_ndjson(_article(1)), headers=auth).status_code == 403
+
+
+@pytest.mark.parametrize('query', ['after_id=first', 'batch_size=many'])
+def test_bad_parameters_are_a_400(client, auth, query):
+    method = client.get if query.startswith('after_id') else client.post
+    assert method(f'/api/admin/articles/bulk?{query}', headers=auth).status_code == 400
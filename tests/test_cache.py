@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+from cache import TTLCache
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache(ttl=60)
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('key', loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ['value'] * 8
+    assert len(calls) == 1
+
+
+def test_load_errors_reach_every_waiter_and_are_not_cached():
+    cache = TTLCache(ttl=60)
+
+    def failing():
+        raise RuntimeError('upstream down')
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load('key', failing)
+    assert cache.get_or_load('key', lambda: 'recovered') == 'recovered'
+
+
+def test_stale_entries_are_served_while_one_refresh_runs():
+    cache = TTLCache(ttl=0.05, stale_ttl=60)
+    cache.set('key', 'old')
+    time.sleep(0.1)
+    refreshed = threading.Event()
+
+    def loader():
+        refreshed.wait(5)
+        return 'new'
+
+    assert cache.get('key') is None  # get() never returns stale entries
+    assert cache.get_or_load('key', loader) == 'old'
+    assert cache.get_or_load('key', loader) == 'old'
+    refreshed.set()
+    for _ in range(100):
+        if cache.get('key') == 'new':
+            break
+        time.sleep(0.01)
+
+    assert cache.get('key') == 'new'
+    assert cache.stats()['stale_hits'] == 2
+    assert cache.stats()['refreshes'] == 1
+
+
+def test_entries_past_the_stale_window_are_reloaded():
+    cache = TTLCache(ttl=0.05, stale_ttl=0.05)
+    cache.set('key', 'old')
+    time.sleep(0.15)
+    assert cache.get_or_load('key', lambda: 'new') == 'new'
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the oldest
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_byte_budget_evicts_oldest_and_skips_oversized_values():
+    cache = TTLCache(ttl=60, max_entries=100, max_bytes=10, sizeof=len)
+    cache.set('a', 'x' * 4)
+    cache.set('b', 'x' * 4)
+    cache.set('c', 'x' * 4)
+    assert cache.get('a') is None
+    assert cache.stats()['bytes'] == 8
+
+    cache.set('huge', 'x' * 11)
+    assert cache.get('huge') is None
+    assert len(cache) == 2
+
+
+def test_should_cache_rejects_results_without_storing_them():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_load('key', loader, should_cache=lambda value: value is not None) is None
+    assert cache.get_or_load('key', loader, should_cache=lambda value: value is not None) is None
+    assert len(calls) == 2
+    assert len(cache) == 0
@@ -0,0 +1,207 @@
+import time
+
+import pytest
+
+from bench.stub_cache import start_stub_cache
+import cache_backend
+from conftest import ADMIN_EMAIL, login
+from cache import TTLCache
+from cache_backend import CacheBackendError, RedisBackend
+
+
+@pytest.fixture(scope='module')
+def stub():
+    server = start_stub_cache()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def backend(stub):
+    with stub.store.lock:
+        stub.store.data.clear()
+    return RedisBackend(stub.url, prefix='test:')
+
+
+@pytest.fixture
+def shared(stub):
+    """The stub as the process-wide backend, as create_app() configures it from CACHE_URL"""
+    with stub.store.lock:
+        stub.store.data.clear()
+    yield cache_backend.configure(stub.url)
+    cache_backend.configure('local')
+
+
+# ---------- RedisBackend against the stub ----------
+
+def test_get_set_delete(backend):
+    assert backend.get('missing') is None
+    backend.set('key', b'value')
+    assert backend.get('key') == b'value'
+    backend.set('key', 42)
+    assert backend.get('key') == b'42'
+    backend.delete('key')
+    assert backend.get('key') is None
+
+
+def test_get_many(backend):
+    backend.set('a', b'1')
+    backend.set('c', b'3')
+    assert backend.get_many(['a', 'b', 'c']) == [b'1', None, b'3']
+
+
+def test_incr(backend):
+    assert backend.incr('counter') == 1
+    assert backend.incr('counter') == 2
+    assert backend.get('counter') == b'2'
+
+
+def test_incr_of_non_integer_is_a_backend_error(backend):
+    backend.set('text', b'abc')
+    with pytest.raises(CacheBackendError):
+        backend.incr('text')
+    # The error reply leaves the pooled connection usable
+    assert backend.ping()
+
+
+def test_expiry(backend):
+    backend.set('short', b'x', ttl=0.05)
+    backend.set('long', b'y', ttl=60)
+    assert backend.get('short') == b'x'
+    time.sleep(0.1)
+    assert backend.get('short') is None
+    assert backend.get('long') == b'y'
+
+
+def test_keys_are_prefixed(stub, backend):
+    backend.set('key', b'one')
+    other = RedisBackend(stub.url, prefix='other:')
+    assert other.get('key') is None
+    assert stub.store.get(b'test:key', time.monotonic()) == b'one'
+
+
+def test_connections_are_reused(stub, backend):
+    for _ in range(5):
+        backend.ping()
+    assert backend._idle.qsize() == 1
+
+
+def test_unreachable_server_raises_backend_error():
+    backend = RedisBackend('redis://127.0.0.1:1/0', timeout=0.2)
+    with pytest.raises(CacheBackendError):
+        backend.get('key')
+
+
+def test_backend_from_url():
+    assert cache_backend.backend_from_url('').name == 'local'
+    assert cache_backend.backend_from_url('local').name == 'local'
+    assert cache_backend.backend_from_url('redis://cache:6380/2').port == 6380
+    with pytest.raises(ValueError):
+        cache_backend.backend_from_url('memcached://cache')
+
+
+# ---------- TTLCache in shared mode ----------
+
+def _cache():
+    return TTLCache(ttl=60, namespace='test', codec=(str.encode, bytes.decode))
+
+
+def test_shared_cache_entries_are_seen_by_every_instance(shared):
+    # Two caches with the same namespace stand in for the same cache in two workers
+    first, second = _cache(), _cache()
+    first.set('key', 'value')
+    assert second.get('key') == 'value'
+    assert second.stats()['backend'] == 'shared'
+    second.delete('key')
+    assert first.get('key') is None
+
+
+def test_shared_cache_single_flight_loader(shared):
+    first, second = _cache(), _cache()
+    calls = []
+    assert first.get_or_load('key', lambda: calls.append(1) or 'loaded') == 'loaded'
+    assert second.get_or_load('key', lambda: calls.append(1) or 'again') == 'loaded'
+    assert calls == [1]
+
+
+def test_shared_cache_falls_back_when_the_server_is_down(shared):
+    cache_backend.configure('redis://127.0.0.1:1/0')
+    cache = _cache()
+    assert cache.get_or_load('key', lambda: 'from the database') == 'from the database'
+    assert cache.stats()['backend_errors'] >= 1
+
+
+# ---------- two app instances sharing the stub ----------
+
+@pytest.fixture
+def workers(stub, make_app):
+    """Two create_app() instances on one database and one cache server, like two gunicorn workers"""
+    with stub.store.lock:
+        stub.store.data.clear()
+    config = {'CACHE_URL': stub.url, 'SECRET_KEY': 'shared-secret'}
+    yield make_app(config=config), make_app(config=config)
+    cache_backend.configure('local')
+
+
+def test_role_change_in_one_worker_applies_in_the_other(stub, workers):
+    from models import db, User
+
+    first, second = workers
+    headers = login(first.test_client())
+    assert second.test_client().get('/api/admin/users', headers=headers).status_code == 200
+    assert any(key.startswith(b'newsai:principal:') for key in stub.store.data)
+
+    with first.app_context():
+        user = User.query.filter_by(email=ADMIN_EMAIL).one()
+        user.role = 'user'
+        db.session.commit()
+
+    assert second.test_client().get('/api/admin/users', headers=headers).status_code == 403
+
+
+def test_article_write_in_one_worker_refreshes_listings_in_the_other(workers):
+    from response_cache import article_version
+
+    first, second = workers
+    headers = login(first.test_client())
+    reader = second.test_client()
+
+    before = reader.get('/api/articles', headers=headers)
+    assert reader.get('/api/articles', headers=headers).headers['ETag'] == before.headers['ETag']
+    with second.app_context():
+        version = article_version()[0]
+
+    response = first.test_client().post('/api/admin/articles', headers=headers,
+                                        json={'title': 'Shared cache article', 'category': 'Technology'})
+    assert response.status_code == 201
+
+    with second.app_context():
+        assert article_version()[0] == version + 1
+    after = reader.get('/api/articles', headers=headers)
+    assert after.headers['ETag'] != before.headers['ETag']
+    assert 'Shared cache article' in [article['title'] for article in after.json]
+
+
+def test_feed_profile_change_in_one_worker_rebuilds_it_in_the_other(workers):
+    from app import services
+    from models import User
+
+    first, second = workers
+    with first.app_context():
+        user_id = User.query.filter_by(email=ADMIN_EMAIL).one().id
+    headers = login(first.test_client())
+    for app in workers:
+        assert app.test_client().get('/api/feed', headers=headers).status_code == 200
+    profiles = services(second).feed_engine.profiles
+    stale = profiles.get(user_id)
+    assert stale.preference == {}
+
+    response = first.test_client().post('/api/preferences', headers=headers,
+                                        json={'interests': ['Science'], 'preferred_sources': []})
+    assert response.status_code == 200
+    assert services(first).feed_engine.profiles.get(user_id).preference['cat:science'] > 0
+
+    assert second.test_client().get('/api/feed', headers=headers).status_code == 200
+    assert profiles.get(user_id) is not stale
+    assert profiles.get(user_id).preference['cat:science'] > 0
@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+
+from app import services
+from bench.stub_server import start_stub_server
+import fanout
+import http_client
+
+
+def _articles(name):
+    return [{'title': f'{name} story', 'url': f'https://{name}.example/story', 'relevance_score': 1}]
+
+
+def _fail():
+    raise RuntimeError('provider error')
+
+
+def test_results_are_merged_in_provider_order_within_the_deadline():
+    stalled = lambda: time.sleep(2) or _articles('slow')
+    started = time.monotonic()
+    result = fanout.fetch_all({'slow': stalled, 'fast': lambda: _articles('fast'), 'broken': _fail,
+                               'other': lambda: _articles('other')}, deadline=0.3)
+
+    assert time.monotonic() - started < 1
+    assert [a['title'] for a in result.articles] == ['fast story', 'other story']
+    assert result.contributed == ['fast', 'other']
+    assert result.timed_out == ['slow']
+    assert result.failed == ['broken']
+
+
+def test_provider_http_calls_are_cut_off_at_the_deadline():
+    server = start_stub_server(latency_ms=2000)
+    try:
+        def stalled():
+            return http_client.get(server.url + '/v2/everything', params={'q': 'ai'}).json()
+
+        started = time.monotonic()
+        result = fanout.fetch_all({'stalled': stalled}, deadline=0.3)
+        assert result.timed_out == ['stalled'] or result.failed == ['stalled']
+        # The call itself gives up at the deadline instead of holding its pool thread for 2s
+        for _ in range(100):
+            if 'stalled' in result.timings:
+                break
+            time.sleep(0.01)
+        assert result.timings['stalled'] < 1
+        assert time.monotonic() - started < 1.5
+    finally:
+        server.shutdown()
+        http_client.close_sessions()
+
+
+def test_async_fan_out_reports_late_providers_and_cancels_them():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(2)
+        except asyncio.CancelledError:
+            cancelled.append('slow')
+            raise
+        return _articles('slow')
+
+    async def fast():
+        return _articles('fast')
+
+    async def run():
+        result = await fanout.fetch_all_async({'slow': slow, 'fast': fast}, deadline=0.2)
+        await asyncio.sleep(0)
+        return result
+
+    started = time.monotonic()
+    result = asyncio.run(run())
+    assert time.monotonic() - started < 1
+    assert (result.contributed, result.timed_out) == (['fast'], ['slow'])
+    assert cancelled == ['slow']
+
+
+class FakeProvider:
+    configured = True
+
+    def __init__(self, name, fetch):
+        self.name = name
+        self._fetch = fetch
+
+    def fetch(self, query, category=None, page_size=None):
+        return self._fetch()
+
+
+@pytest.fixture
+def live_client(client, monkeypatch):
+    monkeypatch.setattr(fanout, 'LIVE_FETCH_DEADLINE', 0.3)
+    providers = {
+        'fast': FakeProvider('fast', lambda: _articles('fast')),
+        'slow': FakeProvider('slow', lambda: time.sleep(2) or _articles('slow')),
+        'broken': FakeProvider('broken', _fail),
+    }
+    monkeypatch.setattr(services(client.application), 'providers', providers)
+    return client
+
+
+def test_live_listing_reports_partial_results_in_headers(live_client, auth):
+    started = time.monotonic()
+    response = live_client.get('/api/articles?fetch_live=true&search=fanout-headers', headers=auth)
+
+    assert time.monotonic() - started < 1.5
+    assert response.status_code == 200
+    assert [a['title'] for a in response.json] == ['fast story']
+    assert response.headers['X-Providers'] == 'fast'
+    assert response.headers['X-Providers-Timed-Out'] == 'slow'
+    assert response.headers['X-Providers-Failed'] == 'broken'
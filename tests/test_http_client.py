@@ -0,0 +1,84 @@
+import time
+
+import pytest
+import requests
+
+from bench.stub_server import start_stub_server
+import http_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_sessions():
+    http_client.close_sessions()
+    yield
+    http_client.close_sessions()
+
+
+def _server(**options):
+    options.setdefault('latency_ms', 0)
+    return start_stub_server(**options)
+
+
+def _search(server, **kwargs):
+    return http_client.get(server.url + '/v2/everything', params={'q': 'ai', 'pageSize': 5}, **kwargs)
+
+
+def test_connections_are_reused_per_host():
+    server = _server()
+    for _ in range(5):
+        assert _search(server).status_code == 200
+    assert server.requests == 5
+    assert server.connections == 1
+
+
+def test_one_session_per_host():
+    first, second = _server(), _server()
+    assert http_client.get_session(first.url + '/a') is http_client.get_session(first.url + '/b')
+    assert http_client.get_session(first.url) is not http_client.get_session(second.url)
+
+
+@pytest.mark.parametrize('status', [429, 500, 503])
+def test_retryable_statuses_are_retried(status):
+    server = _server(error_rate=1.0, error_status=status)
+    response = _search(server)
+    # The last answer is handed back rather than raised, after every retry was used
+    assert response.status_code == status
+    assert server.requests == 1 + http_client.HTTP_RETRIES
+
+
+def test_client_errors_are_not_retried():
+    server = _server()
+    response = http_client.get(server.url + '/missing')
+    assert response.status_code == 404
+    assert server.requests == 1
+
+
+def test_gzip_is_negotiated():
+    server = _server(gzip=True)
+    response = _search(server)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.json()['status'] == 'ok'
+    assert len(response.json()['articles']) == 5
+
+
+def test_identity_when_the_server_does_not_compress():
+    response = _search(_server())
+    assert 'Content-Encoding' not in response.headers
+    assert response.json()['status'] == 'ok'
+
+
+def test_deadline_caps_the_timeout_and_retries():
+    server = _server(latency_ms=2000)
+    started = time.monotonic()
+    with http_client.deadline(started + 0.3):
+        with pytest.raises(requests.exceptions.RequestException):
+            _search(server)
+    assert time.monotonic() - started < 1.5
+    assert server.requests == 1
+
+
+def test_retries_that_fit_before_the_deadline_are_made():
+    server = _server(error_rate=1.0, error_status=503)
+    with http_client.deadline(time.monotonic() + 5):
+        assert _search(server, timeout=1).status_code == 503
+    assert server.requests == 1 + http_client.HTTP_RETRIES
@@ -0,0 +1,50 @@
+from sqlalchemy import create_engine, text
+
+from ingest import bulk_insert_articles, normalize_article
+from migrations import upgrade
+from models import db, Article
+
+
+def _row(url, title='Story'):
+    return normalize_article({'url': url, 'title': title})
+
+
+def test_variants_of_a_stored_url_are_skipped(make_app):
+    app = make_app()
+    with app.app_context():
+        assert bulk_insert_articles(db.session, [_row('https://example.com/story')]) == (1, 0)
+        variants = [_row('http://www.example.com/story/?utm_source=feed'), _row('https://example.com/story#top')]
+        assert bulk_insert_articles(db.session, variants) == (0, 2)
+        assert [a.url for a in Article.query] == ['https://example.com/story']
+
+
+def test_variants_within_one_batch_are_skipped(make_app):
+    app = make_app()
+    with app.app_context():
+        rows = [_row('https://m.example.com/story?fbclid=1'), _row('https://example.com/story'), _row('https://example.com/other')]
+        assert bulk_insert_articles(db.session, rows) == (2, 1)
+        # The link as the provider gave it is kept for readers
+        assert {a.url for a in Article.query} == {'https://m.example.com/story?fbclid=1', 'https://example.com/other'}
+
+
+def test_migration_backfills_canonical_urls(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "old.db"}')
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE article (id INTEGER PRIMARY KEY, title VARCHAR(500) NOT NULL, "
+                          "description TEXT, content TEXT, url VARCHAR(500), image_url VARCHAR(500), "
+                          "source VARCHAR(100), author VARCHAR(200), category VARCHAR(50), tags VARCHAR(500), "
+                          "published_at DATETIME, created_at DATETIME)"))
+        conn.execute(text("INSERT INTO article (id, title, url) VALUES (:id, 'Story', :url)"), [
+            {'id': 1, 'url': 'https://www.example.com/story?utm_medium=rss'},
+            {'id': 2, 'url': 'http://example.com/story'},
+            {'id': 3, 'url': 'https://example.com/other'},
+        ])
+    for table in db.metadata.sorted_tables:
+        if table.name != 'article':
+            table.create(engine, checkfirst=True)
+
+    upgrade(engine)
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, canonical_url FROM article ORDER BY id")).all()
+    engine.dispose()
+    assert rows == [(1, 'https://example.com/story'), (2, None), (3, 'https://example.com/other')]
@@ -0,0 +1,76 @@
+import pytest
+
+import app as app_module
+from conftest import login
+from models import db, Article
+from search_index import search_article_ids
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        yield app
+
+
+def _add(**fields):
+    article = Article(**dict({'title': 'Untitled', 'category': 'Science'}, **fields))
+    db.session.add(article)
+    db.session.commit()
+    return article.id
+
+
+def _ids(*terms, **kwargs):
+    return search_article_ids(db.session, list(terms), **kwargs)
+
+
+def test_inserts_updates_and_deletes_reach_the_index(app):
+    article_id = _add(title='Zebrafish regenerate hearts')
+    assert _ids('zebrafish') == [article_id]
+
+    article = db.session.get(Article, article_id)
+    article.title = 'Axolotls regenerate limbs'
+    db.session.commit()
+    assert _ids('zebrafish') == []
+    assert _ids('axolotls') == [article_id]
+
+    db.session.delete(article)
+    db.session.commit()
+    assert _ids('axolotls') == []
+
+
+def test_title_matches_rank_above_body_matches(app):
+    in_content = _add(title='Lab notes', content='A long report that mentions zebrafish once.')
+    in_tags = _add(title='Weekly roundup', tags='zebrafish')
+    in_title = _add(title='Zebrafish genome mapped')
+
+    assert _ids('zebrafish') == [in_title, in_tags, in_content]
+
+
+def test_prefixes_match_only_from_the_minimum_length(app):
+    quantum = _add(title='Quantum computing milestone')
+    air = _add(title='Air quality improves')
+
+    assert _ids('quan') == [quantum]
+    assert _ids('ai') == []
+    assert air not in _ids('ai', 'quan')
+
+
+def test_category_filter(app):
+    _add(title='Zebrafish study', category='Science')
+    business = _add(title='Zebrafish farming startup', category='Business')
+    assert _ids('zebrafish', category='Business') == [business]
+
+
+def test_listing_falls_back_to_like_search_without_the_index(app, monkeypatch):
+    _add(title='Lab notes', description='Zebrafish appear in the appendix')
+    _add(title='Zebrafish genome mapped')
+    _add(title='Unrelated story')
+    monkeypatch.setattr(app_module, 'search_index_available', lambda engine: False)
+    monkeypatch.setattr(app_module, 'search_article_ids', None)  # must not be reached
+
+    client = app.test_client()
+    response = client.get('/api/articles?search=zebrafish', headers=login(client))
+
+    assert response.status_code == 200
+    assert [a['title'] for a in response.json] == ['Zebrafish genome mapped', 'Lab notes']
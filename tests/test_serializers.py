@@ -0,0 +1,16 @@
+import pytest
+
+from serializers import _encoding
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip', 'gzip'),
+    ('deflate, gzip;q=0.5', 'gzip'),
+    ('gzip;q=0', None),
+    ('gzip;q=0.0', None),
+    ('gzip; q=0.000', None),
+    ('gzip;q=oops', None),
+    ('', None),
+])
+def test_accept_encoding_quality(header, expected):
+    assert _encoding(header) == expected
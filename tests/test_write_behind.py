@@ -0,0 +1,85 @@
+import threading
+import time
+
+from flask import Flask, current_app
+import pytest
+
+from write_behind import BufferFull, WriteBehindBuffer
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_rows_are_written_in_batches_inside_the_app_context(app):
+    batches = []
+
+    def flush(rows):
+        assert current_app._get_current_object() is app
+        batches.append(list(rows))
+
+    buffer = WriteBehindBuffer(app, flush, batch_size=2, interval_ms=20)
+    for row in range(5):
+        buffer.submit(row)
+    assert _wait_for(lambda: buffer.written == 5)
+    buffer.stop(timeout=1)
+
+    assert [row for batch in batches for row in batch] == [0, 1, 2, 3, 4]
+    assert all(len(batch) <= 2 for batch in batches)
+
+
+def test_failed_batches_are_retried_with_backoff(app):
+    attempts = []
+
+    def flush(rows):
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise RuntimeError('database is locked')
+
+    buffer = WriteBehindBuffer(app, flush, retries=3, retry_backoff_ms=20)
+    buffer._write(['a', 'b'])
+
+    assert (buffer.written, buffer.failed, buffer.retried) == (2, 0, 2)
+    # 20ms, then 40ms
+    assert attempts[2] - attempts[1] >= attempts[1] - attempts[0] >= 0.02
+
+
+def test_batches_are_dropped_once_retries_are_exhausted(app):
+    def flush(rows):
+        raise RuntimeError('disk I/O error')
+
+    buffer = WriteBehindBuffer(app, flush, retries=2, retry_backoff_ms=1)
+    buffer._write(['a', 'b', 'c'])
+    assert (buffer.written, buffer.failed, buffer.retried) == (0, 3, 2)
+
+
+def test_stop_drains_everything_still_queued(app):
+    written = []
+    buffer = WriteBehindBuffer(app, written.extend, batch_size=1000, interval_ms=60000)
+    for row in range(50):
+        buffer.submit(row)
+
+    buffer.stop(timeout=1)
+    assert sorted(written) == list(range(50))
+    assert buffer.depth() == 0
+
+
+def test_submit_raises_buffer_full_when_the_queue_is_saturated(app):
+    release = threading.Event()
+    buffer = WriteBehindBuffer(app, lambda rows: release.wait(5), batch_size=1, interval_ms=10, max_queue=1)
+    buffer.submit('taken by the writer')
+    assert _wait_for(lambda: buffer.depth() == 0)
+    buffer.submit('fills the queue')
+
+    with pytest.raises(BufferFull):
+        buffer.submit('one too many')
+    release.set()
+    buffer.stop(timeout=1)
@@ -0,0 +1,171 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from telemetry import log_event, span
+
+# ========================================
+# WRITE-BEHIND BUFFER
+# ========================================
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv('WRITE_BEHIND_BATCH_SIZE', '200'))
+WRITE_BEHIND_INTERVAL_MS = int(os.getenv('WRITE_BEHIND_INTERVAL_MS', '250'))
+WRITE_BEHIND_MAX_QUEUE = int(os.getenv('WRITE_BEHIND_MAX_QUEUE', '50000'))
+# A failed batch (e.g. 'database is locked') is retried this many times, backing
+# off from WRITE_BEHIND_RETRY_BACKOFF_MS and doubling, before it is dropped
+WRITE_BEHIND_RETRIES = int(os.getenv('WRITE_BEHIND_RETRIES', '4'))
+WRITE_BEHIND_RETRY_BACKOFF_MS = int(os.getenv('WRITE_BEHIND_RETRY_BACKOFF_MS', '200'))
+
+
+# Queued by stop() to wake a writer that is still collecting a batch
+_STOP = object()
+
+
+class BufferFull(Exception):
+    pass
+
+
+class WriteBehindBuffer:
+    """
+    Accepts rows immediately and writes them from a background thread,
+    `batch_size` rows or `interval_ms` milliseconds at a time, whichever comes
+    first. `flush(rows)` runs inside an app context and should write the whole
+    batch in one transaction; a failing batch is retried with backoff before it
+    is dropped. Pending rows are drained at interpreter exit.
+    """
+
+    def __init__(self, app, flush, name='write-behind', batch_size=None, interval_ms=None, max_queue=None,
+                 retries=None, retry_backoff_ms=None):
+        self.app = app
+        self.flush = flush
+        self.name = name
+        self.batch_size = batch_size or WRITE_BEHIND_BATCH_SIZE
+        self.interval = (interval_ms or WRITE_BEHIND_INTERVAL_MS) / 1000.0
+        self.retries = WRITE_BEHIND_RETRIES if retries is None else retries
+        self.retry_backoff = (retry_backoff_ms or WRITE_BEHIND_RETRY_BACKOFF_MS) / 1000.0
+        self._queue = queue.Queue(maxsize=max_queue or WRITE_BEHIND_MAX_QUEUE)
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._exit_hook = False
+
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.retried = 0
+
+    def init_app(self, app):
+        """Bind the app whose context flush() runs in, if it was not known at construction"""
+        self.app = app
+
+    def _ensure_started(self):
+        # Started on first use, so a forking server starts it in each worker
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+                if not self._exit_hook:
+                    atexit.register(self.stop)
+                    self._exit_hook = True
+
+    def submit(self, row):
+        """Queue one row for writing; raises BufferFull if the queue is saturated"""
+        self._ensure_started()
+        try:
+            self._queue.put(row, timeout=1)
+        except queue.Full:
+            raise BufferFull(f'{self.name} queue is full')
+        self.enqueued += 1
+
+    def _take_batch(self, wait):
+        """Block up to `wait` seconds for a first row, then collect until size or deadline"""
+        try:
+            row = self._queue.get(timeout=wait)
+        except queue.Empty:
+            return []
+        if row is _STOP:
+            return []
+        batch = [row]
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                row = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if row is _STOP:
+                break
+            batch.append(row)
+        return batch
+
+    def _write(self, batch):
+        # The rows were already acknowledged to their clients, so transient
+        # errors are retried rather than losing the batch on the first one
+        for attempt in range(self.retries + 1):
+            try:
+                with self.app.app_context(), span(f'{self.name}.flush'):
+                    self.flush(batch)
+                self.written += len(batch)
+                self.batches += 1
+                return
+            except Exception as e:
+                error = e
+            if attempt < self.retries:
+                self.retried += 1
+                log_event('write_behind_retry', logging.WARNING, buffer=self.name, rows=len(batch),
+                          attempt=attempt + 1, error=str(error))
+                time.sleep(self.retry_backoff * 2 ** attempt)
+        self.failed += len(batch)
+        log_event('write_behind_failed', logging.ERROR, buffer=self.name, rows=len(batch), error=str(error))
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._take_batch(self.interval)
+            if batch:
+                self._write(batch)
+
+    def drain(self):
+        """Write everything currently queued from the calling thread"""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    row = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if row is not _STOP:
+                    batch.append(row)
+            if not batch:
+                return
+            self._write(batch)
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        try:
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            pass  # the writer is not waiting for rows then
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.drain()
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        return {
+            'depth': self.depth(),
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'batches': self.batches,
+            'retried': self.retried,
+            'failed': self.failed,
+        }